@@ -1,14 +1,49 @@
 # backend/app/api/routes/chat.py
 
-from datetime import datetime, date as date_type
-from typing import Optional
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from app.models.schemas import ChatRequest, ChatResponse
-from app.llm_engine.classifier import decide_intent
-from app.llm_engine.gemini_client import generate_response
-from app.db.mongo import db
+from app.models.schemas import (
+    ChatRequest,
+    ChatResponse,
+    ChatBatchRequest,
+    ChatBatchItem,
+    ChatBatchResponse,
+)
+from app.llm_engine.admission import BATCH, BRIDGE, INTERACTIVE, RateLimited, admission
+from app.llm_engine.classifier import DEFAULT_INTENT, classify_many, decide_intent
+from app.llm_engine.conversation_memory import conversation_memory
+from app.llm_engine.fast_path import fast_path
+from app.llm_engine.gemini_client import (
+    generate_response,
+    generate_response_stream,
+    gateway,
+    resilience,
+    FALLBACK_REPLY,
+)
+from app.llm_engine.gateway import GatewayOverloaded
+from app.llm_engine.prompt_builder import prompt_builder
+from app.llm_engine.query_log import query_log
+from app.llm_engine.singleflight import SingleFlight
+from app.llm_engine.response_cache import CacheKey, response_cache
+from app.llm_engine.templates import degraded_reply
+from app.core.config import settings
+from app.core.metrics import StageTimer
+from app.db.snapshot import context_snapshot
+from app.retrieval.announcement_search import announcement_search, format_hits
+from app.retrieval.semantic_search import semantic_search, format_semantic_hits
+from app.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -17,85 +52,147 @@ SYSTEM_INSTRUCTION = (
     "Answer in Turkish. Be concise and friendly."
 )
 
+GENERAL_CONTEXT = "General conversation. Feel free to ask anything about Akdeniz University or Computer Engineering."
+
+# Concurrent identical work shares one in-flight task
+_context_flight = SingleFlight()
+_response_flight = SingleFlight()
+
+# ChatRequest.client -> admission priority class
+_PRIORITIES = {"mobile": INTERACTIVE, "bridge": BRIDGE}
+
 
 async def _fetch_dining_context() -> str:
     """
-    Fetch today's dining menu from MongoDB.
-    Simplified structure: Single list of items per day.
+    Fetch today's dining menu context from the in-process snapshot.
     
     Returns:
         Formatted dining menu string or a 'not found' message.
     """
-    try:
-        today = date_type.today().strftime("%Y-%m-%d")
-        
-        # --- DEBUG LOG BAŞLANGICI ---
-        print(f"DEBUG: Aranan Tarih: {today}")
-        print(f"DEBUG: Koleksiyon Adı: dining")
-        print(f"DEBUG: DB Var: {db.db is not None}")
-        # --- DEBUG LOG BİTİŞ ---
-        
-        # Tüm kayıtları say
-        count = await db.db["dining"].count_documents({})
-        print(f"DEBUG: Toplam dining kayıt sayısı: {count}")
-        
-        # Bugünkü kaydı ara
-        menu = await db.db["dining"].find_one({"date": today})
-        
-        # --- DEBUG LOG SONUÇ ---
-        print(f"DEBUG: Bulunan Menü: {menu}")
-        print(f"DEBUG: Menü var mı?: {menu is not None}")
-        if menu:
-            print(f"DEBUG: Menü items: {menu.get('items', [])}")
-        # -----------------------
-        
-        if not menu:
-            return f"VERİTABANI BİLGİSİ: {today} tarihi için yemek listesi bulunamadı."
-        
-        # Simplified structure: Just read the 'items' list
-        items = menu.get('items', [])
-        location = menu.get('location', 'Akdeniz Üniversitesi Yemekhanesi')
-        
-        if items:
-            menu_str = ", ".join(items)
-            context = f"VERİTABANI BİLGİSİ ({today} Menüsü - {location}): {menu_str}"
-        else:
-            context = "VERİTABANI BİLGİSİ: Menü kaydı var ama içi boş."
-        
-        return context
-    except Exception as e:
-        print(f"DEBUG ERROR: {str(e)}")
-        return f"Error fetching dining menu: {str(e)}"
+    return await context_snapshot.dining()
 
 
-async def _fetch_announcements_context() -> str:
+async def _fetch_announcements_context(message: str) -> str:
     """
-    Fetch the 3 most recent announcements from MongoDB.
+    Fetch the announcements most relevant to the message (BM25), or the
+    recent announcements digest when nothing matches.
     
     Returns:
         Formatted announcements string or a 'not found' message.
     """
-    try:
-        announcements = await db.db["announcements"].find() \
-            .sort("created_at", -1) \
-            .limit(3) \
-            .to_list(length=3)
-        
-        if not announcements:
-            return "No recent announcements."
-        
-        context_lines = ["Recent Announcements:"]
-        for i, ann in enumerate(announcements, 1):
-            title = ann.get("title", "N/A")
-            content = ann.get("content", "N/A")
-            source = ann.get("source", "N/A")
-            context_lines.append(
-                f"{i}. [{source}] {title}\n   {content[:100]}..."
-            )
-        
-        return "\n".join(context_lines)
-    except Exception as e:
-        return f"Error fetching announcements: {str(e)}"
+    hits = announcement_search.search(message, settings.ANNOUNCEMENT_SEARCH_TOP_K)
+    if hits:
+        return format_hits(hits)
+    return await context_snapshot.announcements()
+
+
+def _fetch_general_context(message: str) -> str:
+    """
+    General context plus semantically related announcements/menus from the
+    vector store, when any are similar enough to the message.
+
+    The context differs from message to message; the response cache keeps
+    one context hash per question, so this does not evict other general
+    replies (only a changed context for the same question does).
+    """
+    hits = semantic_search.search(message, settings.SEMANTIC_SEARCH_TOP_K, settings.SEMANTIC_MIN_SCORE)
+    if hits:
+        return f"{GENERAL_CONTEXT}\n\n{format_semantic_hits(hits)}"
+    return GENERAL_CONTEXT
+
+
+async def _load_context(intent: str, message: str) -> str:
+    if intent == "dining":
+        return await _fetch_dining_context()
+    if intent == "announcement":
+        return await _fetch_announcements_context(message)
+    return _fetch_general_context(message)
+
+
+async def _fetch_context(intent: str, message: str) -> str:
+    """
+    Fetch the context string for a classified intent.
+    Concurrent requests with the same intent and message share one fetch.
+    """
+    key = (intent, normalize_text(message))
+    return await _context_flight.do(key, lambda: _load_context(intent, message))
+
+
+async def _resolve_turn(request: ChatRequest, timer: StageTimer) -> Tuple[str, str]:
+    """
+    Classifies the message and, for a follow-up in an active conversation,
+    renders the user's recent history. Short follow-ups that match no intent
+    on their own ("peki yarın?") inherit the previous turn's intent.
+
+    Returns:
+        (intent, history), history is '' for self-contained messages.
+    """
+    await conversation_memory.load(request.user_id)
+    timer.mark("memory_load")
+    intent = decide_intent(request.message)
+    timer.mark("classify")
+    classified = intent != DEFAULT_INTENT
+
+    if not conversation_memory.is_follow_up(request.user_id, request.message, classified):
+        return intent, ""
+    if not classified:
+        intent = conversation_memory.last_intent(request.user_id) or intent
+    history = conversation_memory.history(request.user_id, settings.CONVERSATION_HISTORY_TOKENS)
+    timer.mark("history")
+    return intent, history
+
+
+def _fallback_answer(
+    cache_key: CacheKey,
+    context_data: str,
+    history: str = "",
+) -> Tuple[Optional[str], str]:
+    """
+    Answer for a request that cannot call Gemini right now (shed, circuit
+    breaker open, rate limited): the last cached reply if any, otherwise a
+    templated reply built from the context.
+
+    Returns:
+        (reply, outcome); reply is None if neither exists.
+    """
+    stale = None if history else response_cache.get_stale(cache_key)
+    if stale is not None:
+        return stale, "stale"
+    degraded = degraded_reply(cache_key[0], context_data)
+    if degraded is not None:
+        return degraded, "degraded"
+    return None, "shed"
+
+
+def _admit(request: ChatRequest) -> None:
+    admission.admit(_PRIORITIES[request.client], request.user_id, request.chat_id)
+
+
+def _log_query(
+    route: str,
+    request: ChatRequest,
+    intent: str,
+    outcome: str,
+    seconds: float,
+    reply: Optional[str],
+    source: Optional[str],
+) -> None:
+    query_log.record(
+        route, request.message, intent, outcome, seconds,
+        reply=reply, source=source, user_id=request.user_id, chat_id=request.chat_id, client=request.client,
+    )
+
+
+async def _generate_and_cache(cache_key: CacheKey, message: str, context_data: str) -> str:
+    reply = await generate_response(
+        system_instruction=SYSTEM_INSTRUCTION,
+        user_query=message,
+        context_data=context_data,
+        intent=cache_key[0],
+    )
+    if reply != FALLBACK_REPLY:
+        response_cache.set(cache_key, reply)
+    return reply
 
 
 @router.post("/", response_model=ChatResponse)
@@ -104,10 +201,24 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
     Main chat endpoint that routes user messages to appropriate handlers.
     
     Flow:
-    1. Determine intent from user message (dining, announcement, or general).
+    1. Determine intent from user message (dining, announcement, or general);
+       follow-ups also get the user's recent conversation history.
+       Deterministic questions (a day's menu, the latest announcements) and
+       curated FAQs are answered here from templates, without Gemini and
+       without costing LLM budget, unless `force_llm` is set.
     2. Fetch relevant context from MongoDB based on intent.
-    3. Call Gemini API with system instruction, context, and user query.
-    4. Return the generated response with source attribution.
+    3. Serve a cached reply for the same intent/message/context if available,
+       otherwise call Gemini API with system instruction, context, and user query
+       (joining an identical in-flight call instead of starting a new one).
+       Follow-ups always call Gemini, since their reply depends on the history.
+       Requests that need Gemini pass admission control first (per-user,
+       per-chat and global budgets).
+       If Gemini is unavailable (circuit breaker open, shed or failed call)
+       or the request is rate limited, the last cached reply or, for dining
+       and announcement questions, a template over the context is served.
+    4. Record the exchange in the user's conversation memory and return the
+       generated response with source attribution. Every request, answered
+       or not, is also queued for the query log (written behind).
     
     Args:
         request: ChatRequest containing message and optional user_id.
@@ -116,35 +227,434 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         ChatResponse with reply and source.
     
     Raises:
-        HTTPException: If database or API calls fail.
+        HTTPException: 503 if the LLM gateway is saturated (or the circuit
+            breaker is open) and neither a cached nor a templated reply
+            exists, 429 if the request is over its rate limit and no such
+            reply exists, 500 if database or API calls fail.
     """
+    timer = StageTimer("chat")
+    intent, outcome = "unknown", "error"
+    response = None
     try:
-        # Step 1: Determine intent
-        intent = decide_intent(request.message)
+        # Step 1: Determine intent (and history for follow-ups)
+        intent, history = await _resolve_turn(request, timer)
+        fast = await fast_path.answer(request.message, intent, request.force_llm)
+        timer.mark("fast_path")
+        if fast is not None:
+            outcome = "fast_path"
+            conversation_memory.append(request.user_id, request.message, fast.reply, intent)
+            response = ChatResponse(reply=fast.reply, source=fast.source)
+            return response
         
         # Step 2: Fetch context based on intent
-        if intent == "dining":
-            context_data = await _fetch_dining_context()
-        elif intent == "announcement":
-            context_data = await _fetch_announcements_context()
-        else:  # general
-            context_data = "General conversation. Feel free to ask anything about Akdeniz University or Computer Engineering."
+        context_data = await _fetch_context(intent, request.message)
+        timer.mark("context")
         
-        # Step 3: Generate response from Gemini
-        reply = await generate_response(
-            system_instruction=SYSTEM_INSTRUCTION,
-            user_query=request.message,
-            context_data=context_data
-        )
+        # Step 3: Serve from cache or generate response from Gemini
+        cache_key = response_cache.make_key(intent, request.message, context_data)
+        reply = None if history else response_cache.get(cache_key)
+        timer.mark("cache")
+        outcome = "cached"
+
+        if reply is None:
+            outcome = "generated"
+            try:
+                if history:
+                    _admit(request)
+                    reply = await generate_response(
+                        system_instruction=SYSTEM_INSTRUCTION,
+                        user_query=request.message,
+                        context_data=context_data,
+                        history=history,
+                        intent=intent,
+                    )
+                else:
+                    # Identical concurrent questions share one Gemini call;
+                    # only the caller that starts it spends LLM budget
+                    if not _response_flight.running(cache_key):
+                        _admit(request)
+                    reply = await _response_flight.do(
+                        cache_key,
+                        lambda: _generate_and_cache(cache_key, request.message, context_data)
+                    )
+            except RateLimited as e:
+                reply, outcome = _fallback_answer(cache_key, context_data, history)
+                if reply is None:
+                    outcome = "rate_limited"
+                    raise HTTPException(
+                        status_code=429,
+                        detail="Too many requests, please slow down.",
+                        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+                    )
+            except GatewayOverloaded:
+                reply, outcome = _fallback_answer(cache_key, context_data, history)
+                if reply is None:
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Assistant is busy, please retry shortly.",
+                        headers={"Retry-After": "2"},
+                    )
+            if reply == FALLBACK_REPLY:
+                degraded = degraded_reply(intent, context_data)
+                if degraded is not None:
+                    outcome, reply = "degraded", degraded
+            timer.mark("generate")
         
-        # Step 4: Return response with source
-        return ChatResponse(
+        # Step 4: Remember the exchange and return response with source
+        if reply != FALLBACK_REPLY:
+            conversation_memory.append(request.user_id, request.message, reply, intent)
+        else:
+            outcome = "fallback"
+        response = ChatResponse(
             reply=reply,
             source=intent
         )
+        return response
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing chat request: {str(e)}"
         )
+    finally:
+        seconds = timer.finish(intent, outcome)
+        _log_query(
+            "chat", request, intent, outcome, seconds,
+            response.reply if response else None, response.source if response else None,
+        )
+
+
+async def _answer_group(
+    cache_key: CacheKey,
+    message: str,
+    context_data: str,
+    indices: List[int],
+    limiter: asyncio.Semaphore,
+    requests: List[ChatRequest],
+) -> List[ChatBatchItem]:
+    """
+    Answers one distinct (intent, message, context) of a batch, from the
+    fast path, the cache or with a Gemini call once a batch slot is free,
+    and returns one item per batch position asking it. Gemini calls are
+    admitted with the lowest (batch) priority.
+    """
+    started = time.perf_counter()
+    intent = cache_key[0]
+    fields = {"source": intent}
+    outcome = "generated"
+    try:
+        fast = await fast_path.answer(message, intent, any(requests[index].force_llm for index in indices))
+        reply = None if fast is not None else response_cache.get(cache_key)
+
+        if fast is not None:
+            outcome = "fast_path"
+            fields.update(reply=fast.reply, source=fast.source)
+        elif reply is not None:
+            outcome = "cached"
+            fields.update(reply=reply, cached=True)
+        else:
+            async with limiter:
+                if not _response_flight.running(cache_key):
+                    admission.admit(BATCH)
+                reply = await _response_flight.do(
+                    cache_key,
+                    lambda: _generate_and_cache(cache_key, message, context_data)
+                )
+            if reply == FALLBACK_REPLY:
+                degraded = degraded_reply(intent, context_data)
+                outcome, reply = ("degraded", degraded) if degraded is not None else ("fallback", reply)
+            fields["reply"] = reply
+    except (GatewayOverloaded, RateLimited) as e:
+        reply, outcome = _fallback_answer(cache_key, context_data)
+        if reply is None:
+            busy = isinstance(e, GatewayOverloaded)
+            outcome = "shed" if busy else "rate_limited"
+            fields["error"] = "Assistant is busy, please retry shortly." if busy else "Rate limited, please retry later."
+        else:
+            fields.update(reply=reply, cached=outcome == "stale")
+    except Exception as e:
+        logger.error(f"Batch item failed: {e}")
+        outcome = "error"
+        fields["error"] = f"Error processing chat request: {str(e)}"
+
+    seconds = time.perf_counter() - started
+    for index in indices:
+        _log_query("batch", requests[index], intent, outcome, seconds, fields.get("reply"), fields["source"])
+    return [ChatBatchItem(index=index, **fields) for index in indices]
+
+
+async def _plan_batch(messages: List[ChatRequest]) -> Dict[CacheKey, Tuple[str, str, List[int]]]:
+    """
+    Classifies all messages in one pass, fetches each distinct context once
+    and groups identical questions.
+
+    Returns:
+        cache key -> (message, context, indices of the batch items it answers)
+    """
+    texts = [request.message for request in messages]
+    intents = classify_many(texts)
+
+    context_keys: Dict[Tuple[str, str], str] = {}
+    for intent, text in zip(intents, texts):
+        context_keys.setdefault((intent, normalize_text(text)), text)
+    fetched = await asyncio.gather(*(
+        _fetch_context(intent, text) for (intent, _), text in context_keys.items()
+    ))
+    contexts = dict(zip(context_keys, fetched))
+
+    groups: Dict[CacheKey, Tuple[str, str, List[int]]] = {}
+    for index, (intent, text) in enumerate(zip(intents, texts)):
+        context_data = contexts[(intent, normalize_text(text))]
+        cache_key = response_cache.make_key(intent, text, context_data)
+        groups.setdefault(cache_key, (text, context_data, []))[2].append(index)
+    return groups
+
+
+async def _ndjson_results(tasks: List[asyncio.Task]) -> AsyncIterator[str]:
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for item in await finished:
+                yield f"{item.model_dump_json()}\n"
+    finally:
+        # Client went away: stop the calls nobody will read
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/batch", response_model=ChatBatchResponse)
+async def chat_batch_endpoint(batch: ChatBatchRequest):
+    """
+    Answers many chat messages in one request (bridge backlogs, evaluation
+    replays).
+
+    Messages are classified in one pass, each distinct context is fetched
+    once and identical questions are answered once. Gemini calls fan out
+    under CHAT_BATCH_CONCURRENCY, so a large batch never saturates the LLM
+    gateway on its own. Items are answered independently: conversation
+    history is neither used nor recorded. A failing item carries `error`
+    instead of failing the batch.
+
+    Returns:
+        ChatBatchResponse with results in request order, or with
+        `stream: true` an NDJSON stream of ChatBatchItem lines in completion
+        order.
+
+    Raises:
+        HTTPException: 413 if the batch exceeds CHAT_BATCH_MAX_ITEMS, 500 if
+            classification or context fetching fails.
+    """
+    if len(batch.messages) > settings.CHAT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {settings.CHAT_BATCH_MAX_ITEMS} messages per request.",
+        )
+
+    try:
+        groups = await _plan_batch(batch.messages)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing chat batch: {str(e)}"
+        )
+
+    limiter = asyncio.Semaphore(settings.CHAT_BATCH_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_answer_group(cache_key, message, context_data, indices, limiter, batch.messages))
+        for cache_key, (message, context_data, indices) in groups.items()
+    ]
+    logger.info(f"Chat batch: {len(batch.messages)} messages, {len(tasks)} distinct questions.")
+
+    if batch.stream:
+        return StreamingResponse(_ndjson_results(tasks), media_type="application/x-ndjson")
+
+    items = [item for group in await asyncio.gather(*tasks) for item in group]
+    return ChatBatchResponse(results=sorted(items, key=lambda item: item.index))
+
+
+async def _stream_chat(request: ChatRequest) -> AsyncIterator[dict]:
+    """
+    Runs the chat flow and yields protocol frames for the streaming routes.
+
+    Frames:
+        {"type": "meta", "source": <intent>, "cached": bool}  - always first;
+            fast-path answers add "answered_by": <template or 'faq'>
+        {"type": "token", "text": <chunk>}                     - zero or more
+        {"type": "done", "reply": <full reply>}                - on success
+        {"type": "error", "detail": <message>}                 - on failure
+    """
+    timer = StageTimer("stream")
+    intent, outcome = "unknown", "error"
+    reply = source = None
+    try:
+        async for frame in _stream_frames(request, timer):
+            if frame["type"] == "meta":
+                intent = frame["source"]
+                source = frame.get("answered_by", intent)
+            elif frame["type"] in ("done", "error"):
+                outcome = frame.pop("outcome", "error")
+                reply = frame.get("reply")
+            yield frame
+    except (GeneratorExit, asyncio.CancelledError):
+        outcome = "disconnected"
+        raise
+    finally:
+        seconds = timer.finish(intent, outcome)
+        _log_query("stream", request, intent, outcome, seconds, reply, source)
+
+
+async def _stream_frames(request: ChatRequest, timer: StageTimer) -> AsyncIterator[dict]:
+    # Final frames may carry the metrics outcome; _stream_chat strips it
+    try:
+        intent, history = await _resolve_turn(request, timer)
+        fast = await fast_path.answer(request.message, intent, request.force_llm)
+        timer.mark("fast_path")
+        if fast is None:
+            context_data = await _fetch_context(intent, request.message)
+            timer.mark("context")
+            cache_key = response_cache.make_key(intent, request.message, context_data)
+            cached = None if history else response_cache.get(cache_key)
+            timer.mark("cache")
+    except Exception as e:
+        yield {"type": "error", "detail": f"Error processing chat request: {str(e)}"}
+        return
+
+    if fast is not None:
+        conversation_memory.append(request.user_id, request.message, fast.reply, intent)
+        yield {"type": "meta", "source": intent, "cached": False, "answered_by": fast.source}
+        yield {"type": "token", "text": fast.reply}
+        yield {"type": "done", "reply": fast.reply, "outcome": "fast_path"}
+        return
+
+    yield {"type": "meta", "source": intent, "cached": cached is not None}
+
+    if cached is not None:
+        conversation_memory.append(request.user_id, request.message, cached, intent)
+        yield {"type": "token", "text": cached}
+        yield {"type": "done", "reply": cached, "outcome": "cached"}
+        return
+
+    chunks = []
+    try:
+        _admit(request)
+        async for chunk in generate_response_stream(
+            system_instruction=SYSTEM_INSTRUCTION,
+            user_query=request.message,
+            context_data=context_data,
+            history=history,
+            intent=intent,
+        ):
+            if not chunks:
+                timer.mark("first_token")
+                if chunk == FALLBACK_REPLY:
+                    # The call failed before any output; a template still answers
+                    degraded = degraded_reply(intent, context_data)
+                    if degraded is not None:
+                        conversation_memory.append(request.user_id, request.message, degraded, intent)
+                        yield {"type": "token", "text": degraded}
+                        yield {"type": "done", "reply": degraded, "outcome": "degraded"}
+                        return
+            chunks.append(chunk)
+            yield {"type": "token", "text": chunk}
+    except (GatewayOverloaded, RateLimited) as e:
+        reply, outcome = _fallback_answer(cache_key, context_data, history)
+        if reply is None:
+            if isinstance(e, RateLimited):
+                yield {"type": "error", "detail": "Too many requests, please slow down.", "outcome": "rate_limited"}
+            else:
+                yield {"type": "error", "detail": "Assistant is busy, please retry shortly.", "outcome": "shed"}
+            return
+        if outcome == "degraded":
+            conversation_memory.append(request.user_id, request.message, reply, intent)
+        yield {"type": "token", "text": reply}
+        yield {"type": "done", "reply": reply, "outcome": outcome}
+        return
+    except Exception as e:
+        yield {"type": "error", "detail": f"Response stream interrupted: {str(e)}"}
+        return
+    timer.mark("generate")
+
+    reply = "".join(chunks)
+    if reply != FALLBACK_REPLY:
+        if not history:
+            response_cache.set(cache_key, reply)
+        conversation_memory.append(request.user_id, request.message, reply, intent)
+    yield {"type": "done", "reply": reply, "outcome": "generated" if reply != FALLBACK_REPLY else "fallback"}
+
+
+async def _sse_events(request: ChatRequest) -> AsyncIterator[str]:
+    # Closed right away when the client disconnects (or the response is
+    # cancelled), so the Gemini stream gives back its gateway slot
+    async with contextlib.aclosing(_stream_chat(request)) as frames:
+        async for frame in frames:
+            data = json.dumps(frame, ensure_ascii=False)
+            yield f"event: {frame['type']}\ndata: {data}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream_endpoint(request: ChatRequest) -> StreamingResponse:
+    """
+    Streaming variant of the chat endpoint over Server-Sent Events.
+
+    Emits a `meta` event with the intent first, then one `token` event per
+    Gemini chunk and a final `done` (or `error`) event.
+    """
+    return StreamingResponse(
+        _sse_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Streaming chat over WebSocket.
+
+    Each text message from the client is a ChatRequest JSON object; the server
+    answers with the same frames as the SSE route, ending with `done` or `error`.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                request = ChatRequest.model_validate_json(raw)
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "detail": e.errors(include_url=False)})
+                continue
+
+            # send_json raises on a disconnect; close the stream (and free
+            # its gateway slot) now rather than when it is collected
+            async with contextlib.aclosing(_stream_chat(request)) as frames:
+                async for frame in frames:
+                    await websocket.send_json(frame)
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/stats")
+async def chat_stats() -> dict:
+    """
+    Runtime counters of the chat pipeline (no-LLM fast path, response
+    cache, admission control, LLM gateway and resilience, request
+    coalescing, context snapshot, announcement index, query log).
+    """
+    return {
+        "context_snapshot": context_snapshot.stats(),
+        "announcement_index": announcement_search.stats(),
+        "vector_store": semantic_search.stats(),
+        "conversation_memory": conversation_memory.stats(),
+        "query_log": query_log.stats(),
+        "prompts": prompt_builder.stats(),
+        "fast_path": fast_path.stats(),
+        "response_cache": response_cache.stats(),
+        "admission": admission.stats(),
+        "llm_gateway": gateway.stats(),
+        "llm_resilience": resilience.stats(),
+        "coalescing": {
+            "contexts": _context_flight.stats(),
+            "responses": _response_flight.stats(),
+        },
+    }
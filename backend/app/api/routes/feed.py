@@ -0,0 +1,279 @@
+# backend/app/api/routes/feed.py
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.db.collections import PIPELINE_ANNOUNCEMENTS_COLLECTION
+from app.db.mongo import db
+from app.db.snapshot import context_snapshot
+from app.llm_engine.singleflight import SingleFlight
+from app.models.schemas import FeedItem, FeedPage
+from app.realtime.hub import Subscriber, announcement_hub
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+_PROJECTION = {"title": 1, "link": 1, "source_type": 1, "source": 1, "summary": 1, "created_at": 1}
+_SORT = [("created_at", -1), ("_id", -1)]
+
+
+class _CachedPage:
+    __slots__ = ("body", "etag", "last_modified", "version", "built_at")
+
+    def __init__(self, body: bytes, etag: str, last_modified: Optional[datetime], version: Optional[int]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.version = version
+        self.built_at = time.monotonic()
+
+
+# First page per page size; rebuilt when the pipeline's context version
+# changes (it is bumped on every stored announcement) or the entry is too old
+_first_pages: Dict[int, _CachedPage] = {}
+_cache_stats = {"hits": 0, "misses": 0, "not_modified": 0}
+# Concurrent first-page misses share one query
+_page_flight = SingleFlight()
+
+# New announcements make the cached first pages stale immediately
+announcement_hub.add_listener(lambda items: _first_pages.clear())
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    millis = int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return base64.urlsafe_b64encode(f"{millis}:{doc_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor().
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        millis, doc_id = raw.split(":")
+        created_at = datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc).replace(tzinfo=None)
+        return created_at, ObjectId(doc_id)
+    except (ValueError, InvalidId, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _to_item(doc: dict) -> FeedItem:
+    return FeedItem(
+        id=str(doc["_id"]),
+        title=doc.get("title") or "",
+        link=doc.get("link"),
+        source=doc.get("source_type") or doc.get("source"),
+        summary=doc.get("summary"),
+        created_at=doc["created_at"],
+    )
+
+
+async def _load_page(limit: int, cursor: Optional[str]) -> Tuple[FeedPage, Optional[datetime]]:
+    query: dict = {"created_at": {"$exists": True}}
+    if cursor:
+        created_at, doc_id = decode_cursor(cursor)
+        # Keyset: strictly older than the last item of the previous page
+        query = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]}
+
+    # One extra document tells whether another page exists
+    docs = await db.db[PIPELINE_ANNOUNCEMENTS_COLLECTION].find(query, _PROJECTION).sort(_SORT).limit(limit + 1).to_list(limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    next_cursor = encode_cursor(docs[-1]["created_at"], docs[-1]["_id"]) if has_more else None
+    page = FeedPage(items=[_to_item(doc) for doc in docs], next_cursor=next_cursor)
+    last_modified = docs[0]["created_at"] if docs else None
+    return page, last_modified
+
+
+def _etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*"
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def _respond(request: Request, body: bytes, etag: str, last_modified: Optional[datetime], cache_control: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    if _not_modified(request, etag, last_modified):
+        _cache_stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/", response_model=FeedPage)
+async def feed_endpoint(
+    request: Request,
+    limit: int = Query(settings.FEED_PAGE_SIZE, ge=1, le=settings.FEED_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
+    """
+    Announcements feed, newest first, with keyset pagination.
+
+    Pages are addressed by an opaque cursor (created_at + _id of the last item
+    seen), so deep pages cost the same index range scan as the first one and
+    stay stable while new announcements arrive. Responses carry ETag and
+    Last-Modified; a matching If-None-Match / If-Modified-Since returns 304.
+    The first page is served from memory until the pipeline stores a new
+    announcement; older pages never change and are cacheable by clients.
+
+    Args:
+        limit: Page size.
+        cursor: Cursor from the previous page's `next_cursor`.
+
+    Returns:
+        FeedPage (or an empty 304 response).
+
+    Raises:
+        HTTPException: 400 on an invalid cursor, 500 if the database query fails.
+    """
+    if cursor:
+        try:
+            page, last_modified = await _load_page(limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error loading feed: {str(e)}")
+        body = page.model_dump_json().encode()
+        # Items older than the cursor are immutable once written
+        return _respond(request, body, _etag(body), last_modified, "public, max-age=3600")
+
+    version = context_snapshot.version
+    cached = _first_pages.get(limit)
+    if (
+        cached is None
+        or cached.version != version
+        or time.monotonic() - cached.built_at > settings.FEED_CACHE_MAX_AGE_SECONDS
+    ):
+        _cache_stats["misses"] += 1
+        try:
+            page, last_modified = await _page_flight.do((limit, version), lambda: _load_page(limit, None))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error loading feed: {str(e)}")
+        body = page.model_dump_json().encode()
+        cached = _CachedPage(body, _etag(body), last_modified, version)
+        _first_pages[limit] = cached
+    else:
+        _cache_stats["hits"] += 1
+
+    return _respond(request, cached.body, cached.etag, cached.last_modified, "no-cache")
+
+
+def _subscribe(source: Optional[List[str]], course: Optional[List[str]]) -> Optional[Subscriber]:
+    return announcement_hub.subscribe(sources=source, courses=course)
+
+
+async def _sse_announcements(subscriber: Subscriber) -> AsyncIterator[str]:
+    try:
+        yield ": connected\n\n"
+        while True:
+            item = await subscriber.next(settings.PUSH_HEARTBEAT_SECONDS)
+            if item is None:
+                yield f"event: close\ndata: {json.dumps({'reason': subscriber.close_reason})}\n\n"
+                return
+            if not item:
+                yield ": ping\n\n"
+                continue
+            yield f"event: announcement\ndata: {json.dumps(item, ensure_ascii=False)}\n\n"
+    finally:
+        announcement_hub.unsubscribe(subscriber)
+
+
+@router.get("/stream")
+async def feed_stream_endpoint(
+    source: Optional[List[str]] = Query(None, description="only these sources, e.g. website, teams"),
+    course: Optional[List[str]] = Query(None, description="only announcements about these courses"),
+) -> StreamingResponse:
+    """
+    Pushes new announcements over Server-Sent Events as they are stored.
+
+    Emits one `announcement` event per new item matching the filters, a
+    comment line as heartbeat when idle, and a final `close` event if the
+    client fell too far behind.
+
+    Raises:
+        HTTPException: 503 if this worker has no room for more subscribers.
+    """
+    subscriber = _subscribe(source, course)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many subscribers.", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        _sse_announcements(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def feed_websocket(
+    websocket: WebSocket,
+    source: Optional[List[str]] = Query(None),
+    course: Optional[List[str]] = Query(None),
+):
+    """
+    Pushes new announcements over WebSocket.
+
+    Frames: {"type": "announcement", "item": {...}} per new item,
+    {"type": "ping"} when idle. A client that falls too far behind is closed
+    with code 1008 ("slow consumer").
+    """
+    subscriber = _subscribe(source, course)
+    if subscriber is None:
+        await websocket.close(code=1013, reason="Too many subscribers.")
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            item = await subscriber.next(settings.PUSH_HEARTBEAT_SECONDS)
+            if item is None:
+                await websocket.close(code=1008, reason=subscriber.close_reason or "closed")
+                return
+            if not item:
+                await websocket.send_json({"type": "ping"})
+                continue
+            await websocket.send_json({"type": "announcement", "item": item})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        announcement_hub.unsubscribe(subscriber)
+
+
+@router.get("/stats")
+async def feed_stats() -> dict:
+    """
+    First-page cache counters of the feed endpoint and push hub counters.
+    """
+    return {"cached_pages": len(_first_pages), **_cache_stats, "push": announcement_hub.stats()}
@@ -0,0 +1,78 @@
+# backend/app/api/routes/webhooks.py
+
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.core.config import settings
+from app.core.security import secret_matches
+from app.ingest.teams import teams_ingestor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/webhook", tags=["webhooks"])
+
+
+@router.post("/teams", status_code=202)
+async def teams_webhook(
+    request: Request,
+    validationToken: Optional[str] = Query(None, description="sent by Graph when a subscription is created"),
+):
+    """
+    Receives Teams channel messages (Graph change notifications or plain
+    chatMessage objects from a flow/bridge).
+
+    Stored messages reach the feed, push subscribers, search indexes and
+    Gemini prompts, so every payload is authenticated: a request with the
+    X-Webhook-Secret header matching TEAMS_WEBHOOK_SECRET may post any
+    shape; without it only Graph notifications are accepted, and each of
+    their notifications must carry TEAMS_WEBHOOK_CLIENT_STATE.
+
+    The payload is only queued here; parsing, deduplication and the database
+    write happen in the background, so the sender gets its acknowledgement
+    immediately and bursts do not compete with chat requests.
+
+    Args:
+        validationToken: Graph subscription validation; echoed back as text.
+
+    Returns:
+        202 once queued, or the validation token.
+
+    Raises:
+        HTTPException: 400 on a non-JSON body, 401 if the request is not
+            authenticated, 503 if the ingestion queue is full or neither
+            TEAMS_WEBHOOK_SECRET nor TEAMS_WEBHOOK_CLIENT_STATE is configured.
+    """
+    if validationToken is not None:
+        return Response(content=validationToken, media_type="text/plain", status_code=200)
+
+    if not (settings.TEAMS_WEBHOOK_SECRET or settings.TEAMS_WEBHOOK_CLIENT_STATE):
+        logger.error("Teams webhook called but no TEAMS_WEBHOOK_SECRET/TEAMS_WEBHOOK_CLIENT_STATE is configured.")
+        raise HTTPException(status_code=503, detail="Teams webhook is not configured.")
+    trusted = secret_matches(request.headers.get("X-Webhook-Secret"), settings.TEAMS_WEBHOOK_SECRET)
+
+    try:
+        payload = json.loads(await request.body())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object.")
+    # Without the secret, only notifications (checked one by one against
+    # the clientState by the ingestor) are allowed
+    if not trusted and not (settings.TEAMS_WEBHOOK_CLIENT_STATE and isinstance(payload.get("value"), list)):
+        raise HTTPException(status_code=401, detail="Missing or invalid webhook secret.")
+
+    if not teams_ingestor.submit(payload, trusted):
+        logger.warning("Teams ingestion queue full, rejecting webhook call.")
+        raise HTTPException(status_code=503, detail="Ingestion queue full.", headers={"Retry-After": "5"})
+    return {"status": "accepted"}
+
+
+@router.get("/stats")
+async def webhook_stats() -> dict:
+    """
+    Teams ingestion counters (queue, duplicates, skipped, write buffer).
+    """
+    return {"teams": teams_ingestor.stats()}
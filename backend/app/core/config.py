@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,136 @@ class Settings(BaseSettings):
     MONGO_DB_NAME: str
     GEMINI_API_KEY: str
 
+    # Response cache in front of Gemini
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 600
+
+    # LLM gateway: concurrent Gemini calls, extra waiters before shedding, per-call timeout
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_MAX_QUEUE: int = 64
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    # Streams: the per-call timeout bounds opening the stream and every gap
+    # between chunks; this bounds the whole reply
+    LLM_STREAM_MAX_SECONDS: float = 120.0
+
+    # LLM resilience: adaptive timeout (p99 x multiplier, clamped to
+    # [LLM_MIN_TIMEOUT_SECONDS, LLM_TIMEOUT_SECONDS]), circuit breaker and
+    # hedged second requests (off by default: a hedge is a second billed call)
+    LLM_LATENCY_WINDOW: int = 200
+    LLM_ADAPTIVE_MIN_SAMPLES: int = 20
+    LLM_TIMEOUT_P99_MULTIPLIER: float = 2.0
+    LLM_MIN_TIMEOUT_SECONDS: float = 5.0
+    LLM_BREAKER_FAILURES: int = 5
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 15.0
+    LLM_BREAKER_MAX_COOLDOWN_SECONDS: float = 120.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_MAX_RATIO: float = 0.1
+
+    # Admission control for LLM-bound chat requests: per-user and per-chat
+    # token buckets, global requests/tokens per minute, and the share of the
+    # global budget each priority class must leave for higher classes
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_USER_PER_MINUTE: float = 20.0
+    ADMISSION_USER_BURST: float = 5.0
+    ADMISSION_CHAT_PER_MINUTE: float = 30.0
+    ADMISSION_CHAT_BURST: float = 10.0
+    ADMISSION_GLOBAL_RPM: float = 1000.0
+    ADMISSION_GLOBAL_TPM: float = 1_000_000.0
+    ADMISSION_PRIORITY_RESERVES: Dict[str, float] = {"interactive": 0.0, "bridge": 0.2, "batch": 0.5}
+    ADMISSION_MAX_KEYS: int = 100_000  # buckets kept per table (LRU)
+
+    # No-LLM fast path: dining-by-date and latest-announcement templates and
+    # curated FAQ answers, served when the match confidence reaches the threshold
+    FAST_PATH_ENABLED: bool = True
+    FAST_PATH_MIN_CONFIDENCE: float = 0.8
+
+    # In-process context snapshot: version poll, forced reload age, max wait when cold
+    SNAPSHOT_POLL_SECONDS: float = 5.0
+    SNAPSHOT_MAX_AGE_SECONDS: float = 300.0
+    SNAPSHOT_READ_TIMEOUT_SECONDS: float = 0.5
+
+    # Multi-worker mode (python main.py --workers N): one refresher process
+    # publishes the chat context to SHARED_SNAPSHOT_PATH and maintains the
+    # retrieval indexes; workers (SHARED_SNAPSHOT_READ) map the snapshot and
+    # follow the index files instead of polling MongoDB
+    SHARED_SNAPSHOT_PATH: str = "data/context_snapshot.bin"
+    SHARED_SNAPSHOT_SIZE: int = 4 * 1024 * 1024
+    SHARED_SNAPSHOT_READ: bool = False
+
+    # BM25 announcement retrieval
+    ANNOUNCEMENT_INDEX_PATH: str = "data/announcements_bm25.npz"
+    ANNOUNCEMENT_INDEX_POLL_SECONDS: float = 30.0
+    ANNOUNCEMENT_SEARCH_TOP_K: int = 3
+
+    # Dense-vector semantic retrieval over announcements and menu history
+    VECTOR_STORE_DIR: str = "data/vectors"
+    VECTOR_STORE_DIM: int = 256
+    VECTOR_STORE_POLL_SECONDS: float = 30.0
+    SEMANTIC_SEARCH_TOP_K: int = 3
+    SEMANTIC_MIN_SCORE: float = 0.2
+
+    # Conversation memory: per-user ring buffer, global LRU bounds, idle cutoff
+    CONVERSATION_MAX_USERS: int = 50000
+    CONVERSATION_MAX_BYTES_PER_USER: int = 2048
+    CONVERSATION_MAX_TOTAL_BYTES: int = 64 * 1024 * 1024
+    CONVERSATION_IDLE_SECONDS: float = 1800.0
+    CONVERSATION_HISTORY_TOKENS: int = 400
+    # Persist turns to MongoDB (write-behind) and reload them after restarts
+    CONVERSATION_PERSIST: bool = False
+    CONVERSATION_TTL_DAYS: int = 30
+    # Check MongoDB for newer turns on every message, not only the first one a
+    # process sees (set by main.py --workers N, where consecutive messages of
+    # a user may reach different workers; requires CONVERSATION_PERSIST)
+    CONVERSATION_READ_THROUGH: bool = False
+
+    # Query log (question, intent, source, latency, reply per chat message),
+    # written behind the request path; export with python -m app.llm_engine.query_log
+    QUERY_LOG_ENABLED: bool = True
+    QUERY_LOG_TTL_DAYS: int = 90
+
+    # Prompt assembly: estimated-token budget per intent (JSON in env), query cap,
+    # share of the remaining budget history may take
+    PROMPT_TOKEN_BUDGETS: Dict[str, int] = {"dining": 600, "announcement": 1500, "general": 1200}
+    PROMPT_DEFAULT_TOKEN_BUDGET: int = 1200
+    PROMPT_MAX_QUERY_TOKENS: int = 300
+    PROMPT_HISTORY_SHARE: float = 0.3
+
+    # POST /chat/batch: max messages per request, concurrent replies per batch
+    CHAT_BATCH_MAX_ITEMS: int = 5000
+    CHAT_BATCH_CONCURRENCY: int = 8
+
+    # GET /feed: page size default/max, first-page cache max age
+    FEED_PAGE_SIZE: int = 20
+    FEED_MAX_PAGE_SIZE: int = 50
+    FEED_CACHE_MAX_AGE_SECONDS: float = 60.0
+
+    # Announcement push hub: poll interval without change streams, per-client
+    # queue (overflow disconnects), clients per worker, idle heartbeat
+    PUSH_POLL_SECONDS: float = 2.0
+    PUSH_QUEUE_SIZE: int = 64
+    PUSH_MAX_SUBSCRIBERS: int = 10000
+    PUSH_HEARTBEAT_SECONDS: float = 30.0
+
+    # Teams webhook ingestion. Every call must be authenticated: flows and
+    # bridges send TEAMS_WEBHOOK_SECRET in the X-Webhook-Secret header, Graph
+    # notifications carry TEAMS_WEBHOOK_CLIENT_STATE; with neither set the
+    # webhook rejects all payloads
+    TEAMS_WEBHOOK_SECRET: Optional[str] = None
+    TEAMS_WEBHOOK_CLIENT_STATE: Optional[str] = None  # expected clientState of Graph subscriptions
+    TEAMS_QUEUE_SIZE: int = 5000
+    TEAMS_NORMALIZE_BATCH: int = 200
+    TEAMS_DEDUPE_CACHE_SIZE: int = 20000
+
+    # Startup warm-up (runs in the background; GET /warmup runs it on demand)
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_MONGO_CONNECTIONS: int = 4  # concurrent pings to open pooled connections
+    WARMUP_LLM_CONNECTION: bool = False  # one Gemini metadata request to open the HTTPS pool
+
+    # Write-behind buffers for background MongoDB inserts
+    WRITE_BEHIND_FLUSH_SECONDS: float = 1.0
+    WRITE_BEHIND_MAX_BATCH: int = 500
+    WRITE_BEHIND_MAX_PENDING: int = 10000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_ignore_empty=True,
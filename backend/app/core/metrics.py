@@ -0,0 +1,215 @@
+# backend/app/core/metrics.py
+
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Seconds; covers in-memory stages (sub-millisecond) up to slow model calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Estimated tokens (see estimate_tokens)
+SIZE_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 1500, 2048, 4096, 8192)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with labels.
+
+    `observe()` is a bisect plus three in-place updates, cheap enough for
+    every request; cumulative bucket counts are only computed when scraped.
+    All observations happen on the event loop thread, so no lock is taken.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._bounds = [f'le="{bound}"' for bound in self.buckets] + ['le="+Inf"']
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._children: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        child[0][bisect_left(self.buckets, value)] += 1
+        child[1] += value
+        child[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total, count) in sorted(self._children.items()):
+            cumulative = 0
+            for le, bucket_count in zip(self._bounds, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class GaugeCallback:
+    """
+    Gauge (or counter) whose value is read from a callback at scrape time,
+    for state that components already track (queue depth, cache hits).
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield f"{self.name} {_format_value(self.callback())}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge_callback(self, name: str, documentation: str, callback: Callable[[], float], kind: str = "gauge") -> GaugeCallback:
+        return self.register(GaugeCallback(name, documentation, callback, kind))
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format (0.0.4).
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+CHAT_STAGE_SECONDS = registry.histogram(
+    "chat_stage_seconds", "Time spent in each stage of a chat request.", ("stage", "intent", "outcome"),
+)
+CHAT_REQUEST_SECONDS = registry.histogram(
+    "chat_request_seconds", "End-to-end chat request time.", ("route", "intent", "outcome"),
+)
+LLM_QUEUE_WAIT_SECONDS = registry.histogram(
+    "llm_gateway_wait_seconds", "Time LLM calls waited for a gateway slot.",
+)
+LLM_CALL_SECONDS = registry.histogram(
+    "llm_call_seconds", "Gemini call duration, excluding the gateway wait.", ("outcome",),
+)
+THREAD_QUEUE_WAIT_SECONDS = registry.histogram(
+    "thread_pool_wait_seconds", "Time work offloaded to the default executor waited for a thread.", ("task",),
+)
+PROMPT_TOKENS = registry.histogram(
+    "llm_prompt_tokens", "Estimated prompt size sent to Gemini.", ("intent",), SIZE_BUCKETS,
+)
+RESPONSE_TOKENS = registry.histogram(
+    "llm_response_tokens", "Estimated reply size.", ("intent",), SIZE_BUCKETS,
+)
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one request.
+
+    `mark(stage)` closes the stage that started at the previous mark; the
+    durations are only recorded by `finish()`, once intent and outcome are
+    known, so every stage carries the same labels.
+    """
+
+    __slots__ = ("route", "started", "_last", "_stages")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.started = self._last = time.perf_counter()
+        self._stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._stages.append((stage, now - self._last))
+        self._last = now
+
+    def skip(self) -> None:
+        """
+        Excludes the time since the last mark from the next stage.
+        """
+        self._last = time.perf_counter()
+
+    def finish(self, intent: str, outcome: str) -> float:
+        """
+        Records all stages and the request total.
+
+        Returns:
+            Seconds since the timer started.
+        """
+        for stage, seconds in self._stages:
+            CHAT_STAGE_SECONDS.observe(seconds, stage, intent, outcome)
+        total = time.perf_counter() - self.started
+        CHAT_REQUEST_SECONDS.observe(total, self.route, intent, outcome)
+        return total
+
+
+async def to_thread(task: str, func: Callable[..., T], *args) -> T:
+    """
+    asyncio.to_thread() that records how long the call waited for a thread
+    of the default executor (THREAD_QUEUE_WAIT_SECONDS, label `task`).
+    """
+    submitted = time.perf_counter()
+    started = []
+
+    def run():
+        started.append(time.perf_counter())
+        return func(*args)
+
+    try:
+        return await asyncio.to_thread(run)
+    finally:
+        if started:
+            THREAD_QUEUE_WAIT_SECONDS.observe(started[0] - submitted, task)
@@ -0,0 +1,14 @@
+# backend/app/core/security.py
+
+import hmac
+from typing import Optional
+
+
+def secret_matches(supplied: Optional[str], expected: Optional[str]) -> bool:
+    """
+    Constant-time comparison of a client-supplied secret with the configured
+    one. Never matches when no secret is configured.
+    """
+    if not expected or supplied is None:
+        return False
+    return hmac.compare_digest(supplied.encode("utf-8"), expected.encode("utf-8"))
@@ -0,0 +1,63 @@
+# backend/app/core/warmup.py
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.db.mongo import db
+from app.llm_engine.classifier import decide_intent
+from app.llm_engine.gemini_client import warm_up_client
+
+logger = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+async def _step(timings: Dict[str, float], name: str, coro) -> None:
+    started = time.perf_counter()
+    try:
+        await coro
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    except Exception as e:
+        logger.warning(f"Warm-up step '{name}' failed: {e}")
+        timings[name] = -1.0
+
+
+async def _classifier() -> None:
+    # No word starts with a keyword ("yemkhane" is a typo), so this skips the
+    # exact index and imports rapidfuzz and runs its cdist scorer once
+    await asyncio.to_thread(decide_intent, "yemkhane acik mi")
+
+
+async def _mongo_pool(connections: int) -> None:
+    await asyncio.gather(*(db.client.admin.command("ping") for _ in range(connections)))
+
+
+async def _run() -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    await asyncio.gather(
+        _step(timings, "classifier", _classifier()),
+        _step(timings, "mongo_pool", _mongo_pool(settings.WARMUP_MONGO_CONNECTIONS)),
+        _step(timings, "llm_client", warm_up_client(settings.WARMUP_LLM_CONNECTION)),
+    )
+    logger.info(f"Warm-up finished: {timings} (ms)")
+    return timings
+
+
+def warm_up() -> asyncio.Task:
+    """
+    Pays the first-request costs that startup defers: loads the fuzzy
+    matcher, opens pooled MongoDB connections and creates the Gemini client
+    (optionally opening its HTTPS connection). Concurrent callers share one
+    run; a finished run is repeated on the next call (every step is cheap
+    once warm).
+
+    Returns:
+        The task; its result maps step name -> milliseconds (-1 if it failed).
+    """
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_run())
+    return _task
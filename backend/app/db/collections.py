@@ -0,0 +1,28 @@
+# backend/app/db/collections.py
+
+# Collections queried directly by the backend
+DINING_COLLECTION = "dining"
+ANNOUNCEMENTS_COLLECTION = "announcements"
+
+# Raw collections written by the data pipeline
+PIPELINE_ANNOUNCEMENTS_COLLECTION = "cse_akdeniz_announcements"
+PIPELINE_MENU_COLLECTION = "yemekhane_listesi"
+
+# Conversation turns persisted by the backend (write-behind, TTL-expired)
+CONVERSATIONS_COLLECTION = "conversations"
+# One document per answered chat message, for evaluation (write-behind, TTL-expired)
+QUERY_LOG_COLLECTION = "query_log"
+
+# Chat-ready context documents materialized by the data pipeline
+# (data-pipeline/storage/mongo_writer.py), looked up by _id.
+CHAT_CONTEXT_COLLECTION = "chat_context"
+ANNOUNCEMENTS_DIGEST_ID = "announcements:latest"
+# Counter the pipeline increments on every context write
+CONTEXT_VERSION_ID = "version"
+
+
+def dining_context_id(day: str) -> str:
+    """
+    _id of the materialized menu context for a YYYY-MM-DD date.
+    """
+    return f"dining:{day}"
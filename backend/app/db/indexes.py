@@ -0,0 +1,235 @@
+# backend/app/db/indexes.py
+"""
+Declarative MongoDB indexes for the collections the backend queries.
+
+Applied at startup from `lifespan`. Run as a module to verify that every hot
+query is served by an index:
+
+    python -m app.db.indexes --check          # explain() hot queries, exit 1 on COLLSCAN
+    python -m app.db.indexes --apply --check  # create indexes first
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.collections import (
+    ANNOUNCEMENTS_COLLECTION,
+    CHAT_CONTEXT_COLLECTION,
+    CONTEXT_VERSION_ID,
+    CONVERSATIONS_COLLECTION,
+    PIPELINE_ANNOUNCEMENTS_COLLECTION,
+    PIPELINE_MENU_COLLECTION,
+    QUERY_LOG_COLLECTION,
+    DINING_COLLECTION,
+    dining_context_id,
+)
+from app.db.mongo import db, connect_to_mongo, close_mongo_connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: List[Tuple[str, int]]
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return options
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A query on the request path that must never scan a whole collection."""
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 0
+    projection: Optional[Dict[str, Any]] = None
+
+
+INDEXES: List[IndexSpec] = [
+    IndexSpec(DINING_COLLECTION, [("date", ASCENDING)], unique=True),
+    IndexSpec(ANNOUNCEMENTS_COLLECTION, [("created_at", DESCENDING)]),
+    # Dining context documents carry `expires_at`; digest/version never expire
+    IndexSpec(CHAT_CONTEXT_COLLECTION, [("expires_at", ASCENDING)], expire_after_seconds=0),
+    # Feed keyset pagination: sort and range on (created_at, _id)
+    IndexSpec(PIPELINE_ANNOUNCEMENTS_COLLECTION, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    # Push hub tailing poll
+    IndexSpec(PIPELINE_ANNOUNCEMENTS_COLLECTION, [("scraped_at", ASCENDING)]),
+    # Vector store menu tailing (menus are upserted in place)
+    IndexSpec(PIPELINE_MENU_COLLECTION, [("updated_at", ASCENDING)]),
+    # Teams messages share the announcements collection; website documents have no message_id
+    IndexSpec(PIPELINE_ANNOUNCEMENTS_COLLECTION, [("message_id", ASCENDING)], unique=True, sparse=True),
+    IndexSpec(CONVERSATIONS_COLLECTION, [("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    IndexSpec(
+        CONVERSATIONS_COLLECTION,
+        [("created_at", ASCENDING)],
+        expire_after_seconds=settings.CONVERSATION_TTL_DAYS * 24 * 3600,
+    ),
+    # Also serves the time-range scan of the query log export
+    IndexSpec(
+        QUERY_LOG_COLLECTION,
+        [("created_at", ASCENDING)],
+        expire_after_seconds=settings.QUERY_LOG_TTL_DAYS * 24 * 3600,
+    ),
+]
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery(
+        "snapshot: context documents by _id",
+        CHAT_CONTEXT_COLLECTION,
+        {"_id": {"$in": [dining_context_id("2000-01-01"), CONTEXT_VERSION_ID]}},
+    ),
+    HotQuery(
+        "snapshot: version marker",
+        CHAT_CONTEXT_COLLECTION,
+        {"_id": CONTEXT_VERSION_ID},
+        limit=1,
+    ),
+    HotQuery(
+        "snapshot: dining fallback by date",
+        DINING_COLLECTION,
+        {"date": {"$in": ["2000-01-01", "2000-01-02"]}},
+    ),
+    HotQuery(
+        "snapshot: latest announcements fallback",
+        ANNOUNCEMENTS_COLLECTION,
+        {},
+        sort=[("created_at", DESCENDING)],
+        limit=3,
+    ),
+    HotQuery(
+        "feed: first page",
+        PIPELINE_ANNOUNCEMENTS_COLLECTION,
+        {"created_at": {"$exists": True}},
+        sort=[("created_at", DESCENDING), ("_id", DESCENDING)],
+        limit=21,
+    ),
+    HotQuery(
+        "feed: page after cursor",
+        PIPELINE_ANNOUNCEMENTS_COLLECTION,
+        {"$or": [
+            {"created_at": {"$lt": datetime(2000, 1, 1)}},
+            {"created_at": datetime(2000, 1, 1), "_id": {"$lt": ObjectId("000000000000000000000000")}},
+        ]},
+        sort=[("created_at", DESCENDING), ("_id", DESCENDING)],
+        limit=21,
+    ),
+    HotQuery(
+        "push hub: announcements scraped since watermark",
+        PIPELINE_ANNOUNCEMENTS_COLLECTION,
+        {"scraped_at": {"$gte": datetime(2000, 1, 1)}},
+        sort=[("scraped_at", ASCENDING)],
+        limit=500,
+    ),
+    HotQuery(
+        "conversation memory: recent turns of a user",
+        CONVERSATIONS_COLLECTION,
+        {"user_id": "example"},
+        sort=[("created_at", DESCENDING)],
+        limit=32,
+    ),
+]
+
+
+async def ensure_indexes(database, specs: Optional[List[IndexSpec]] = None) -> None:
+    """
+    Creates the declared indexes, concurrently (one round trip each).
+    create_index is idempotent, so this is safe on every startup. Failures
+    (e.g. existing duplicates blocking a unique index) are logged and do not
+    stop the application.
+    """
+    async def create(spec: IndexSpec) -> None:
+        try:
+            await database[spec.collection].create_index(spec.keys, **spec.options())
+        except PyMongoError as e:
+            logger.error(f"Could not create index {spec.collection}.{spec.name}: {e}")
+
+    await asyncio.gather(*(create(spec) for spec in (specs if specs is not None else INDEXES)))
+    logger.info("MongoDB indexes ensured.")
+
+
+def _iter_stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        stage = plan.get("stage")
+        if stage:
+            yield stage
+        for value in plan.values():
+            yield from _iter_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _iter_stages(item)
+
+
+async def explain_hot_queries(database, queries: Optional[List[HotQuery]] = None) -> List[Tuple[HotQuery, List[str]]]:
+    """
+    Runs explain() on each hot query.
+
+    Returns:
+        (query, stages of the winning plan) for every query.
+    """
+    results = []
+    for query in queries if queries is not None else HOT_QUERIES:
+        cursor = database[query.collection].find(query.filter, query.projection)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+        if query.limit:
+            cursor = cursor.limit(query.limit)
+        explain = await cursor.explain()
+        stages = list(_iter_stages(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        results.append((query, stages))
+    return results
+
+
+async def _main(apply: bool, check: bool) -> int:
+    await connect_to_mongo()
+    try:
+        if apply:
+            await ensure_indexes(db.db)
+
+        if not check:
+            return 0
+
+        failed = False
+        for query, stages in await explain_hot_queries(db.db):
+            scan = "COLLSCAN" in stages
+            failed |= scan
+            print(f"{'FAIL' if scan else 'ok  '} {query.name}: {' <- '.join(stages) or 'n/a'}")
+        return 1 if failed else 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and verify backend MongoDB indexes.")
+    parser.add_argument("--apply", action="store_true", help="create the declared indexes")
+    parser.add_argument("--check", action="store_true", help="fail if any hot query uses COLLSCAN")
+    args = parser.parse_args()
+    if not (args.apply or args.check):
+        parser.error("nothing to do: pass --apply and/or --check")
+    sys.exit(asyncio.run(_main(args.apply, args.check)))
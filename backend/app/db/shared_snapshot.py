@@ -0,0 +1,163 @@
+# backend/app/db/shared_snapshot.py
+
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"CCSN"
+_LAYOUT = 1
+
+# magic, layout, sequence, payload length, payload crc32, heartbeat (unix time)
+_HEADER = struct.Struct("<4sIQIId")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+_HEARTBEAT = struct.Struct("<d")
+_HEARTBEAT_OFFSET = 24
+
+# A reader racing the writer retries this many times before keeping what it has
+_READ_ATTEMPTS = 8
+
+
+class SnapshotWriter:
+    """
+    Publishes a JSON payload into a fixed-size memory-mapped file that any
+    number of reader processes map read-only.
+
+    The file is a 32-byte header followed by the payload. Updates follow a
+    seqlock: the sequence number is odd while the payload is being written
+    and even once it is complete, so readers detect (and retry) torn reads
+    without any lock shared between processes. The file is updated in
+    place, never replaced, so readers map it once for their lifetime.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Only ever grow: shrinking under a reader's mapping would fault it
+            size = max(size, os.fstat(fd).st_size)
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        magic, layout, sequence, _, _, _ = _HEADER.unpack_from(self._map)
+        # Continue the sequence across restarts so readers never miss a change
+        self._sequence = sequence + (sequence & 1) if (magic, layout) == (_MAGIC, _LAYOUT) else 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._map) - _HEADER.size
+
+    def publish(self, payload: Dict[str, Any]) -> int:
+        """
+        Writes a new payload and makes it visible to readers.
+
+        Returns:
+            The new (even) sequence number.
+
+        Raises:
+            ValueError: If the encoded payload does not fit in the file.
+        """
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.capacity:
+            raise ValueError(f"Snapshot of {len(data)} bytes exceeds the {self.capacity} bytes of {self.path}")
+
+        writing = self._sequence + 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, writing)
+        self._map[_HEADER.size:_HEADER.size + len(data)] = data
+        _HEADER.pack_into(self._map, 0, _MAGIC, _LAYOUT, writing, len(data), zlib.crc32(data), time.time())
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, writing + 1)
+        self._sequence = writing + 1
+        return self._sequence
+
+    def heartbeat(self) -> None:
+        """Marks the snapshot as still maintained without changing it."""
+        _HEARTBEAT.pack_into(self._map, _HEARTBEAT_OFFSET, time.time())
+
+    def close(self) -> None:
+        self._map.flush()
+        self._map.close()
+
+
+class SnapshotReader:
+    """
+    Read side of SnapshotWriter. Checking for a new snapshot reads 8 bytes
+    straight from the shared mapping; the payload is only copied and decoded
+    when the sequence number changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+
+    def _mapping(self) -> Optional[mmap.mmap]:
+        if self._map is None:
+            try:
+                with open(self.path, "rb") as f:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                # Not created yet, or still empty
+                return None
+            if mapping[:4] != _MAGIC:
+                mapping.close()
+                return None
+            self._map = mapping
+        return self._map
+
+    def sequence(self) -> Optional[int]:
+        """
+        Current sequence number (odd while a write is in progress), None
+        until the refresher has created the file.
+        """
+        mapping = self._mapping()
+        if mapping is None:
+            return None
+        return _SEQUENCE.unpack_from(mapping, _SEQUENCE_OFFSET)[0]
+
+    def heartbeat_age(self) -> Optional[float]:
+        """Seconds since the writer last published or sent a heartbeat."""
+        mapping = self._mapping()
+        if mapping is None:
+            return None
+        return time.time() - _HEARTBEAT.unpack_from(mapping, _HEARTBEAT_OFFSET)[0]
+
+    def read(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Returns:
+            (sequence, payload) of the last complete snapshot, or None if
+            nothing was published yet or every attempt raced a write.
+        """
+        for _ in range(_READ_ATTEMPTS):
+            mapping = self._mapping()
+            if mapping is None:
+                return None
+            magic, layout, sequence, length, crc, _ = _HEADER.unpack_from(mapping)
+            if layout != _LAYOUT or sequence == 0:
+                return None
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            if _HEADER.size + length > len(mapping):
+                # The writer grew the file: map it again
+                self.close()
+                continue
+            data = mapping[_HEADER.size:_HEADER.size + length]
+            if _SEQUENCE.unpack_from(mapping, _SEQUENCE_OFFSET)[0] == sequence and zlib.crc32(data) == crc:
+                return sequence, json.loads(data)
+        logger.warning(f"Could not read a consistent snapshot from {self.path}")
+        return None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
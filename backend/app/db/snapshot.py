@@ -0,0 +1,286 @@
+# backend/app/db/snapshot.py
+
+import asyncio
+import logging
+import time
+from datetime import date as date_type, timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.db.mongo import db
+from app.db.shared_snapshot import SnapshotReader
+from app.db.collections import (
+    ANNOUNCEMENTS_COLLECTION,
+    ANNOUNCEMENTS_DIGEST_ID,
+    CHAT_CONTEXT_COLLECTION,
+    CONTEXT_VERSION_ID,
+    DINING_COLLECTION,
+    dining_context_id,
+)
+
+logger = logging.getLogger(__name__)
+
+NO_ANNOUNCEMENTS = "No recent announcements."
+
+
+def _menu_not_found(day: str) -> str:
+    return f"VERİTABANI BİLGİSİ: {day} tarihi için yemek listesi bulunamadı."
+
+
+def _format_menu(day: str, menu: dict) -> str:
+    # Simplified structure: Just read the 'items' list
+    items = menu.get('items', [])
+    location = menu.get('location', 'Akdeniz Üniversitesi Yemekhanesi')
+
+    if items:
+        return f"VERİTABANI BİLGİSİ ({day} Menüsü - {location}): {', '.join(items)}"
+    return "VERİTABANI BİLGİSİ: Menü kaydı var ama içi boş."
+
+
+def _format_announcements(announcements: List[dict]) -> str:
+    if not announcements:
+        return NO_ANNOUNCEMENTS
+
+    context_lines = ["Recent Announcements:"]
+    for i, ann in enumerate(announcements, 1):
+        title = ann.get("title", "N/A")
+        content = ann.get("content", "N/A")
+        source = ann.get("source", "N/A")
+        context_lines.append(
+            f"{i}. [{source}] {title}\n   {content[:100]}..."
+        )
+    return "\n".join(context_lines)
+
+
+class ContextSnapshot:
+    """
+    In-memory copy of the chat context (this week's menus and the recent
+    announcements digest), so chat requests never wait on MongoDB.
+
+    A background task polls the pipeline's version marker in `chat_context`
+    and reloads when it changes, with a full reload at least every
+    `max_age_seconds`. Reads are stale-while-revalidate: they always return
+    what is in memory and kick off a refresh in the background if the data
+    is too old or the requested key is missing. Only a snapshot that has
+    never loaded waits for a refresh, and then at most `read_timeout_seconds`.
+
+    With `shared_path` (workers of a multi-worker deployment) nothing polls
+    MongoDB: reads adopt the snapshot the refresher process publishes there
+    (see shared_snapshot.py) whenever its sequence number changes. Only if
+    the refresher stops sending heartbeats for `max_age_seconds` does the
+    worker fall back to loading from MongoDB itself.
+    """
+
+    def __init__(
+        self,
+        poll_interval_seconds: float,
+        max_age_seconds: float,
+        read_timeout_seconds: float,
+        shared_path: Optional[str] = None,
+    ):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        self._shared = SnapshotReader(shared_path) if shared_path else None
+        self._shared_sequence: Optional[int] = None
+
+        self._contexts: Dict[str, str] = {}
+        self._version: Optional[int] = None
+        self._loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._poll_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.stale_reads = 0
+        self.missing_reads = 0
+        self.shared_loads = 0
+
+    async def start(self) -> None:
+        """
+        Loads the first snapshot and starts the version poller (neither in
+        shared mode, where the refresher process does both).
+        """
+        if self._shared is not None:
+            return
+        try:
+            await asyncio.wait_for(self.refresh(), self.read_timeout_seconds * 10)
+        except Exception as e:
+            logger.warning(f"Initial context snapshot load failed, serving lazily: {e}")
+        self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        for task in (self._poll_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+        self._poll_task = None
+        if self._shared is not None:
+            self._shared.close()
+
+    @property
+    def version(self) -> Optional[int]:
+        """
+        Last seen value of the pipeline's context version marker; changes
+        whenever the pipeline stores a menu or an announcement.
+        """
+        if self._shared is not None:
+            self._sync_shared()
+        return self._version
+
+    async def dining(self, day: Optional[str] = None) -> str:
+        """
+        Returns the dining context for `day` (YYYY-MM-DD, default today).
+        """
+        day = day or date_type.today().strftime("%Y-%m-%d")
+        context = await self._get(dining_context_id(day))
+        return context if context is not None else _menu_not_found(day)
+
+    async def announcements(self) -> str:
+        """
+        Returns the recent announcements digest.
+        """
+        context = await self._get(ANNOUNCEMENTS_DIGEST_ID)
+        return context if context is not None else NO_ANNOUNCEMENTS
+
+    def export(self) -> dict:
+        """
+        The loaded contexts and version, as published to workers.
+        """
+        return {"contexts": self._contexts, "version": self._version}
+
+    def _sync_shared(self) -> bool:
+        """
+        Adopts the refresher's snapshot if it published a new one.
+
+        Returns:
+            Whether the shared snapshot is live (refresher heartbeat within
+            max_age_seconds); if not, the caller loads from MongoDB.
+        """
+        sequence = self._shared.sequence()
+        if sequence is None:
+            return False
+        if sequence != self._shared_sequence:
+            snapshot = self._shared.read()
+            if snapshot is None:
+                # Mid-write: keep serving the previous snapshot, if any
+                return self._shared_sequence is not None
+            self._shared_sequence, payload = snapshot
+            self._contexts = payload["contexts"]
+            self._version = payload["version"]
+            self.shared_loads += 1
+        return self._shared.heartbeat_age() <= self.max_age_seconds
+
+    async def _get(self, context_id: str) -> Optional[str]:
+        if self._shared is not None and self._sync_shared():
+            return self._contexts.get(context_id)
+
+        context = self._contexts.get(context_id)
+
+        if self._loaded_at is None:
+            # Never loaded: wait briefly for a refresh, then answer regardless
+            try:
+                await asyncio.wait_for(asyncio.shield(self._schedule_refresh()), self.read_timeout_seconds)
+            except Exception:
+                pass
+            context = self._contexts.get(context_id)
+        elif context is None:
+            # e.g. the date rolled over since the last load; a day without a
+            # menu stays missing, so retry at most once per poll interval
+            self.missing_reads += 1
+            if time.monotonic() - self._loaded_at > self.poll_interval_seconds:
+                self._schedule_refresh()
+        elif time.monotonic() - self._loaded_at > self.max_age_seconds:
+            self.stale_reads += 1
+            self._schedule_refresh()
+
+        return context
+
+    def _schedule_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_quietly())
+        return self._refresh_task
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Context snapshot refresh failed: {e}")
+
+    async def refresh(self) -> None:
+        """
+        Reloads all context documents for the current week in one query and
+        swaps them in atomically.
+        """
+        try:
+            today = date_type.today()
+            days = [(today + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(-1, 7)]
+            ids = [dining_context_id(day) for day in days] + [ANNOUNCEMENTS_DIGEST_ID, CONTEXT_VERSION_ID]
+
+            docs = await db.db[CHAT_CONTEXT_COLLECTION].find({"_id": {"$in": ids}}).to_list(length=len(ids))
+            by_id = {doc["_id"]: doc for doc in docs}
+
+            contexts = {
+                doc_id: doc["text"]
+                for doc_id, doc in by_id.items()
+                if doc_id != CONTEXT_VERSION_ID and "text" in doc
+            }
+
+            # Dates the pipeline has not materialized: read the dining collection
+            missing_days = [day for day in days if dining_context_id(day) not in contexts]
+            if missing_days:
+                menus = await db.db[DINING_COLLECTION].find({"date": {"$in": missing_days}}) \
+                    .to_list(length=len(missing_days))
+                for menu in menus:
+                    contexts[dining_context_id(menu["date"])] = _format_menu(menu["date"], menu)
+
+            if ANNOUNCEMENTS_DIGEST_ID not in contexts:
+                announcements = await db.db[ANNOUNCEMENTS_COLLECTION].find() \
+                    .sort("created_at", -1) \
+                    .limit(3) \
+                    .to_list(length=3)
+                contexts[ANNOUNCEMENTS_DIGEST_ID] = _format_announcements(announcements)
+        except Exception:
+            self.refresh_failures += 1
+            raise
+
+        self._contexts = contexts
+        self._version = by_id.get(CONTEXT_VERSION_ID, {}).get("version")
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    async def _read_version(self) -> Optional[int]:
+        doc = await db.db[CHAT_CONTEXT_COLLECTION].find_one({"_id": CONTEXT_VERSION_ID}, {"version": 1})
+        return doc.get("version") if doc else None
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                version = await self._read_version()
+                too_old = self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age_seconds
+                if version != self._version or too_old:
+                    await self._schedule_refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Context version poll failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "version": self._version,
+            "entries": len(self._contexts),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 3) if self._loaded_at else None,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "stale_reads": self.stale_reads,
+            "missing_reads": self.missing_reads,
+            "shared_loads": self.shared_loads if self._shared is not None else None,
+        }
+
+
+context_snapshot = ContextSnapshot(
+    poll_interval_seconds=settings.SNAPSHOT_POLL_SECONDS,
+    max_age_seconds=settings.SNAPSHOT_MAX_AGE_SECONDS,
+    read_timeout_seconds=settings.SNAPSHOT_READ_TIMEOUT_SECONDS,
+    shared_path=settings.SHARED_SNAPSHOT_PATH if settings.SHARED_SNAPSHOT_READ else None,
+)
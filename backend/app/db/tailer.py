@@ -0,0 +1,65 @@
+# backend/app/db/tailer.py
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.db.mongo import db
+
+
+class CollectionTailer:
+    """
+    Incrementally reads new documents from append-mostly collections.
+
+    Keeps the highest ObjectId seen per collection (a watermark) and only asks
+    for documents above it, so every poll is a bounded _id range scan instead
+    of a full read. Watermarks are plain strings and can be persisted by the
+    caller to resume after a restart.
+
+    Collections whose documents are updated in place (upserted menus) can be
+    tailed by a timestamp field instead (`fields`, e.g. "updated_at"), so an
+    update is yielded again. Timestamps are not unique, so that range is
+    inclusive: the documents at the watermark come again on the next poll
+    and the caller must treat repeats as no-ops.
+    """
+
+    def __init__(
+        self,
+        collections: List[str],
+        projection: Optional[Dict[str, Any]] = None,
+        watermarks: Optional[Dict[str, str]] = None,
+        fields: Optional[Dict[str, str]] = None,
+    ):
+        self.collections = collections
+        self.projection = projection
+        self.watermarks: Dict[str, str] = dict(watermarks or {})
+        self.fields: Dict[str, str] = dict(fields or {})
+
+    def _query(self, field: str, watermark: Optional[str]) -> Dict[str, Any]:
+        if not watermark:
+            return {}
+        if field == "_id":
+            return {"_id": {"$gt": ObjectId(watermark)}}
+        try:
+            return {field: {"$gte": datetime.fromisoformat(watermark)}}
+        except ValueError:
+            # Watermark of another field (e.g. an _id saved before the switch): read everything once
+            return {}
+
+    async def poll(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yields (collection, document) for every document inserted since the
+        last poll, oldest first. The watermark advances as documents are yielded.
+        """
+        for collection in self.collections:
+            field = self.fields.get(collection, "_id")
+            query = self._query(field, self.watermarks.get(collection))
+
+            cursor = db.db[collection].find(query, self.projection).sort(field, 1)
+            async for doc in cursor:
+                yield collection, doc
+                if field == "_id":
+                    self.watermarks[collection] = str(doc["_id"])
+                elif isinstance(doc.get(field), datetime):
+                    self.watermarks[collection] = doc[field].isoformat()
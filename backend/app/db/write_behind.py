@@ -0,0 +1,156 @@
+# backend/app/db/write_behind.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.db.mongo import db
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class WriteBehindBuffer:
+    """
+    Batches inserts into one collection off the request path.
+
+    `add()` only appends to an in-memory queue; a background task writes the
+    queue with insert_many every `flush_interval_seconds` (or sooner once
+    `max_batch` documents are pending). The queue is bounded: when Mongo
+    falls behind, new documents are dropped and counted instead of growing
+    memory. Failed batches are put back and retried on the next flush;
+    duplicate-key errors are treated as already written.
+
+    `prepare` is called on every document right before it is sent (again on
+    a retry). Fields that readers use as watermarks (`_id`, `scraped_at`)
+    belong there: set at add() time they could be older than documents other
+    writers insert meanwhile, and a tailer already past them would never see
+    the document.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        flush_interval_seconds: float = 1.0,
+        max_batch: int = 500,
+        max_pending: int = 10000,
+        prepare: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.collection = collection
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.prepare = prepare
+
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def add(self, document: Dict[str, Any]) -> bool:
+        """
+        Queues a document for insertion.
+
+        Returns:
+            False if the buffer is full and the document was dropped.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+        self._pending.append(document)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """
+        Stops the background task and writes everything still pending.
+        """
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        while self._pending and await self.flush():
+            pass
+        if self._pending:
+            logger.error(f"{len(self._pending)} documents for '{self.collection}' were not written on shutdown.")
+
+    async def flush(self) -> int:
+        """
+        Writes up to `max_batch` pending documents.
+
+        Returns:
+            Number of documents taken off the queue (written or duplicates).
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+            if self.prepare:
+                for document in batch:
+                    self.prepare(document)
+            try:
+                result = await db.db[self.collection].insert_many(batch, ordered=False)
+                self.written += len(result.inserted_ids)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                duplicates = sum(1 for error in errors if error.get("code") == DUPLICATE_KEY_ERROR)
+                self.duplicates += duplicates
+                self.written += e.details.get("nInserted", 0)
+                if duplicates != len(errors):
+                    self._requeue([batch[error["index"]] for error in errors if error.get("code") != DUPLICATE_KEY_ERROR])
+                    self.failed_batches += 1
+                    logger.warning(f"Write-behind insert into '{self.collection}' partially failed: {len(errors) - duplicates} errors.")
+                    return 0
+            except PyMongoError as e:
+                self._requeue(batch)
+                self.failed_batches += 1
+                logger.warning(f"Write-behind insert into '{self.collection}' failed, will retry: {e}")
+                return 0
+            return len(batch)
+
+    def _requeue(self, documents) -> None:
+        room = self.max_pending - len(self._pending)
+        keep = documents[:max(0, room)]
+        self.dropped += len(documents) - len(keep)
+        self._pending.extendleft(reversed(keep))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await self.flush() == self.max_batch:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Write-behind flush for '{self.collection}' failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
@@ -0,0 +1,275 @@
+# backend/app/ingest/teams.py
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.collections import PIPELINE_ANNOUNCEMENTS_COLLECTION
+from app.core.security import secret_matches
+from app.db.write_behind import WriteBehindBuffer
+from app.utils.html import msg_html_to_text
+
+logger = logging.getLogger(__name__)
+
+TITLE_MAX_CHARS = 120
+SUMMARY_MAX_CHARS = 300
+
+
+def _parse_graph_datetime(value: Optional[str]) -> Optional[datetime]:
+    # Graph timestamps look like 2024-03-01T08:15:42.123Z; stored naive UTC like the pipeline's
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+
+def normalize_message(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Converts a Graph chatMessage into an announcement document.
+
+    Args:
+        message: chatMessage resource (id, body, from, createdDateTime, webUrl, ...).
+            Optional `teamName` / `channelName` keys, as sent by Power Automate
+            flows, become the document's `course`.
+
+    Returns:
+        The document (without `_id` and write timestamps, see
+        stamp_document()), or None if the message has no id or text.
+    """
+    message_id = message.get("id")
+    body = message.get("body") or {}
+    content = body.get("content") or ""
+    if not message_id or not content:
+        return None
+
+    text = msg_html_to_text(content) if body.get("contentType", "html").lower() == "html" else content.strip()
+    subject = (message.get("subject") or "").strip()
+    if not text and not subject:
+        return None
+
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    author = ((message.get("from") or {}).get("user") or {}).get("displayName")
+    return {
+        "source_type": "teams",
+        "message_id": str(message_id),
+        "title": _shorten(subject or first_line, TITLE_MAX_CHARS),
+        "content": text,
+        "summary": _shorten(" ".join(text.split()), SUMMARY_MAX_CHARS),
+        # link_1 is unique on this collection; messages without a webUrl still need one
+        "link": message.get("webUrl") or f"teams://message/{message_id}",
+        "author": author,
+        "course": message.get("channelName") or message.get("teamName"),
+        "sent_at": _parse_graph_datetime(message.get("createdDateTime")),
+    }
+
+
+def stamp_document(document: Dict[str, Any]) -> None:
+    """
+    Sets `_id`, `created_at` and `scraped_at` when the write-behind buffer
+    sends the document. The search index tailers follow `_id` and the push
+    hub follows `scraped_at`, so both must be as new as the insert itself.
+    """
+    now = datetime.utcnow()
+    document["_id"] = ObjectId()
+    document["created_at"] = now
+    document["scraped_at"] = now
+
+
+class TeamsIngestor:
+    """
+    Ingests Teams messages posted to the webhook off the request path.
+
+    `submit()` only puts the raw payload on a bounded asyncio queue, so the
+    webhook can acknowledge at once. A single worker drains the queue in
+    batches, converts message HTML to text in a worker thread (keeping
+    BeautifulSoup off the event loop that serves chat), drops messages it has
+    already seen and hands the documents to a write-behind buffer that
+    inserts them with insert_many. Teams messages share the announcements
+    collection with the website, so the feed, push hub and both search
+    indexes pick them up like any other announcement.
+    """
+
+    def __init__(
+        self,
+        queue_size: int,
+        normalize_batch: int,
+        dedupe_cache_size: int,
+        client_state: Optional[str],
+        buffer: WriteBehindBuffer,
+    ):
+        self.queue_size = queue_size
+        self.normalize_batch = normalize_batch
+        self.dedupe_cache_size = dedupe_cache_size
+        self.client_state = client_state
+        self.buffer = buffer
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Recently seen message ids; the unique message_id index catches the rest
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+        self.received = 0
+        self.rejected = 0
+        self.accepted = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.bad_client_state = 0
+        self.unauthenticated = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        await self.buffer.start()
+        self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        """
+        Stops the worker, processes what is still queued and flushes it.
+        """
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                await self._process(self._take_batch([]))
+        await self.buffer.stop()
+
+    def submit(self, payload: Dict[str, Any], trusted: bool = False) -> bool:
+        """
+        Queues a webhook payload without waiting.
+
+        Args:
+            payload: Graph notification batch or a plain chatMessage.
+            trusted: The sender proved the shared webhook secret. Untrusted
+                payloads are only accepted as notifications with the
+                expected clientState.
+
+        Returns:
+            False if the queue is full (or the ingestor is not running).
+        """
+        self.received += 1
+        if self._queue is None:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait((payload, trusted))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        return True
+
+    # --- Worker ---
+
+    def _take_batch(self, batch: List[Tuple[Dict[str, Any], bool]]) -> List[Tuple[Dict[str, Any], bool]]:
+        while len(batch) < self.normalize_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _worker(self) -> None:
+        while True:
+            first = await self._queue.get()
+            try:
+                await self._process(self._take_batch([first]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Teams ingestion batch failed: {e}")
+
+    async def _process(self, payloads: List[Tuple[Dict[str, Any], bool]]) -> None:
+        messages = []
+        for payload, trusted in payloads:
+            messages.extend(self._messages(payload, trusted))
+        if not messages:
+            return
+
+        documents = await metrics.to_thread("teams_normalize", lambda: [normalize_message(m) for m in messages])
+        for document in documents:
+            if document is None:
+                self.skipped += 1
+                continue
+            if self._is_duplicate(document["message_id"]):
+                self.duplicates += 1
+                continue
+            # A dropped document stays unseen, so Teams' redelivery is accepted
+            if self.buffer.add(document):
+                self._remember(document["message_id"])
+                self.accepted += 1
+
+    def _messages(self, payload: Dict[str, Any], trusted: bool) -> List[Dict[str, Any]]:
+        # Graph change notifications wrap messages in {"value": [...]}; flows
+        # and bridges post the chatMessage itself, which needs the secret
+        if not isinstance(payload.get("value"), list):
+            if trusted:
+                return [payload]
+            self.unauthenticated += 1
+            return []
+
+        messages = []
+        for notification in payload["value"]:
+            if not trusted and not secret_matches(notification.get("clientState"), self.client_state):
+                self.bad_client_state += 1
+                continue
+            resource = notification.get("resourceData") or {}
+            if not resource.get("body"):
+                # Only ids without includeResourceData; fetching them needs Graph credentials
+                self.skipped += 1
+                continue
+            messages.append(resource)
+        return messages
+
+    def _is_duplicate(self, message_id: str) -> bool:
+        if message_id in self._seen:
+            self._seen.move_to_end(message_id)
+            return True
+        return False
+
+    def _remember(self, message_id: str) -> None:
+        self._seen[message_id] = None
+        if len(self._seen) > self.dedupe_cache_size:
+            self._seen.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "received": self.received,
+            "rejected": self.rejected,
+            "accepted": self.accepted,
+            "skipped": self.skipped,
+            "duplicates": self.duplicates,
+            "bad_client_state": self.bad_client_state,
+            "unauthenticated": self.unauthenticated,
+            "writes": self.buffer.stats(),
+        }
+
+
+teams_ingestor = TeamsIngestor(
+    queue_size=settings.TEAMS_QUEUE_SIZE,
+    normalize_batch=settings.TEAMS_NORMALIZE_BATCH,
+    dedupe_cache_size=settings.TEAMS_DEDUPE_CACHE_SIZE,
+    client_state=settings.TEAMS_WEBHOOK_CLIENT_STATE,
+    buffer=WriteBehindBuffer(
+        PIPELINE_ANNOUNCEMENTS_COLLECTION,
+        flush_interval_seconds=settings.WRITE_BEHIND_FLUSH_SECONDS,
+        max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+        max_pending=settings.WRITE_BEHIND_MAX_PENDING,
+        prepare=stamp_document,
+    ),
+)
@@ -0,0 +1,211 @@
+# backend/app/llm_engine/admission.py
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BRIDGE = "bridge"
+BATCH = "batch"
+
+ADMISSION_REJECTED = registry.counter(
+    "chat_admission_rejected_total", "LLM-bound requests rejected by admission control.", ("reason", "priority"),
+)
+
+
+class RateLimited(Exception):
+    """Raised when a request exceeds its user, chat or global LLM budget."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Rate limited ({reason}), retry in {retry_after:.1f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Classic token bucket, refilled lazily on access: `rate` tokens per
+    second up to `capacity`. The balance may go negative through charge()
+    (usage known only after the fact) and is then repaid by the refill.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def seconds_until(self, tokens: float) -> float:
+        """Seconds until the balance reaches `tokens` (after refill())."""
+        missing = tokens - self.tokens
+        return missing / self.rate if missing > 0 and self.rate > 0 else 0.0
+
+
+class BucketTable:
+    """
+    One token bucket per key (user id, chat id) in an LRU-bounded dict.
+
+    Lookup, refill and eviction are O(1). An evicted key starts again with
+    a full bucket, which only matters for keys idle long enough to be the
+    least recently used of `max_keys`.
+    """
+
+    def __init__(self, per_minute: float, burst: float, max_keys: int):
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get(self, key: str, now: float) -> TokenBucket:
+        """
+        Returns the key's bucket, refilled to `now` (a full one for a new key).
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._buckets.move_to_end(key)
+        bucket.refill(now)
+        return bucket
+
+
+class AdmissionController:
+    """
+    Decides whether a request may call the LLM, before it does.
+
+    - Per-key buckets: one per user_id and one per chat id (a bridged group
+      chat), so one noisy user or group only exhausts its own budget.
+    - Global budget: requests/min and tokens/min for the whole worker, each
+      a bucket holding one minute of budget. Tokens are charged after the
+      call (prompt + reply estimate), so the token bucket can go into debt.
+    - Priority classes: lower classes must leave a share of the global
+      budget (`reserves`) untouched, so interactive traffic still gets
+      through when bridge or batch traffic is heavy.
+
+    Only LLM-bound requests are admitted here; cache hits never cost budget.
+    """
+
+    def __init__(
+        self,
+        user_per_minute: float,
+        user_burst: float,
+        chat_per_minute: float,
+        chat_burst: float,
+        global_rpm: float,
+        global_tpm: float,
+        reserves: Dict[str, float],
+        max_keys: int,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.reserves = reserves
+        self.users = BucketTable(user_per_minute, user_burst, max_keys)
+        self.chats = BucketTable(chat_per_minute, chat_burst, max_keys)
+        now = time.monotonic()
+        self.requests = TokenBucket(global_rpm / 60, global_rpm, now)
+        self.tokens = TokenBucket(global_tpm / 60, global_tpm, now)
+
+        self.admitted: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+
+    def admit(self, priority: str, user_id: Optional[str] = None, chat_id: Optional[str] = None) -> None:
+        """
+        Takes one request from every budget that applies. All budgets are
+        checked before any is debited, so a rejected request costs nothing.
+
+        Args:
+            priority: INTERACTIVE, BRIDGE or BATCH.
+            user_id: Per-user bucket key, if known.
+            chat_id: Per-chat bucket key (bridged group chats), if known.
+
+        Raises:
+            RateLimited: If any budget is exhausted; `retry_after` says when
+                it refills.
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        reserve = self.reserves.get(priority, 0.0)
+
+        self.requests.refill(now)
+        floor = 1 + reserve * self.requests.capacity
+        if self.requests.tokens < floor:
+            self._reject("global_rpm", priority, self.requests.seconds_until(floor))
+        self.tokens.refill(now)
+        token_floor = reserve * self.tokens.capacity
+        if self.tokens.tokens <= token_floor:
+            self._reject("global_tpm", priority, self.tokens.seconds_until(token_floor + 1))
+
+        user_bucket = self.users.get(user_id, now) if user_id else None
+        if user_bucket is not None and user_bucket.tokens < 1:
+            self._reject("user", priority, user_bucket.seconds_until(1))
+        chat_bucket = self.chats.get(chat_id, now) if chat_id else None
+        if chat_bucket is not None and chat_bucket.tokens < 1:
+            self._reject("chat", priority, chat_bucket.seconds_until(1))
+
+        for bucket in (self.requests, user_bucket, chat_bucket):
+            if bucket is not None:
+                bucket.tokens -= 1
+        self.admitted[priority] = self.admitted.get(priority, 0) + 1
+
+    def charge(self, tokens: int) -> None:
+        """
+        Debits LLM tokens used by a finished call from the global budget
+        (down to at most one minute of debt).
+        """
+        if not self.enabled or tokens <= 0:
+            return
+        self.tokens.refill(time.monotonic())
+        self.tokens.tokens = max(-self.tokens.capacity, self.tokens.tokens - tokens)
+
+    def _reject(self, reason: str, priority: str, retry_after: float) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        ADMISSION_REJECTED.inc(reason, priority)
+        raise RateLimited(reason, retry_after)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+            "tracked_users": len(self.users),
+            "tracked_chats": len(self.chats),
+            "evictions": self.users.evictions + self.chats.evictions,
+            "global_requests_left": round(self.requests.refill(now), 1),
+            "global_tokens_left": round(self.tokens.refill(now)),
+        }
+
+
+admission = AdmissionController(
+    user_per_minute=settings.ADMISSION_USER_PER_MINUTE,
+    user_burst=settings.ADMISSION_USER_BURST,
+    chat_per_minute=settings.ADMISSION_CHAT_PER_MINUTE,
+    chat_burst=settings.ADMISSION_CHAT_BURST,
+    global_rpm=settings.ADMISSION_GLOBAL_RPM,
+    global_tpm=settings.ADMISSION_GLOBAL_TPM,
+    reserves=settings.ADMISSION_PRIORITY_RESERVES,
+    max_keys=settings.ADMISSION_MAX_KEYS,
+    enabled=settings.ADMISSION_ENABLED,
+)
@@ -1,7 +1,8 @@
 # backend/app/llm_engine/classifier.py
 
-from typing import List, Tuple
-from thefuzz import process
+from typing import Dict, List, Sequence
+
+from app.llm_engine.intent_index import IntentIndex
 
 DINING_KEYWORDS: List[str] = [
     "yemek",
@@ -24,18 +25,22 @@ ANNOUNCEMENT_KEYWORDS: List[str] = [
     "program",
 ]
 
+# Declaration order breaks ties: dining wins over announcement.
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "dining": DINING_KEYWORDS,
+    "announcement": ANNOUNCEMENT_KEYWORDS,
+}
 
-def _best_match(message: str, keywords: List[str]) -> Tuple[str, int]:
-    """
-    Returns (matched_keyword, score) using fuzzy matching.
-    """
-    match, score = process.extractOne(message, keywords)
-    return match, score
+# Threshold: score must be > 80 to classify
+DEFAULT_INTENT = "general"
+
+_index = IntentIndex(INTENT_KEYWORDS, threshold=80, default_intent=DEFAULT_INTENT)
 
 
 def decide_intent(message: str) -> str:
     """
-    Determines intent based on fuzzy keyword matching against predefined categories.
+    Determines intent using the precompiled keyword index: exact keyword hits
+    first, fuzzy matching as a fallback.
     
     Args:
         message: The user's message/query.
@@ -43,22 +48,17 @@ def decide_intent(message: str) -> str:
     Returns: 
         'dining', 'announcement', or 'general'.
     """
-    if not message:
-        return "general"
-
-    # Dining intent score
-    _, dining_score = _best_match(message, DINING_KEYWORDS)
-
-    # Announcement intent score
-    _, announcement_score = _best_match(message, ANNOUNCEMENT_KEYWORDS)
-
-    # Threshold: score must be > 80 to classify
-    threshold = 80
+    return _index.classify(message)
 
-    if dining_score > threshold and dining_score >= announcement_score:
-        return "dining"
 
-    if announcement_score > threshold and announcement_score > dining_score:
-        return "announcement"
-
-    return "general"
+def classify_many(messages: Sequence[str]) -> List[str]:
+    """
+    Batch version of decide_intent; one fuzzy-matching pass for all messages.
+    
+    Args:
+        messages: User messages.
+    
+    Returns:
+        Intents in the same order as `messages`.
+    """
+    return _index.classify_many(messages)
@@ -0,0 +1,311 @@
+# backend/app/llm_engine/conversation_memory.py
+
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Optional, Set
+
+from pymongo import DESCENDING
+
+from app.core.config import settings
+from app.db.collections import CONVERSATIONS_COLLECTION
+from app.db.mongo import db
+from app.db.write_behind import WriteBehindBuffer
+from app.utils.text import estimate_tokens, normalize_text
+
+logger = logging.getLogger(__name__)
+
+USER, MODEL = 0, 1
+_ROLE_NAMES = ("user", "model")
+_ROLE_LABELS = ("Kullanıcı", "Asistan")
+
+# Messages that only make sense with the previous turn ("peki yarın?",
+# "ya cuma?"). Self-contained questions skip history so their replies stay
+# shareable through the response cache.
+FOLLOW_UP_MARKERS = (
+    "peki", "ya", "o zaman", "bir de", "ayrica", "onu", "bunu", "onun", "bunun", "neden", "niye", "baska",
+)
+# Short messages without a marker are follow-ups only when they name a time
+# or day ("yarın?", "cumaya?"), i.e. repeat the last question for another
+# date; "merhaba" or "teşekkürler" stay self-contained. Normalized stems.
+ELLIPTICAL_STEMS = (
+    "bugun", "yarin", "obur", "dun", "sabah", "ogle", "aksam", "hafta",
+    "pazartesi", "sali", "carsamba", "persembe", "cuma", "pazar",
+)
+FOLLOW_UP_MAX_WORDS = 3
+
+# Approximate CPython overhead of one _Turn plus its bytes object, counted
+# against the byte caps so they track real memory rather than payload only
+_TURN_OVERHEAD = 96
+
+
+class _Turn:
+    __slots__ = ("role", "text")
+
+    def __init__(self, role: int, text: bytes):
+        self.role = role
+        self.text = text  # UTF-8: about half the size of a str for Turkish text
+
+
+class _Conversation:
+    __slots__ = ("turns", "nbytes", "last_intent", "updated_at", "written_at")
+
+    def __init__(self):
+        self.turns: Deque[_Turn] = deque()
+        self.nbytes = 0
+        self.last_intent: Optional[str] = None
+        self.updated_at = time.monotonic()
+        # Wall-clock time of the newest turn, comparable with Mongo's created_at
+        self.written_at: Optional[datetime] = None
+
+
+class ConversationMemory:
+    """
+    Recent turns per user, bounded in memory.
+
+    Each user has a ring buffer of turns capped at `max_bytes_per_user`
+    (oldest turns fall off first). Users are kept in one LRU ordered by last
+    activity; the least recently active users are evicted when either
+    `max_users` or `max_total_bytes` is exceeded, and conversations idle for
+    longer than `idle_seconds` are treated as finished.
+
+    With a write-behind buffer, every turn is also persisted asynchronously
+    and a user's recent turns are reloaded on their first message after a
+    restart or eviction. With `read_through` (several worker processes), the
+    store is checked on every message and turns recorded by another worker
+    replace the local copy; a turn is visible to other workers once the
+    write-behind buffer flushed it (WRITE_BEHIND_FLUSH_SECONDS).
+    """
+
+    def __init__(
+        self,
+        max_users: int,
+        max_bytes_per_user: int,
+        max_total_bytes: int,
+        idle_seconds: float,
+        store: Optional[WriteBehindBuffer] = None,
+        read_through: bool = False,
+    ):
+        self.max_users = max_users
+        self.max_bytes_per_user = max_bytes_per_user
+        self.max_total_bytes = max_total_bytes
+        self.idle_seconds = idle_seconds
+        self.store = store
+        self.read_through = read_through and store is not None
+
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._loaded: Set[str] = set()
+        self._total_bytes = 0
+
+        self.evictions = 0
+        self.expirations = 0
+        self.follow_ups = 0
+        self.reloads = 0
+
+    async def start(self) -> None:
+        if self.store:
+            await self.store.start()
+
+    async def stop(self) -> None:
+        if self.store:
+            await self.store.stop()
+
+    def _get(self, user_id: str) -> Optional[_Conversation]:
+        conversation = self._conversations.get(user_id)
+        if conversation is None:
+            return None
+        if time.monotonic() - conversation.updated_at > self.idle_seconds:
+            self._drop(user_id)
+            self.expirations += 1
+            return None
+        return conversation
+
+    def _drop(self, user_id: str) -> None:
+        conversation = self._conversations.pop(user_id)
+        self._total_bytes -= conversation.nbytes
+
+    def _push(self, conversation: _Conversation, role: int, text: str) -> None:
+        # Each turn may take at most half of the user's budget, so the newest
+        # exchange (message + reply) always fits
+        encoded = text.encode("utf-8")[:max(0, self.max_bytes_per_user // 2 - _TURN_OVERHEAD)]
+        size = len(encoded) + _TURN_OVERHEAD
+        conversation.turns.append(_Turn(role, encoded))
+        conversation.nbytes += size
+        self._total_bytes += size
+        self._trim(conversation)
+
+    def _trim(self, conversation: _Conversation) -> None:
+        # Drops the oldest turns while over budget, and a reply whose message
+        # was dropped with them: history never starts with an answer
+        turns = conversation.turns
+        while turns and (conversation.nbytes > self.max_bytes_per_user or turns[0].role == MODEL):
+            oldest = turns.popleft()
+            size = len(oldest.text) + _TURN_OVERHEAD
+            conversation.nbytes -= size
+            self._total_bytes -= size
+
+    def append(self, user_id: Optional[str], message: str, reply: str, intent: Optional[str] = None) -> None:
+        """
+        Records one exchange (user message + assistant reply).
+        """
+        if not user_id:
+            return
+
+        conversation = self._get(user_id)
+        if conversation is None:
+            conversation = _Conversation()
+            self._conversations[user_id] = conversation
+        self._conversations.move_to_end(user_id)
+
+        self._push(conversation, USER, message)
+        self._push(conversation, MODEL, reply)
+        conversation.last_intent = intent or conversation.last_intent
+        conversation.updated_at = time.monotonic()
+        now = datetime.utcnow()
+        conversation.written_at = now
+
+        if self.store:
+            for role, text in ((USER, message), (MODEL, reply)):
+                self.store.add({
+                    "user_id": user_id,
+                    "role": _ROLE_NAMES[role],
+                    "text": text,
+                    "intent": intent,
+                    "created_at": now,
+                })
+
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._conversations and (
+            len(self._conversations) > self.max_users or self._total_bytes > self.max_total_bytes
+        ):
+            user_id = next(iter(self._conversations))
+            self._drop(user_id)
+            self._loaded.discard(user_id)
+            self.evictions += 1
+
+    async def load(self, user_id: Optional[str]) -> None:
+        """
+        Reloads a user's recent turns from Mongo the first time they are seen
+        by this process, or on every message with `read_through`. No-op
+        without persistence.
+        """
+        if not self.store or not user_id:
+            return
+        if not self.read_through:
+            if user_id in self._loaded or user_id in self._conversations:
+                return
+            self._loaded.add(user_id)
+            if len(self._loaded) > self.max_users:
+                self._loaded.clear()
+
+        try:
+            cursor = (
+                db.db[CONVERSATIONS_COLLECTION]
+                .find({"user_id": user_id}, {"_id": 0, "role": 1, "text": 1, "intent": 1, "created_at": 1})
+                .sort("created_at", DESCENDING)
+                .limit(32)
+            )
+            docs = [doc async for doc in cursor]
+        except Exception as e:
+            logger.warning(f"Could not load conversation history for {user_id}: {e}")
+            return
+        if not docs or (datetime.utcnow() - docs[0]["created_at"]).total_seconds() > self.idle_seconds:
+            return
+        local = self._get(user_id)
+        # Mongo keeps milliseconds, so a turn this process wrote (and maybe
+        # has not flushed yet) never looks newer than the local copy
+        if local is not None and local.written_at is not None and docs[0]["created_at"] <= local.written_at:
+            return
+        if local is not None:
+            self._drop(user_id)
+            self.reloads += 1
+
+        conversation = _Conversation()
+        # A message and its reply share created_at: the message goes first
+        for doc in sorted(docs, key=lambda doc: (doc["created_at"], _ROLE_NAMES.index(doc["role"]))):
+            self._push(conversation, _ROLE_NAMES.index(doc["role"]), doc["text"])
+        conversation.last_intent = docs[0].get("intent")
+        conversation.written_at = docs[0]["created_at"]
+        self._conversations[user_id] = conversation
+        self._evict()
+
+    def is_follow_up(self, user_id: Optional[str], message: str, classified: bool) -> bool:
+        """
+        True if the user has an active conversation and the message looks
+        like it depends on it: it starts with a follow-up marker, or it is
+        short, matched no intent on its own and names a day or time
+        ("yarın?", "cuma öğlen?").
+        """
+        if not user_id or self._get(user_id) is None:
+            return False
+        normalized = normalize_text(message)
+        words = normalized.split()
+        follow_up = any(
+            normalized == marker or normalized.startswith(f"{marker} ") for marker in FOLLOW_UP_MARKERS
+        ) or (
+            not classified
+            and len(words) <= FOLLOW_UP_MAX_WORDS
+            and any(word.startswith(ELLIPTICAL_STEMS) for word in words)
+        )
+        self.follow_ups += follow_up
+        return follow_up
+
+    def last_intent(self, user_id: Optional[str]) -> Optional[str]:
+        conversation = self._get(user_id) if user_id else None
+        return conversation.last_intent if conversation else None
+
+    def history(self, user_id: Optional[str], max_tokens: int) -> str:
+        """
+        Renders the most recent turns that fit in `max_tokens`, oldest first.
+
+        Returns:
+            "Kullanıcı: ...\\nAsistan: ..." lines, or "" without history.
+        """
+        conversation = self._get(user_id) if user_id else None
+        if conversation is None:
+            return ""
+
+        lines = []
+        budget = max_tokens
+        for turn in reversed(conversation.turns):
+            line = f"{_ROLE_LABELS[turn.role]}: {turn.text.decode('utf-8', 'ignore')}"
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            budget -= cost
+            lines.append(line)
+        return "\n".join(reversed(lines))
+
+    def stats(self) -> dict:
+        stats = {
+            "users": len(self._conversations),
+            "bytes": self._total_bytes,
+            "max_users": self.max_users,
+            "max_total_bytes": self.max_total_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "follow_ups": self.follow_ups,
+            "read_through": self.read_through,
+            "reloads": self.reloads,
+        }
+        if self.store:
+            stats["persistence"] = self.store.stats()
+        return stats
+
+
+conversation_memory = ConversationMemory(
+    max_users=settings.CONVERSATION_MAX_USERS,
+    max_bytes_per_user=settings.CONVERSATION_MAX_BYTES_PER_USER,
+    max_total_bytes=settings.CONVERSATION_MAX_TOTAL_BYTES,
+    idle_seconds=settings.CONVERSATION_IDLE_SECONDS,
+    store=WriteBehindBuffer(
+        CONVERSATIONS_COLLECTION,
+        flush_interval_seconds=settings.WRITE_BEHIND_FLUSH_SECONDS,
+        max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+        max_pending=settings.WRITE_BEHIND_MAX_PENDING,
+    ) if settings.CONVERSATION_PERSIST else None,
+    read_through=settings.CONVERSATION_READ_THROUGH,
+)
@@ -0,0 +1,131 @@
+# backend/app/llm_engine/faq.py
+
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.retrieval.tokenizer import tokenize
+from app.utils.text import normalize_text
+
+# Curated answers to recurring questions. Each entry lists the phrasings
+# students actually use; answers point to where the authoritative, dated
+# information is published instead of repeating dates that change yearly.
+FAQ_ENTRIES: List[Dict[str, object]] = [
+    {
+        "id": "staj",
+        "questions": [
+            "staj başvurusu ne zaman",
+            "staj başvuruları ne zaman başlıyor",
+            "staj nasıl yapılır",
+            "staj evrakları nereden alınır",
+            "zorunlu staj",
+        ],
+        "answer": (
+            "Staj başvuruları ve staj evrakları bölüm staj komisyonu tarafından duyurulur. "
+            "Güncel tarihler ve formlar için bölüm web sitesindeki staj duyurularını takip edin; "
+            "bana \"staj duyurusu var mı\" diye sorarak son duyuruları da görebilirsiniz."
+        ),
+    },
+    {
+        "id": "butunleme",
+        "questions": [
+            "bütünleme sınavı ne zaman",
+            "büt sınavları ne zaman",
+            "bütünleme tarihleri",
+            "büte kimler girebilir",
+        ],
+        "answer": (
+            "Bütünleme sınavlarının dönemi akademik takvimde, bölüm sınav programı ise bölüm "
+            "duyurularında ilan edilir. Bütünlemeye giriş koşulları için üniversitenin ön lisans ve "
+            "lisans eğitim-öğretim yönetmeliğine bakabilirsiniz."
+        ),
+    },
+    {
+        "id": "ders_kaydi",
+        "questions": [
+            "ders kaydı ne zaman",
+            "ders kayıtları ne zaman başlıyor",
+            "ders seçimi nasıl yapılır",
+            "ekle bırak ne zaman",
+        ],
+        "answer": (
+            "Ders kayıt ve ekle-bırak haftası tarihleri akademik takvimde yer alır; kayıtlar öğrenci "
+            "bilgi sistemi üzerinden yapılır ve danışman onayı gerekir."
+        ),
+    },
+    {
+        "id": "akademik_takvim",
+        "questions": [
+            "akademik takvim",
+            "akademik takvim nerede",
+            "dönem ne zaman başlıyor",
+            "final haftası ne zaman",
+        ],
+        "answer": (
+            "Dönem başlangıcı, sınav haftaları ve tatiller Akdeniz Üniversitesi akademik takviminde "
+            "yayınlanır (Öğrenci İşleri Daire Başkanlığı sayfası)."
+        ),
+    },
+    {
+        "id": "erasmus",
+        "questions": [
+            "erasmus başvurusu nasıl yapılır",
+            "erasmus başvuruları ne zaman",
+            "erasmus şartları",
+        ],
+        "answer": (
+            "Erasmus+ başvuru dönemleri ve koşulları Uluslararası İlişkiler Ofisi tarafından duyurulur; "
+            "bölümün Erasmus koordinatörü ders eşleştirmelerinde yardımcı olur."
+        ),
+    },
+]
+
+
+class FaqStore:
+    """
+    Matches messages against curated FAQ phrasings.
+
+    An exact match of the normalized message scores 1.0; otherwise the score
+    is the best Jaccard overlap between the message's stemmed, stopword-free
+    tokens and those of a phrasing, so "staj başvuruları ne zaman?" still
+    meets "staj başvurusu ne zaman".
+    """
+
+    def __init__(self, entries: Sequence[Dict[str, object]]):
+        self._answers: Dict[str, str] = {}
+        self._exact: Dict[str, str] = {}
+        self._variants: List[Tuple[FrozenSet[str], str]] = []
+        for entry in entries:
+            faq_id = str(entry["id"])
+            self._answers[faq_id] = str(entry["answer"])
+            for question in entry["questions"]:
+                self._exact[normalize_text(question)] = faq_id
+                self._variants.append((frozenset(tokenize(question)), faq_id))
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def match(self, message: str) -> Optional[Tuple[float, str, str]]:
+        """
+        Returns:
+            (score, faq id, answer) of the best matching entry, or None if no
+            phrasing shares a token with the message.
+        """
+        faq_id = self._exact.get(normalize_text(message))
+        if faq_id is not None:
+            return 1.0, faq_id, self._answers[faq_id]
+
+        tokens = frozenset(tokenize(message))
+        if not tokens:
+            return None
+        best_score, best_id = 0.0, None
+        for variant, faq_id in self._variants:
+            shared = len(tokens & variant)
+            if shared:
+                score = shared / len(tokens | variant)
+                if score > best_score:
+                    best_score, best_id = score, faq_id
+        if best_id is None:
+            return None
+        return best_score, best_id, self._answers[best_id]
+
+
+faq_store = FaqStore(FAQ_ENTRIES)
@@ -0,0 +1,190 @@
+# backend/app/llm_engine/fast_path.py
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.snapshot import context_snapshot
+from app.llm_engine.faq import FaqStore, faq_store
+from app.llm_engine.templates import announcements_reply, dining_reply
+from app.utils.text import normalize_text
+
+FAST_PATH_RESULTS = registry.counter(
+    "chat_fast_path_total", "Chat messages checked by the no-LLM fast path, by result.", ("result",),
+)
+
+# Sources reported in ChatResponse.source
+DINING_TEMPLATE = "dining_template"
+ANNOUNCEMENT_TEMPLATE = "announcement_template"
+FAQ = "faq"
+
+# Normalized word stems; a token matches a stem it starts with
+# ("yemekte", "menude", "yarinki")
+_DINING_STEMS = ("yemek", "yemeg", "menu", "corba", "ogle", "aksam", "acikt", "karnim")
+_ANNOUNCEMENT_STEMS = ("duyuru",)
+_RELATIVE_DAYS = (("bugun", 0, "Bugün"), ("yarin", 1, "Yarın"), ("obur", 2, "Öbür gün"), ("dun", -1, "Dün"))
+# Longer names first: "cumartesi" starts with "cuma", "pazartesi" with "pazar"
+_WEEKDAYS = (
+    ("pazartesi", 0, "Pazartesi"),
+    ("sali", 1, "Salı"),
+    ("carsamba", 2, "Çarşamba"),
+    ("persembe", 3, "Perşembe"),
+    ("cumartesi", 5, "Cumartesi"),
+    ("cuma", 4, "Cuma"),
+    ("pazar", 6, "Pazar"),
+)
+
+# Words that do not change what a menu or listing question asks for
+_FILLER = frozenset({
+    "ne", "neler", "nedir", "var", "mi", "mu", "midir", "peki", "ya", "acaba", "hocam",
+    "lutfen", "bir", "gun", "gunu", "icin", "bu", "bakalim", "soyler", "misin", "bana",
+})
+_LISTING_WORDS = frozenset({"son", "yeni", "guncel", "en", "liste", "listesi", "goster", "bolum", "bolumun", "tum"})
+
+
+@dataclass
+class FastAnswer:
+    reply: str
+    source: str
+    confidence: float
+
+
+def _resolve_day(tokens: List[str], today: date) -> Tuple[Optional[Tuple[date, str]], int, bool]:
+    """
+    Finds the day a menu question is about.
+
+    Returns:
+        ((date, label) or None, number of date tokens, whether the tokens
+        name more than one day).
+    """
+    found, count = None, 0
+    for token in tokens:
+        day = None
+        for stem, offset, label in _RELATIVE_DAYS:
+            if token.startswith(stem):
+                day = (today + timedelta(days=offset), label)
+                break
+        else:
+            for stem, weekday, label in _WEEKDAYS:
+                if token.startswith(stem):
+                    # The next such day, today included
+                    day = (today + timedelta(days=(weekday - today.weekday()) % 7), label)
+                    break
+        if day is None:
+            continue
+        count += 1
+        if found is not None and found[0] != day[0]:
+            return None, count, True
+        found = day
+    return found, count, False
+
+
+class FastPath:
+    """
+    Answers deterministic and frequently asked questions without Gemini.
+
+    Rules, for the already classified intent:
+    - dining: "bugün yemekte ne var", "cuma menü" -> the menu of that day
+      (today by default), rendered from the context snapshot;
+    - announcement: "son duyurular" -> the recent announcements digest;
+    - any intent: curated FAQ entries (staj, bütünleme, ...).
+
+    Confidence is the share of the message's words a rule accounts for (or
+    the FAQ match score); a rule answers only at `min_confidence` or above,
+    so "yarın menüde tavuk var mı" is templated while "yemekhane kaçta
+    kapanıyor" still goes to the model. Everything is in-memory (the
+    snapshot, the FAQ tables), so a miss costs microseconds.
+    """
+
+    def __init__(self, faq: FaqStore, min_confidence: float, enabled: bool = True):
+        self.faq = faq
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+
+        self.checked = 0
+        self.forced_llm = 0
+        self.answered: Dict[str, int] = {}
+
+    async def answer(self, message: str, intent: str, force_llm: bool = False) -> Optional[FastAnswer]:
+        """
+        Args:
+            message: Raw user message.
+            intent: Intent the message was routed to (including one
+                inherited by a follow-up).
+            force_llm: Skip the fast path for this request.
+
+        Returns:
+            The templated or FAQ answer, or None if the model should answer.
+            A template that does not fit well enough leaves the message to
+            the FAQ store.
+        """
+        if not self.enabled:
+            return None
+        if force_llm:
+            self.forced_llm += 1
+            return None
+        self.checked += 1
+
+        tokens = normalize_text(message).split()
+        answer = None
+        if tokens and intent == "dining":
+            answer = await self._dining(tokens)
+        elif tokens and intent == "announcement":
+            answer = await self._announcements(tokens)
+        if answer is None:
+            match = self.faq.match(message)
+            if match is not None and match[0] >= self.min_confidence:
+                answer = FastAnswer(reply=match[2], source=FAQ, confidence=match[0])
+
+        if answer is None:
+            FAST_PATH_RESULTS.inc("miss")
+            return None
+        self.answered[answer.source] = self.answered.get(answer.source, 0) + 1
+        FAST_PATH_RESULTS.inc(answer.source)
+        return answer
+
+    async def _dining(self, tokens: List[str]) -> Optional[FastAnswer]:
+        core = sum(1 for token in tokens if token.startswith(_DINING_STEMS))
+        day, dates, ambiguous = _resolve_day(tokens, date.today())
+        if ambiguous or not (core or dates):
+            return None
+        filler = sum(1 for token in tokens if token in _FILLER)
+        confidence = (core + dates + filler) / len(tokens)
+        if confidence < self.min_confidence:
+            return None
+
+        day, label = day or (date.today(), "Bugün")
+        context_data = await context_snapshot.dining(day.strftime("%Y-%m-%d"))
+        return FastAnswer(reply=dining_reply(label, day, context_data), source=DINING_TEMPLATE, confidence=confidence)
+
+    async def _announcements(self, tokens: List[str]) -> Optional[FastAnswer]:
+        core = sum(1 for token in tokens if token.startswith(_ANNOUNCEMENT_STEMS))
+        if not core:
+            return None
+        known = sum(1 for token in tokens if token in _FILLER or token in _LISTING_WORDS)
+        confidence = (core + known) / len(tokens)
+        if confidence < self.min_confidence:
+            return None
+
+        digest = await context_snapshot.announcements()
+        return FastAnswer(reply=announcements_reply(digest), source=ANNOUNCEMENT_TEMPLATE, confidence=confidence)
+
+    def stats(self) -> dict:
+        answered = sum(self.answered.values())
+        return {
+            "enabled": self.enabled,
+            "min_confidence": self.min_confidence,
+            "checked": self.checked,
+            "forced_llm": self.forced_llm,
+            "answered": dict(self.answered),
+            "answered_share": round(answered / self.checked, 3) if self.checked else 0.0,
+        }
+
+
+fast_path = FastPath(
+    faq=faq_store,
+    min_confidence=settings.FAST_PATH_MIN_CONFIDENCE,
+    enabled=settings.FAST_PATH_ENABLED,
+)
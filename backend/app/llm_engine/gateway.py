@@ -0,0 +1,131 @@
+# backend/app/llm_engine/gateway.py
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from app.core.metrics import LLM_CALL_SECONDS, LLM_QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GatewayOverloaded(Exception):
+    """Raised when all slots are busy and the wait queue is full (load shedding)."""
+
+
+class GatewayTimeout(Exception):
+    """Raised when a model call exceeds the per-call timeout."""
+
+
+class LLMGateway:
+    """
+    Async admission point for LLM calls.
+
+    At most `max_concurrency` calls run at once; up to `max_queue` more wait
+    for a slot and anything beyond that is rejected immediately with
+    GatewayOverloaded instead of queueing invisibly.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, timeout_seconds: Optional[float]):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.shed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """
+        Holds one concurrency slot for the duration of the block.
+
+        Yields:
+            Seconds spent waiting in the queue.
+
+        Raises:
+            GatewayOverloaded: If no slot is free and the queue is full.
+        """
+        if self._semaphore.locked() and self.queue_depth >= self.max_queue:
+            self.shed += 1
+            raise GatewayOverloaded(
+                f"LLM gateway overloaded ({self.in_flight} in flight, {self.queue_depth} queued)"
+            )
+
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        LLM_QUEUE_WAIT_SECONDS.observe(waited)
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            yield waited
+        except BaseException:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        timeout_seconds: Optional[float] = None,
+    ) -> T:
+        """
+        Runs `call()` inside a slot with a per-call timeout.
+
+        Args:
+            call: Zero-argument factory returning the awaitable to run.
+            timeout_seconds: Overrides the gateway default timeout.
+
+        Raises:
+            GatewayOverloaded: If the request was shed.
+            GatewayTimeout: If the call did not finish in time.
+        """
+        timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        async with self.slot():
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await asyncio.wait_for(call(), timeout)
+                outcome = "ok"
+                return result
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                self.timeouts += 1
+                raise GatewayTimeout(f"LLM call exceeded {timeout}s")
+            finally:
+                LLM_CALL_SECONDS.observe(time.perf_counter() - started, outcome)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout_seconds,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "shed": self.shed,
+            "avg_wait_ms": round(self.total_wait_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
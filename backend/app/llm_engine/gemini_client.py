@@ -1,74 +1,216 @@
 # backend/app/llm_engine/gemini_client.py
 
 import asyncio
-import functools
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
-
-from google import genai
+import time
+from typing import AsyncIterator, Optional
 
 from app.core.config import settings
+from app.core.metrics import LLM_CALL_SECONDS, RESPONSE_TOKENS, registry
+from app.llm_engine.admission import admission
+from app.llm_engine.gateway import LLMGateway, GatewayOverloaded
+from app.llm_engine.prompt_builder import prompt_builder
+from app.llm_engine.resilience import CircuitBreaker, ResilientCaller
+from app.utils.text import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
-# Initialize client with API key
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+# Created on first use (or by warm-up): importing google-genai alone takes
+# longer than importing the rest of the backend
+client = None
 
 MODEL_NAME = "gemini-2.5-flash"
 
-# Thread pool for running sync API calls
-_executor: Optional[ThreadPoolExecutor] = None
-
-
-def _get_executor() -> ThreadPoolExecutor:
-    global _executor
-    if _executor is None:
-        _executor = ThreadPoolExecutor(max_workers=4)
-    return _executor
-
-
-def _call_model_sync(prompt: str) -> str:
+# Returned when the model call fails; never cached.
+FALLBACK_REPLY = "Üzgünüm, şu anda yanıt üretemiyorum."
+
+# All model calls go through one gateway: bounded concurrency, bounded wait
+# queue with load shedding and a per-call timeout.
+gateway = LLMGateway(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_MAX_QUEUE,
+    timeout_seconds=settings.LLM_TIMEOUT_SECONDS,
+)
+registry.gauge_callback("llm_gateway_in_flight", "LLM calls holding a gateway slot.", lambda: gateway.in_flight)
+registry.gauge_callback("llm_gateway_queue_depth", "LLM calls waiting for a gateway slot.", lambda: gateway.queue_depth)
+registry.gauge_callback("llm_gateway_shed_total", "LLM calls rejected by load shedding.", lambda: gateway.shed, "counter")
+
+# Fails fast while Gemini is down and adapts the timeout to its recent latency
+resilience = ResilientCaller(
+    gateway,
+    CircuitBreaker(
+        failure_threshold=settings.LLM_BREAKER_FAILURES,
+        cooldown_seconds=settings.LLM_BREAKER_COOLDOWN_SECONDS,
+        max_cooldown_seconds=settings.LLM_BREAKER_MAX_COOLDOWN_SECONDS,
+    ),
+    window_size=settings.LLM_LATENCY_WINDOW,
+    min_samples=settings.LLM_ADAPTIVE_MIN_SAMPLES,
+    timeout_multiplier=settings.LLM_TIMEOUT_P99_MULTIPLIER,
+    min_timeout_seconds=settings.LLM_MIN_TIMEOUT_SECONDS,
+    hedge=settings.LLM_HEDGE_ENABLED,
+    hedge_ratio=settings.LLM_HEDGE_MAX_RATIO,
+)
+registry.gauge_callback("llm_breaker_open", "1 while the LLM circuit breaker rejects calls.",
+                        lambda: int(resilience.breaker.is_open))
+registry.gauge_callback("llm_timeout_seconds", "Current adaptive LLM call timeout.",
+                        lambda: resilience.timeout_seconds() or 0.0)
+registry.gauge_callback("llm_hedges_total", "Hedged second LLM requests sent.", lambda: resilience.hedges, "counter")
+
+
+def get_client():
+    """
+    Returns the Gemini client, importing google-genai and creating the
+    client on the first call.
+    """
+    global client
+    if client is None:
+        from google import genai
+
+        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    return client
+
+
+async def warm_up_client(open_connection: bool = False) -> None:
+    """
+    Creates the client off the event loop and, if `open_connection`, makes
+    one metadata request so the HTTPS connection pool is already open for
+    the first chat.
+    """
+    model_client = await asyncio.to_thread(get_client)
+    if open_connection:
+        await asyncio.wait_for(model_client.aio.models.get(model=MODEL_NAME), gateway.timeout_seconds)
+
+
+async def _call_model(prompt: str) -> str:
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt
+        response = await resilience.call(
+            lambda: get_client().aio.models.generate_content(
+                model=MODEL_NAME,
+                contents=prompt
+            )
         )
         return response.text
+    except GatewayOverloaded:
+        raise
     except Exception as e:
         logger.error(f"Error calling Gemini: {e}")
         raise
 
 
-async def _run_in_threadpool(prompt: str) -> str:
-    loop = asyncio.get_running_loop()
-    executor = _get_executor()
-    return await loop.run_in_executor(
-        executor,
-        functools.partial(_call_model_sync, prompt),
-    )
-
-
 async def generate_response(
     system_instruction: str,
     user_query: str,
     context_data: Optional[str] = None,
+    history: Optional[str] = None,
+    intent: Optional[str] = None,
 ) -> str:
-    context_data = context_data or ""
-    
-    prompt_parts = [
-        f"System instruction:\n{system_instruction}",
-        "",
-        f"Context data:\n{context_data if context_data else 'N/A'}",
-        "",
-        f"User query:\n{user_query}",
-    ]
-    prompt = "\n".join(prompt_parts)
+    """
+    Generates a reply for the user query.
+
+    Args:
+        history: Recent turns of the user's conversation, for follow-ups.
+        intent: Classified intent; selects the prompt token budget.
+
+    Raises:
+        GatewayOverloaded: If the LLM gateway shed the request, or CircuitOpen
+            (a subclass) while the circuit breaker is open; callers decide
+            between a cached or templated answer and a fast 503.
+    """
+    prompt = prompt_builder.build(system_instruction, user_query, context_data, history, intent)
 
     try:
-        response = await _run_in_threadpool(prompt)
+        response = await _call_model(prompt.text)
+        response_tokens = estimate_tokens(response or "")
+        RESPONSE_TOKENS.observe(response_tokens, prompt.intent)
+        admission.charge(prompt.tokens + response_tokens)
         logger.info(f"Successfully generated response from {MODEL_NAME}")
         return response
+    except GatewayOverloaded:
+        raise
     except Exception as e:
         logger.error(f"Error: {e}")
-        return "Üzgünüm, şu anda yanıt üretemiyorum."
+        return FALLBACK_REPLY
+
+
+async def generate_response_stream(
+    system_instruction: str,
+    user_query: str,
+    context_data: Optional[str] = None,
+    history: Optional[str] = None,
+    intent: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Streams the model reply as text chunks as soon as Gemini produces them.
+
+    If the call fails before the first chunk, yields FALLBACK_REPLY (same
+    behavior as generate_response). Failures after the first chunk are
+    re-raised so the caller can tell the client the reply is incomplete.
+    The gateway slot is held until the stream is finished, so the stream is
+    bounded like a call: the current per-call timeout applies to opening it
+    and to each wait for the next chunk, and LLM_STREAM_MAX_SECONDS to the
+    whole reply. The circuit breaker sees the outcome (a stalled stream
+    counts as a failure), but streams are neither hedged nor timed for the
+    adaptive timeout (their duration depends on the reply length).
+
+    Raises:
+        GatewayOverloaded: If the LLM gateway shed the request, or CircuitOpen
+            while the circuit breaker is open.
+    """
+    prompt = prompt_builder.build(system_instruction, user_query, context_data, history, intent)
+    emitted = 0
+
+    resilience.check()
+    try:
+        async with gateway.slot():
+            started = time.perf_counter()
+            deadline = started + settings.LLM_STREAM_MAX_SECONDS
+            stall_timeout = resilience.timeout_seconds()
+            outcome = "error"
+            stream = None
+            try:
+                stream = await asyncio.wait_for(
+                    get_client().aio.models.generate_content_stream(
+                        model=MODEL_NAME,
+                        contents=prompt.text
+                    ),
+                    stall_timeout,
+                )
+                chunks = stream.__aiter__()
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError(f"stream exceeded {settings.LLM_STREAM_MAX_SECONDS}s")
+                    try:
+                        chunk = await asyncio.wait_for(
+                            chunks.__anext__(),
+                            remaining if stall_timeout is None else min(stall_timeout, remaining),
+                        )
+                    except StopAsyncIteration:
+                        break
+                    text = chunk.text
+                    if text:
+                        emitted += estimate_tokens(text)
+                        yield text
+                outcome = "ok"
+            finally:
+                LLM_CALL_SECONDS.observe(time.perf_counter() - started, outcome)
+                # Release the HTTP stream when it was abandoned (timeout, client gone)
+                if outcome != "ok" and hasattr(stream, "aclose"):
+                    await stream.aclose()
+        resilience.record(True)
+        RESPONSE_TOKENS.observe(emitted, prompt.intent)
+        admission.charge(prompt.tokens + emitted)
+        logger.info(f"Successfully streamed response from {MODEL_NAME}")
+    except GatewayOverloaded:
+        resilience.breaker.release()
+        raise
+    except (GeneratorExit, asyncio.CancelledError):
+        # Client went away: says nothing about Gemini's health
+        resilience.breaker.release()
+        raise
+    except Exception as e:
+        logger.error(f"Error while streaming from Gemini: {e!r}")
+        resilience.record(False)
+        if emitted:
+            raise
+        yield FALLBACK_REPLY
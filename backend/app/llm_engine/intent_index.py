@@ -0,0 +1,167 @@
+# backend/app/llm_engine/intent_index.py
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.text import normalize_text
+
+
+class _AhoCorasick:
+    """
+    Aho–Corasick automaton over normalized keywords.
+
+    Finds every keyword occurrence in one pass over the message, regardless
+    of how many keywords are indexed.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pattern_id)
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (end_index, pattern_id) for every occurrence in `text`.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                yield i, pattern_id
+
+
+class IntentIndex:
+    """
+    Precompiled keyword matcher for intent classification.
+
+    Messages and keywords are normalized the same way (Turkish casefolding,
+    diacritics, punctuation), so "acıktım" and "aciktim" are the same key.
+    A keyword found at the start of a word (suffixes allowed: "sınavlar")
+    scores 100 for its intent; otherwise messages fall back to fuzzy WRatio
+    scoring against all keywords in one vectorized call.
+    """
+
+    def __init__(
+        self,
+        intent_keywords: Dict[str, Sequence[str]],
+        threshold: int = 80,
+        default_intent: str = "general",
+    ):
+        """
+        Args:
+            intent_keywords: Keywords per intent; dict order breaks score ties.
+            threshold: Minimum score (exclusive) to assign an intent.
+            default_intent: Returned when no intent clears the threshold.
+        """
+        self.intents: List[str] = list(intent_keywords)
+        self.threshold = threshold
+        self.default_intent = default_intent
+
+        self._keywords: List[str] = []
+        self._keyword_intent: List[int] = []
+        # Column offset of each intent's keywords, for np.maximum.reduceat
+        self._offsets: List[int] = []
+
+        for intent_id, intent in enumerate(self.intents):
+            keywords = [k for k in dict.fromkeys(normalize_text(k) for k in intent_keywords[intent]) if k]
+            if not keywords:
+                raise ValueError(f"Intent '{intent}' has no keywords")
+            self._offsets.append(len(self._keywords))
+            self._keywords.extend(keywords)
+            self._keyword_intent.extend([intent_id] * len(keywords))
+
+        self._automaton = _AhoCorasick(self._keywords)
+        self._offsets_arr = np.asarray(self._offsets, dtype=np.intp)
+
+    def _exact_intents(self, text: str) -> Optional[np.ndarray]:
+        hits = None
+        for end, keyword_id in self._automaton.iter_matches(text):
+            start = end - len(self._keywords[keyword_id]) + 1
+            if start == 0 or text[start - 1] == " ":
+                if hits is None:
+                    hits = np.zeros(len(self.intents), dtype=np.float64)
+                hits[self._keyword_intent[keyword_id]] = 100.0
+        return hits
+
+    def _pick(self, scores: np.ndarray) -> str:
+        # argmax returns the first maximum, i.e. declaration order wins ties
+        best = int(np.argmax(scores))
+        if scores[best] > self.threshold:
+            return self.intents[best]
+        return self.default_intent
+
+    def scores_many(self, messages: Sequence[str]) -> np.ndarray:
+        """
+        Returns a (len(messages), len(intents)) matrix of scores in [0, 100].
+        """
+        texts = [normalize_text(m) for m in messages]
+        scores = np.zeros((len(texts), len(self.intents)), dtype=np.float64)
+
+        fuzzy_rows = []
+        for row, text in enumerate(texts):
+            if not text:
+                continue
+            exact = self._exact_intents(text)
+            if exact is not None:
+                scores[row] = exact
+            else:
+                fuzzy_rows.append(row)
+
+        if fuzzy_rows:
+            # Imported on the first message without an exact keyword hit
+            from rapidfuzz import fuzz, process
+
+            matrix = process.cdist(
+                [texts[row] for row in fuzzy_rows],
+                self._keywords,
+                scorer=fuzz.WRatio,
+                processor=None,
+                score_cutoff=self.threshold + 1,
+                dtype=np.uint8,
+            )
+            scores[fuzzy_rows] = np.maximum.reduceat(matrix, self._offsets_arr, axis=1)
+
+        return scores
+
+    def classify(self, message: str) -> str:
+        if not message:
+            return self.default_intent
+        return self.classify_many([message])[0]
+
+    def classify_many(self, messages: Sequence[str]) -> List[str]:
+        """
+        Classifies a batch of messages in one pass.
+        """
+        if not messages:
+            return []
+        return [self._pick(row) for row in self.scores_many(messages)]
@@ -0,0 +1,244 @@
+# backend/app/llm_engine/prompt_builder.py
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import PROMPT_TOKENS
+from app.retrieval.tokenizer import tokenize
+from app.utils.text import estimate_tokens, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Numbered list items ("1. [cse] Staj ...") start a new context piece;
+# indented lines continue the current one.
+_ITEM_START = re.compile(r"^(\d+)\.\s")
+
+# Pieces cut to fewer tokens than this are dropped instead
+MIN_PIECE_TOKENS = 24
+
+# Estimated characters per token, the inverse of estimate_tokens()
+_CHARS_PER_TOKEN = 3
+
+
+@dataclass
+class Prompt:
+    text: str
+    intent: str
+    budget: int
+    tokens: int
+    sections: Dict[str, int] = field(default_factory=dict)
+    pieces_kept: int = 0
+    pieces_dropped: int = 0
+    duplicates: int = 0
+    truncated: bool = False
+
+
+def split_pieces(context: str) -> List[str]:
+    """
+    Splits a context string into independent pieces: headers, numbered items
+    with their indented continuation lines, and paragraphs.
+    """
+    pieces: List[str] = []
+    current: List[str] = []
+    for line in context.splitlines():
+        if not line.strip():
+            if current:
+                pieces.append("\n".join(current))
+                current = []
+            continue
+        if current and (_ITEM_START.match(line) or not line[:1].isspace()):
+            pieces.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text to about `max_tokens` at a word boundary, marking the cut.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max(0, max_tokens * _CHARS_PER_TOKEN - 1)]
+    space = cut.rfind(" ")
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+class PromptBuilder:
+    """
+    Assembles the Gemini prompt within a per-intent token budget.
+
+    The system instruction and the (length-capped) user query are always
+    included. History gets at most `history_share` of what remains, and the
+    rest goes to context: context pieces are deduplicated, ranked by overlap
+    with the query (retrieval order breaks ties), added greedily, and the
+    last piece that does not fit is truncated. Kept pieces are emitted in
+    their original order and renumbered.
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, int],
+        default_budget: int,
+        max_query_tokens: int,
+        history_share: float = 0.3,
+    ):
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.max_query_tokens = max_query_tokens
+        self.history_share = history_share
+
+        self._requests: Dict[str, int] = {}
+        self._tokens: Dict[str, int] = {}
+        self._max_tokens: Dict[str, int] = {}
+        self._truncated: Dict[str, int] = {}
+        self._pieces_dropped = 0
+        self._duplicates = 0
+
+    def build(
+        self,
+        system_instruction: str,
+        user_query: str,
+        context_data: Optional[str] = None,
+        history: Optional[str] = None,
+        intent: Optional[str] = None,
+    ) -> Prompt:
+        intent = intent or "unknown"
+        budget = self.budgets.get(intent, self.default_budget)
+
+        query = truncate_to_tokens(user_query, self.max_query_tokens)
+        system_part = f"System instruction:\n{system_instruction}"
+        query_part = f"User query:\n{query}"
+        remaining = budget - estimate_tokens(system_part) - estimate_tokens(query_part)
+
+        history_part = ""
+        if history:
+            history_part = self._fit_history(history, int(max(0, remaining) * self.history_share))
+            remaining -= estimate_tokens(history_part)
+
+        context_text, kept, dropped, duplicates, cut = self._fit_context(context_data or "", user_query, remaining)
+
+        prompt_parts = [system_part, "", f"Context data:\n{context_text or 'N/A'}", ""]
+        if history_part:
+            prompt_parts += [history_part, ""]
+        prompt_parts.append(query_part)
+        text = "\n".join(prompt_parts)
+
+        prompt = Prompt(
+            text=text,
+            intent=intent,
+            budget=budget,
+            tokens=estimate_tokens(text),
+            sections={
+                "system": estimate_tokens(system_part),
+                "context": estimate_tokens(context_text),
+                "history": estimate_tokens(history_part),
+                "query": estimate_tokens(query_part),
+            },
+            pieces_kept=kept,
+            pieces_dropped=dropped,
+            duplicates=duplicates,
+            truncated=cut or dropped > 0 or query != user_query,
+        )
+        self._record(prompt)
+        return prompt
+
+    def _fit_history(self, history: str, max_tokens: int) -> str:
+        header = "Conversation so far:"
+        budget = max_tokens - estimate_tokens(header)
+        lines: List[str] = []
+        for line in reversed(history.splitlines()):
+            cost = estimate_tokens(line) + 1
+            if cost > budget:
+                break
+            budget -= cost
+            lines.append(line)
+        if not lines:
+            return ""
+        return "\n".join([header, *reversed(lines)])
+
+    def _fit_context(self, context: str, query: str, max_tokens: int):
+        pieces = split_pieces(context)
+        seen = set()
+        unique = []
+        for piece in pieces:
+            key = normalize_text(_ITEM_START.sub("", piece))
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(piece)
+        duplicates = len(pieces) - len(unique)
+
+        query_terms = set(tokenize(query))
+
+        def score(index: int) -> tuple:
+            piece = unique[index]
+            is_header = "\n" not in piece and piece.rstrip().endswith(":")
+            overlap = len(query_terms.intersection(tokenize(piece))) if query_terms else 0
+            return (not is_header, -overlap, index)
+
+        kept: Dict[int, str] = {}
+        budget = max_tokens
+        cut = False
+        for index in sorted(range(len(unique)), key=score):
+            piece = unique[index]
+            cost = estimate_tokens(piece) + 1
+            if cost <= budget:
+                kept[index] = piece
+                budget -= cost
+            elif budget >= MIN_PIECE_TOKENS:
+                kept[index] = truncate_to_tokens(piece, budget - 1)
+                budget = 0
+                cut = True
+
+        lines = []
+        number = 0
+        for index in sorted(kept):
+            piece = kept[index]
+            if _ITEM_START.match(piece):
+                number += 1
+                piece = _ITEM_START.sub(f"{number}. ", piece, count=1)
+            lines.append(piece)
+        return "\n".join(lines), len(kept), len(unique) - len(kept), duplicates, cut
+
+    def _record(self, prompt: Prompt) -> None:
+        intent = prompt.intent
+        self._requests[intent] = self._requests.get(intent, 0) + 1
+        self._tokens[intent] = self._tokens.get(intent, 0) + prompt.tokens
+        self._max_tokens[intent] = max(self._max_tokens.get(intent, 0), prompt.tokens)
+        self._truncated[intent] = self._truncated.get(intent, 0) + prompt.truncated
+        self._pieces_dropped += prompt.pieces_dropped
+        self._duplicates += prompt.duplicates
+        PROMPT_TOKENS.observe(prompt.tokens, intent)
+        logger.debug(f"Prompt for '{intent}': {prompt.tokens}/{prompt.budget} tokens {prompt.sections}")
+
+    def stats(self) -> dict:
+        return {
+            "per_intent": {
+                intent: {
+                    "requests": count,
+                    "budget": self.budgets.get(intent, self.default_budget),
+                    "avg_tokens": round(self._tokens[intent] / count, 1),
+                    "max_tokens": self._max_tokens[intent],
+                    "truncated": self._truncated[intent],
+                }
+                for intent, count in self._requests.items()
+            },
+            "pieces_dropped": self._pieces_dropped,
+            "duplicates_removed": self._duplicates,
+        }
+
+
+prompt_builder = PromptBuilder(
+    budgets=settings.PROMPT_TOKEN_BUDGETS,
+    default_budget=settings.PROMPT_DEFAULT_TOKEN_BUDGET,
+    max_query_tokens=settings.PROMPT_MAX_QUERY_TOKENS,
+    history_share=settings.PROMPT_HISTORY_SHARE,
+)
@@ -0,0 +1,159 @@
+# backend/app/llm_engine/query_log.py
+"""
+Query log for evaluation and FAQ mining: one document per answered chat
+message (question, intent, source, outcome, latency, reply), written to
+MongoDB behind the request path.
+
+Run as a module to export it as gzip-compressed JSON Lines:
+
+    python -m app.llm_engine.query_log --export queries.jsonl.gz [--since 2026-10-01] [--until 2026-11-01]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+from datetime import datetime
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.collections import QUERY_LOG_COLLECTION
+from app.db.mongo import db, connect_to_mongo, close_mongo_connection
+from app.db.write_behind import WriteBehindBuffer
+
+# Documents fetched per round trip while exporting
+EXPORT_BATCH_SIZE = 1000
+
+
+class QueryLog:
+    """
+    Records chat exchanges into a WriteBehindBuffer.
+
+    `record()` only builds a dict and appends it to the buffer's bounded
+    queue; insert_many runs in the buffer's background task. When MongoDB
+    is slow the queue fills up and further entries are dropped (and
+    counted) rather than delaying chat requests. stop() flushes what is
+    left on shutdown.
+    """
+
+    def __init__(self, store: Optional[WriteBehindBuffer]):
+        self.store = store
+
+    async def start(self) -> None:
+        if self.store:
+            await self.store.start()
+
+    async def stop(self) -> None:
+        if self.store:
+            await self.store.stop()
+
+    def record(
+        self,
+        route: str,
+        message: str,
+        intent: str,
+        outcome: str,
+        seconds: float,
+        reply: Optional[str] = None,
+        source: Optional[str] = None,
+        user_id: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        client: Optional[str] = None,
+    ) -> None:
+        """
+        Queues one exchange.
+
+        Args:
+            route: "chat", "stream" or "batch".
+            message: The user's message.
+            intent: Routed intent ("unknown" if classification failed).
+            outcome: Metrics outcome (generated, cached, fast_path, shed, ...).
+            seconds: Server-side latency of the request.
+            reply: The answer, None if the request failed.
+            source: ChatResponse.source of the answer.
+        """
+        if not self.store:
+            return
+        self.store.add({
+            "route": route,
+            "message": message,
+            "intent": intent,
+            "source": source,
+            "outcome": outcome,
+            "latency_ms": round(seconds * 1000, 1),
+            "reply": reply,
+            "user_id": user_id,
+            "chat_id": chat_id,
+            "client": client,
+            "created_at": datetime.utcnow(),
+        })
+
+    def stats(self) -> dict:
+        if not self.store:
+            return {"enabled": False}
+        return {"enabled": True, **self.store.stats()}
+
+
+query_log = QueryLog(
+    store=WriteBehindBuffer(
+        QUERY_LOG_COLLECTION,
+        flush_interval_seconds=settings.WRITE_BEHIND_FLUSH_SECONDS,
+        max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+        max_pending=settings.WRITE_BEHIND_MAX_PENDING,
+    ) if settings.QUERY_LOG_ENABLED else None,
+)
+
+registry.gauge_callback("chat_query_log_dropped_total", "Query log entries dropped on a full buffer.",
+                        lambda: query_log.store.dropped if query_log.store else 0, "counter")
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def export(path: str, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+    """
+    Streams the query log, oldest first, into a gzip-compressed JSON Lines
+    file without holding more than one cursor batch in memory.
+
+    Returns:
+        Number of exported documents.
+    """
+    created_at = {}
+    if since:
+        created_at["$gte"] = since
+    if until:
+        created_at["$lt"] = until
+    query = {"created_at": created_at} if created_at else {}
+
+    cursor = db.db[QUERY_LOG_COLLECTION].find(query).sort("created_at", 1).batch_size(EXPORT_BATCH_SIZE)
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        async for document in cursor:
+            f.write(json.dumps(document, default=_json_default, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+async def _main(path: str, since: Optional[datetime], until: Optional[datetime]) -> int:
+    await connect_to_mongo()
+    try:
+        count = await export(path, since, until)
+        print(f"Exported {count} queries to {path}")
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the chat query log as gzip-compressed JSON Lines.")
+    parser.add_argument("--export", required=True, metavar="PATH", help="output file, e.g. queries.jsonl.gz")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="first day/time to include (UTC, ISO format)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="first day/time to exclude (UTC, ISO format)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_main(args.export, args.since, args.until)))
@@ -0,0 +1,316 @@
+# backend/app/llm_engine/resilience.py
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.llm_engine.gateway import GatewayOverloaded, LLMGateway
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(GatewayOverloaded):
+    """
+    Raised without calling the model while the circuit breaker is open.
+
+    Subclasses GatewayOverloaded so every caller that already falls back to a
+    stale reply or a fast 503 on shedding does the same here.
+    """
+
+
+class LatencyWindow:
+    """
+    Latencies of the most recent successful model calls, for percentiles.
+
+    Percentiles are recomputed at most every `refresh_every` observations,
+    so reading them on every call stays O(1).
+    """
+
+    def __init__(self, size: int, refresh_every: int = 10):
+        self._samples: deque = deque(maxlen=size)
+        self._refresh_every = refresh_every
+        self._pending = 0
+        self._sorted: list = []
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._pending += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the q-quantile (0..1) of the window, None while it is empty.
+        """
+        if not self._samples:
+            return None
+        if self._pending >= self._refresh_every or len(self._sorted) != len(self._samples):
+            self._sorted = sorted(self._samples)
+            self._pending = 0
+        index = min(len(self._sorted) - 1, max(0, math.ceil(q * len(self._sorted)) - 1))
+        return self._sorted[index]
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream and probes it again after a cooldown.
+
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half_open once the cooldown has passed, letting exactly one probe call
+    through; the probe's success closes the breaker, its failure re-opens it
+    with a doubled cooldown (capped at `max_cooldown_seconds`).
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float, max_cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+        self.state = CLOSED
+        self.cooldown_seconds = cooldown_seconds
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected (cooldown not over yet)."""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.cooldown_seconds
+
+    def allow(self) -> bool:
+        """
+        Returns whether a call may go to the upstream now. While half open,
+        only the first caller (the probe) is allowed.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self.state = HALF_OPEN
+            self._probing = False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("LLM circuit breaker closed: upstream recovered")
+        self.state = CLOSED
+        self.cooldown_seconds = self.base_cooldown_seconds
+        self._consecutive_failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            self.cooldown_seconds = min(self.cooldown_seconds * 2, self.max_cooldown_seconds)
+            self._open()
+        elif self.state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """
+        Called when an allowed call never reached the upstream (e.g. it was
+        shed by the gateway), so a half-open breaker can send another probe.
+        """
+        self._probing = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        self.opened += 1
+        logger.warning(
+            f"LLM circuit breaker open after {self._consecutive_failures} consecutive failures; "
+            f"retrying in {self.cooldown_seconds:g}s"
+        )
+
+    def stats(self) -> dict:
+        return {
+            "state": OPEN if self.is_open else self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "cooldown_seconds": self.cooldown_seconds,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientCaller:
+    """
+    Wraps LLMGateway calls with an adaptive timeout, a circuit breaker and
+    optional hedging.
+
+    - Timeout: `timeout_multiplier` x the p99 of recent successful calls,
+      clamped to [min_timeout_seconds, gateway timeout]; the gateway timeout
+      is used until `min_samples` calls have been observed.
+    - Breaker: timeouts and errors count as failures; shed calls do not
+      (they never reached Gemini).
+    - Hedging: if a call is still running after the recent p95, a second
+      identical call is started and the first reply wins. Hedges are only
+      sent while the gateway has idle slots and are capped at `hedge_ratio`
+      of all calls, so they cannot amplify an overload.
+    """
+
+    def __init__(
+        self,
+        gateway: LLMGateway,
+        breaker: CircuitBreaker,
+        window_size: int = 200,
+        min_samples: int = 20,
+        timeout_multiplier: float = 2.0,
+        min_timeout_seconds: float = 5.0,
+        hedge: bool = False,
+        hedge_ratio: float = 0.1,
+    ):
+        self.gateway = gateway
+        self.breaker = breaker
+        self.latencies = LatencyWindow(window_size)
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout_seconds = min_timeout_seconds
+        self.hedge = hedge
+        self.hedge_ratio = hedge_ratio
+
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def timeout_seconds(self) -> Optional[float]:
+        """
+        Current per-call timeout (None if the gateway has no timeout and too
+        few calls were observed to adapt).
+        """
+        ceiling = self.gateway.timeout_seconds
+        if len(self.latencies) < self.min_samples:
+            return ceiling
+        adaptive = max(self.min_timeout_seconds, self.latencies.percentile(0.99) * self.timeout_multiplier)
+        return adaptive if ceiling is None else min(adaptive, ceiling)
+
+    def check(self) -> None:
+        """
+        Raises:
+            CircuitOpen: If the breaker rejects the call.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen("LLM circuit breaker is open")
+
+    def record(self, success: bool, seconds: Optional[float] = None) -> None:
+        """
+        Reports the outcome of a call admitted by check() that was made
+        outside call() (streaming).
+        """
+        if success:
+            self.breaker.record_success()
+            if seconds is not None:
+                self.latencies.observe(seconds)
+        else:
+            self.breaker.record_failure()
+
+    async def call(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `factory()` through the gateway with breaker, adaptive timeout
+        and (if enabled) hedging.
+
+        Raises:
+            CircuitOpen: If the breaker is open; nothing is sent.
+            GatewayOverloaded: If the gateway shed the call.
+            GatewayTimeout: If the call exceeded the adaptive timeout.
+        """
+        self.check()
+        self.calls += 1
+        timeout = self.timeout_seconds()
+        try:
+            if self._can_hedge():
+                result = await self._hedged(factory, timeout)
+            else:
+                result = await self.gateway.run(self._timed(factory), timeout)
+        except GatewayOverloaded:
+            self.breaker.release()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _timed(self, factory: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+        # Only time spent in Gemini counts, not the wait for a gateway slot
+        async def timed() -> T:
+            started = time.perf_counter()
+            result = await factory()
+            self.latencies.observe(time.perf_counter() - started)
+            return result
+        return timed
+
+    def _can_hedge(self) -> bool:
+        return self.hedge and len(self.latencies) >= self.min_samples
+
+    def _hedge_allowed(self) -> bool:
+        return (
+            self.hedges < self.hedge_ratio * self.calls
+            and self.gateway.queue_depth == 0
+            and self.gateway.in_flight < self.gateway.max_concurrency
+        )
+
+    async def _hedged(self, factory: Callable[[], Awaitable[T]], timeout: Optional[float]) -> T:
+        delay = self.latencies.percentile(0.95)
+        primary = asyncio.ensure_future(self.gateway.run(self._timed(factory), timeout))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            # asyncio.wait does not cancel what it waits for
+            primary.cancel()
+            raise
+        if done or not self._hedge_allowed():
+            return await primary
+
+        self.hedges += 1
+        remaining = None if timeout is None else max(timeout - delay, self.min_timeout_seconds)
+        hedge = asyncio.ensure_future(self.gateway.run(self._timed(factory), remaining))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        p50 = self.latencies.percentile(0.5)
+        p95 = self.latencies.percentile(0.95)
+        timeout = self.timeout_seconds()
+        return {
+            "breaker": self.breaker.stats(),
+            "timeout_seconds": round(timeout, 3) if timeout is not None else None,
+            "latency_samples": len(self.latencies),
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedging": self.hedge,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
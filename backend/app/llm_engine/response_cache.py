@@ -0,0 +1,153 @@
+# backend/app/llm_engine/response_cache.py
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# (intent, normalized message, context hash)
+CacheKey = Tuple[str, str, str]
+
+
+def hash_context(context_data: Optional[str]) -> str:
+    """
+    Returns a short, stable fingerprint of a context string.
+    """
+    return hashlib.blake2b((context_data or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for generated chat replies.
+
+    Entries are keyed by intent, normalized message and a hash of the context
+    that was sent to the model. At most one context is kept per (intent,
+    message): when the same question arrives with a different context (e.g.
+    the pipeline stored a new menu, or new announcements changed its search
+    hits), the reply built on the old context is dropped. Tracking the hash
+    per question rather than per intent matters because announcement and
+    general contexts are retrieved per message, so different questions of
+    one intent legitimately have different contexts.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str]]" = OrderedDict()
+        # (intent, normalized message) -> context hash of its cached entry
+        self._context_hashes: Dict[Tuple[str, str], str] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        """Entries held, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def make_key(self, intent: str, message: str, context_data: Optional[str]) -> CacheKey:
+        """
+        Builds the cache key for a request and invalidates the cached reply
+        to the same question if its context has changed.
+        """
+        key = (intent, normalize_text(message), hash_context(context_data))
+        self._observe_context(key)
+        return key
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """
+        Returns the cached reply for `key`, or None on miss/expiry.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, reply = entry
+        if expires_at <= time.monotonic():
+            # Expired entries stay until LRU eviction so get_stale() can
+            # still serve them when the LLM gateway is shedding load.
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return reply
+
+    def get_stale(self, key: CacheKey) -> Optional[str]:
+        """
+        Returns the reply for `key` even if its TTL has passed.
+
+        Entries built on an outdated context are already invalidated, so a
+        stale reply still answers the question with the current data.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.stale_hits += 1
+        return entry[1]
+
+    def set(self, key: CacheKey, reply: str) -> None:
+        """
+        Stores a reply, evicting the least recently used entries if full.
+        """
+        if self.max_entries <= 0:
+            return
+
+        # A slow call may store a reply built on a context that was replaced
+        # meanwhile: keep one context per question, the last one stored
+        self._observe_context(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, reply)
+        self._entries.move_to_end(key)
+        self._context_hashes[key[:2]] = key[2]
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._context_hashes.pop(evicted[:2], None)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._context_hashes.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _observe_context(self, key: CacheKey) -> None:
+        previous = self._context_hashes.get(key[:2])
+        if previous is None or previous == key[2]:
+            return
+
+        del self._context_hashes[key[:2]]
+        if self._entries.pop((*key[:2], previous), None) is not None:
+            self.invalidations += 1
+            logger.debug(f"Context changed for a cached '{key[0]}' question, dropped its reply.")
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+registry.gauge_callback("response_cache_entries", "Replies held in the response cache.", lambda: len(response_cache))
+registry.gauge_callback("response_cache_hits_total", "Response cache hits.", lambda: response_cache.hits, "counter")
+registry.gauge_callback("response_cache_misses_total", "Response cache misses.", lambda: response_cache.misses, "counter")
@@ -0,0 +1,63 @@
+# backend/app/llm_engine/singleflight.py
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+
+    The first caller (leader) starts the task; callers arriving while it runs
+    (followers) await the same result. The key is released as soon as the
+    task finishes, so a failure is only seen by callers that were already
+    waiting and the next call starts a fresh attempt.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, "asyncio.Future"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def running(self, key: Hashable) -> bool:
+        """True if a call for `key` is in flight, i.e. do() would join it."""
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `call()` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the work (e.g. intent + normalized message + context hash).
+            call: Zero-argument factory for the coroutine to run.
+
+        Returns:
+            The shared result of the call.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(call())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._release(key, t))
+        self.leaders += 1
+        # Shielded so a disconnecting leader does not cancel the followers' work
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: "asyncio.Future") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,82 @@
+# backend/app/llm_engine/templates.py
+
+import re
+from datetime import date
+from typing import Optional
+
+from app.db.snapshot import NO_ANNOUNCEMENTS
+
+# Intents whose context already is the answer, so it can be shown as-is
+DEGRADED_INTENTS = ("dining", "announcement")
+
+DEGRADED_HEADER = (
+    "Asistan şu anda yoğunluk nedeniyle ayrıntılı yanıt veremiyor. "
+    "Kayıtlarımızdaki güncel bilgiler:"
+)
+
+# Keeps a templated reply readable when the context is a long search result
+DEGRADED_MAX_CHARS = 1500
+
+
+def degraded_reply(intent: str, context_data: Optional[str]) -> Optional[str]:
+    """
+    Builds a reply from the fetched context alone, without calling Gemini.
+
+    Used while the LLM circuit breaker is open or a call failed: the menu
+    and announcement contexts are already what the user asked for, so
+    showing them beats a generic apology.
+
+    Args:
+        intent: Classified intent of the message.
+        context_data: Context string fetched for the intent.
+
+    Returns:
+        The templated reply, or None if the intent needs the model.
+    """
+    if intent not in DEGRADED_INTENTS or not context_data:
+        return None
+
+    body = context_data.strip()
+    if len(body) > DEGRADED_MAX_CHARS:
+        body = body[:DEGRADED_MAX_CHARS].rsplit("\n", 1)[0] + "\n..."
+    return f"{DEGRADED_HEADER}\n\n{body}"
+
+
+# Context formats of app.db.snapshot
+_MENU = re.compile(r"^VERİTABANI BİLGİSİ \((?P<day>\S+) Menüsü - (?P<location>.*?)\): (?P<items>.+)$", re.S)
+_MENU_EMPTY = "VERİTABANI BİLGİSİ: Menü kaydı var ama içi boş."
+_MENU_NOT_FOUND_SUFFIX = "yemek listesi bulunamadı."
+_DIGEST_HEADER = "Recent Announcements:"
+
+
+def dining_reply(label: str, day: date, context_data: str) -> str:
+    """
+    Answers "what is on the menu" for one day from its dining context.
+
+    Args:
+        label: How the user named the day ("Bugün", "Yarın", "Cuma", ...).
+        day: The resolved date.
+        context_data: ContextSnapshot.dining() for that date.
+    """
+    when = f"{label} ({day.strftime('%d.%m.%Y')})"
+    match = _MENU.match(context_data.strip())
+    if match:
+        items = "\n".join(f"- {item.strip()}" for item in match["items"].split(","))
+        return f"{when} {match['location']} menüsü:\n{items}"
+    if context_data.strip() == _MENU_EMPTY:
+        return f"{when} için menü kaydı var ama içinde yemek yok."
+    if context_data.endswith(_MENU_NOT_FOUND_SUFFIX):
+        return f"{when} için yemek listesi henüz yayınlanmamış."
+    return f"{when} menüsü:\n{context_data.strip()}"
+
+
+def announcements_reply(digest: str) -> str:
+    """
+    Lists the latest announcements from the recent announcements digest.
+    """
+    body = digest.strip()
+    if body == NO_ANNOUNCEMENTS:
+        return "Şu anda yeni bir duyuru bulunmuyor."
+    if body.startswith(_DIGEST_HEADER):
+        body = body[len(_DIGEST_HEADER):].strip()
+    return f"Son duyurular:\n{body}"
@@ -1,7 +1,7 @@
 # backend/app/models/schemas.py
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -9,11 +9,45 @@ from pydantic import BaseModel, Field
 class ChatRequest(BaseModel):
     message: str
     user_id: Optional[str] = None
+    chat_id: Optional[str] = None  # group chat of a bridged message (e.g. WhatsApp group)
+    client: Literal["mobile", "bridge"] = "mobile"  # admission priority class
+    force_llm: bool = False  # skip the no-LLM fast path (templates, FAQ)
 
 
 class ChatResponse(BaseModel):
     reply: str
-    source: Optional[str] = None  # e.g., 'dining', 'announcement', 'ai'
+    source: Optional[str] = None  # e.g., 'dining', 'announcement', 'faq', 'dining_template'
+
+
+class ChatBatchRequest(BaseModel):
+    messages: List[ChatRequest] = Field(..., min_length=1)
+    stream: bool = False  # NDJSON lines in completion order instead of one ordered list
+
+
+class ChatBatchItem(BaseModel):
+    index: int  # position in ChatBatchRequest.messages
+    reply: Optional[str] = None
+    source: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class ChatBatchResponse(BaseModel):
+    results: List[ChatBatchItem]
+
+
+class FeedItem(BaseModel):
+    id: str
+    title: str
+    link: Optional[str] = None
+    source: Optional[str] = None  # 'website', 'teams', ...
+    summary: Optional[str] = None
+    created_at: datetime
+
+
+class FeedPage(BaseModel):
+    items: List[FeedItem]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next (older) page
 
 
 class Announcement(BaseModel):
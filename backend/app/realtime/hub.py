@@ -0,0 +1,279 @@
+# backend/app/realtime/hub.py
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.db.collections import PIPELINE_ANNOUNCEMENTS_COLLECTION
+from app.db.mongo import db
+from app.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_PROJECTION = {"title": 1, "link": 1, "source_type": 1, "source": 1, "summary": 1, "course": 1,
+               "created_at": 1, "scraped_at": 1}
+
+
+class Subscriber:
+    """
+    One connected client: a bounded deque of pending items plus its filters.
+    The hub never awaits a subscriber; if the backlog is full the subscriber
+    is closed instead of slowing down delivery to everyone else. An idle
+    subscriber holds a single future, not a task.
+    """
+
+    __slots__ = ("pending", "max_pending", "sources", "courses", "closed", "close_reason", "_waiter")
+
+    def __init__(self, max_pending: int, sources: FrozenSet[str], courses: FrozenSet[str]):
+        self.pending: Deque[Dict[str, Any]] = deque()
+        self.max_pending = max_pending
+        self.sources = sources
+        self.courses = courses
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self._waiter: Optional[asyncio.Future] = None
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        if self.sources and item.get("source") not in self.sources:
+            return False
+        if self.courses:
+            course = normalize_text(item.get("course") or "")
+            title = normalize_text(item.get("title") or "")
+            return any(c == course or c in title for c in self.courses)
+        return True
+
+    def push(self, item: Dict[str, Any]) -> bool:
+        """
+        Queues an item without waiting.
+
+        Returns:
+            False if the backlog is full.
+        """
+        if len(self.pending) >= self.max_pending:
+            return False
+        self.pending.append(item)
+        self._wake()
+        return True
+
+    def close(self, reason: str) -> None:
+        self.closed = True
+        self.close_reason = reason
+        self.pending.clear()
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Waits for the next item.
+
+        Returns:
+            The item, {} on timeout (time for a heartbeat) or None once closed.
+        """
+        if not self.pending and not self.closed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiter = None
+        if self.closed:
+            return None
+        return self.pending.popleft() if self.pending else {}
+
+
+class AnnouncementHub:
+    """
+    Pushes newly stored announcements to connected clients.
+
+    A single watcher per worker follows the announcements collection through
+    a change stream when MongoDB supports it (replica set), otherwise by
+    polling for documents with a newer `scraped_at`. Each new item is fanned
+    out without awaiting into per-subscriber bounded backlogs, so idle
+    connections cost nothing but their backlog and one slow client cannot
+    delay the others: it is disconnected when its backlog overflows.
+    """
+
+    def __init__(self, poll_interval_seconds: float, queue_size: int, max_subscribers: int):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+
+        self._subscribers: Set[Subscriber] = set()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._watermark: Optional[datetime] = None
+        self._seen_at_watermark: Set[Any] = set()
+        self.mode = "stopped"
+
+        self.published = 0
+        self.delivered = 0
+        self.slow_disconnects = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        for subscriber in list(self._subscribers):
+            subscriber.close("server shutting down")
+        self._subscribers.clear()
+        self.mode = "stopped"
+
+    def subscribe(self, sources: Optional[List[str]] = None, courses: Optional[List[str]] = None) -> Optional[Subscriber]:
+        """
+        Registers a client.
+
+        Returns:
+            The subscriber, or None if the worker is at max_subscribers.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            return None
+        subscriber = Subscriber(
+            self.queue_size,
+            frozenset(sources or ()),
+            frozenset(normalize_text(c) for c in courses or () if normalize_text(c)),
+        )
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        Calls `callback(items)` in-process whenever new announcements arrive
+        (e.g. to invalidate caches).
+        """
+        self._listeners.append(callback)
+
+    def publish(self, items: List[Dict[str, Any]]) -> None:
+        if not items:
+            return
+        self.published += len(items)
+        for callback in self._listeners:
+            try:
+                callback(items)
+            except Exception as e:
+                logger.warning(f"Announcement listener failed: {e}")
+
+        # A burst larger than a backlog would disconnect every client at once;
+        # deliver its newest part only (clients can page GET /feed for the rest)
+        burst = items[-self.queue_size:]
+        for subscriber in list(self._subscribers):
+            for item in burst:
+                if not subscriber.matches(item):
+                    continue
+                if not subscriber.push(item):
+                    self._subscribers.discard(subscriber)
+                    subscriber.close("slow consumer")
+                    self.slow_disconnects += 1
+                    break
+                self.delivered += 1
+
+    # --- Watching ---
+
+    async def _watch(self) -> None:
+        collection = db.db[PIPELINE_ANNOUNCEMENTS_COLLECTION]
+        try:
+            async with collection.watch([{"$match": {"operationType": "insert"}}]) as stream:
+                self.mode = "change_stream"
+                logger.info("Announcement hub following a change stream.")
+                async for change in stream:
+                    self.publish([to_item(change["fullDocument"])])
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            # Standalone servers do not support change streams
+            logger.info(f"Change streams unavailable ({e.code}), announcement hub falls back to polling.")
+        except PyMongoError as e:
+            logger.warning(f"Announcement change stream failed, falling back to polling: {e}")
+        await self._poll_loop()
+
+    async def _poll_loop(self) -> None:
+        self.mode = "poll"
+        while True:
+            try:
+                if self._watermark is None:
+                    await self._init_watermark()
+                else:
+                    self.publish(await self._poll())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Announcement hub poll failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _init_watermark(self) -> None:
+        # Start from the newest stored document rather than the local clock,
+        # so clock skew between pipeline and backend cannot hide inserts
+        latest = await db.db[PIPELINE_ANNOUNCEMENTS_COLLECTION].find_one(
+            {"scraped_at": {"$exists": True}}, {"scraped_at": 1}, sort=[("scraped_at", -1)]
+        )
+        self._watermark = latest["scraped_at"] if latest else datetime(1970, 1, 1)
+        self._seen_at_watermark = {latest["_id"]} if latest else set()
+
+    async def _poll(self) -> List[Dict[str, Any]]:
+        # $gte plus the ids already seen at the watermark: documents written
+        # in the same millisecond as the last one are not skipped
+        cursor = (
+            db.db[PIPELINE_ANNOUNCEMENTS_COLLECTION]
+            .find({"scraped_at": {"$gte": self._watermark}}, _PROJECTION)
+            .sort("scraped_at", 1)
+            .limit(500)
+        )
+        items = []
+        async for doc in cursor:
+            if doc["_id"] in self._seen_at_watermark:
+                continue
+            if doc["scraped_at"] > self._watermark:
+                self._watermark = doc["scraped_at"]
+                self._seen_at_watermark = set()
+            self._seen_at_watermark.add(doc["_id"])
+            items.append(to_item(doc))
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "slow_disconnects": self.slow_disconnects,
+            "rejected": self.rejected,
+        }
+
+
+def to_item(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON-ready push payload of an announcement document (FeedItem fields).
+    """
+    created_at = doc.get("created_at") or doc.get("scraped_at")
+    return {
+        "id": str(doc["_id"]),
+        "title": doc.get("title") or "",
+        "link": doc.get("link"),
+        "source": doc.get("source_type") or doc.get("source"),
+        "summary": doc.get("summary"),
+        "course": doc.get("course"),
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+announcement_hub = AnnouncementHub(
+    poll_interval_seconds=settings.PUSH_POLL_SECONDS,
+    queue_size=settings.PUSH_QUEUE_SIZE,
+    max_subscribers=settings.PUSH_MAX_SUBSCRIBERS,
+)
@@ -0,0 +1,159 @@
+# backend/app/retrieval/announcement_search.py
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.tailer import CollectionTailer
+from app.db.collections import ANNOUNCEMENTS_COLLECTION, PIPELINE_ANNOUNCEMENTS_COLLECTION
+from app.retrieval.bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+_PROJECTION = {"title": 1, "content": 1, "summary": 1, "source": 1, "source_type": 1, "link": 1, "url": 1}
+
+
+def _to_document(collection: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    title = doc.get("title") or ""
+    content = doc.get("content") or doc.get("summary") or ""
+    return {
+        "key": f"{collection}:{doc['_id']}",
+        "text": f"{title}\n{title}\n{content}",  # title counted twice: it is the densest signal
+        "payload": {
+            "title": title,
+            "content": content[:300],
+            "source": doc.get("source") or doc.get("source_type") or "N/A",
+            "link": doc.get("link") or doc.get("url"),
+        },
+    }
+
+
+def format_hits(hits: List[Dict[str, Any]]) -> str:
+    """
+    Formats search hits as the announcements context for the prompt.
+    """
+    lines = ["Relevant Announcements:"]
+    for i, hit in enumerate(hits, 1):
+        line = f"{i}. [{hit['source']}] {hit['title']}"
+        if hit.get("content"):
+            line += f"\n   {hit['content']}"
+        if hit.get("link"):
+            line += f"\n   {hit['link']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class AnnouncementSearch:
+    """
+    BM25 retrieval over every announcement the backend can see.
+
+    The index is loaded from disk at startup, then kept up to date by polling
+    each source collection for documents with an _id above the last one
+    indexed, so new pipeline inserts are added incrementally and nothing is
+    rescanned. The index is saved again after every sync that added documents.
+
+    With `follow` (workers of a multi-worker deployment) MongoDB is not
+    polled and nothing is saved: the index file written by the refresher
+    process is reloaded whenever it changes.
+    """
+
+    def __init__(self, index_path: str, poll_interval_seconds: float, sources: List[str], follow: bool = False):
+        self.index_path = index_path
+        self.poll_interval_seconds = poll_interval_seconds
+        self.follow = follow
+
+        self.index = BM25Index()
+        self._tailer = CollectionTailer(sources, _PROJECTION)
+        self._poll_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        # Loading and catching up happen in the background so they do not
+        # delay startup; until then search() finds nothing and chat falls
+        # back to the recent announcements digest
+        self._poll_task = asyncio.create_task(self._follow_loop() if self.follow else self._poll_loop())
+
+    async def _load(self) -> None:
+        if os.path.exists(self.index_path):
+            try:
+                self.index, meta = await asyncio.to_thread(BM25Index.load, self.index_path)
+                self._tailer.watermarks = meta.get("watermarks", {})
+                logger.info(f"Loaded announcement index with {len(self.index)} documents.")
+            except Exception as e:
+                logger.warning(f"Could not load announcement index, rebuilding: {e}")
+                self.index, self._tailer.watermarks = BM25Index(), {}
+
+    async def stop(self) -> None:
+        if self._poll_task and not self._poll_task.done():
+            self._poll_task.cancel()
+        self._poll_task = None
+
+    async def sync(self) -> int:
+        """
+        Indexes documents inserted since the last sync.
+
+        Returns:
+            Number of newly indexed documents.
+        """
+        added = 0
+        async for collection, doc in self._tailer.poll():
+            document = _to_document(collection, doc)
+            if self.index.add(document["key"], document["text"], document["payload"]):
+                added += 1
+
+        if added:
+            logger.info(f"Indexed {added} new announcements ({len(self.index)} total).")
+            await self._save()
+        return added
+
+    def search(self, query: str, k: int) -> List[Dict[str, Any]]:
+        return [payload for _, payload in self.index.search(query, k)]
+
+    async def _save(self) -> None:
+        async with self._save_lock:
+            try:
+                await metrics.to_thread("announcement_index_save", self.index.save, self.index_path, {"watermarks": dict(self._tailer.watermarks)})
+            except Exception as e:
+                logger.warning(f"Could not persist announcement index: {e}")
+
+    async def _poll_loop(self) -> None:
+        await self._load()
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Announcement index sync failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _follow_loop(self) -> None:
+        loaded = None
+        while True:
+            try:
+                modified = os.stat(self.index_path).st_mtime_ns
+                if modified != loaded:
+                    self.index, _ = await asyncio.to_thread(BM25Index.load, self.index_path)
+                    loaded = modified
+                    logger.info(f"Reloaded announcement index with {len(self.index)} documents.")
+            except asyncio.CancelledError:
+                raise
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Announcement index reload failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    def stats(self) -> dict:
+        return {"documents": len(self.index), "terms": self.index.vocabulary_size}
+
+
+announcement_search = AnnouncementSearch(
+    index_path=settings.ANNOUNCEMENT_INDEX_PATH,
+    poll_interval_seconds=settings.ANNOUNCEMENT_INDEX_POLL_SECONDS,
+    sources=[PIPELINE_ANNOUNCEMENTS_COLLECTION, ANNOUNCEMENTS_COLLECTION],
+    follow=settings.SHARED_SNAPSHOT_READ,
+)
@@ -0,0 +1,193 @@
+# backend/app/retrieval/bm25.py
+
+import json
+import math
+import os
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.retrieval.tokenizer import tokenize
+
+
+class BM25Index:
+    """
+    Incremental in-memory BM25 inverted index.
+
+    Postings are compact typed arrays (uint32 doc ids, uint16 term
+    frequencies) that grow by appending, so adding a document never rescans
+    existing ones. Queries score only the documents that contain a query
+    term, using per-term impact vectors cached between writes.
+    """
+
+    # Max number of query terms whose scores are kept precomputed
+    IMPACT_CACHE_TERMS = 4096
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._impact_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_len = array("I")
+        self._doc_keys: List[str] = []
+        self._doc_payloads: List[Dict[str, Any]] = []
+        self._key_to_doc: Dict[str, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_doc
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def add(self, key: str, text: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Indexes one document.
+
+        Args:
+            key: Unique external id (documents are never indexed twice).
+            text: Text to index (e.g. title + content).
+            payload: Small dict returned with search hits.
+
+        Returns:
+            False if the key was already indexed.
+        """
+        if key in self._key_to_doc:
+            return False
+
+        self._impact_cache.clear()
+        doc_id = len(self._doc_keys)
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = (array("I"), array("H"))
+                self._postings[term] = postings
+            postings[0].append(doc_id)
+            postings[1].append(min(tf, 0xFFFF))
+
+        self._doc_len.append(len(tokens))
+        self._total_len += len(tokens)
+        self._doc_keys.append(key)
+        self._doc_payloads.append(payload or {})
+        self._key_to_doc[key] = doc_id
+        return True
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Returns up to k (score, payload) pairs, best first.
+        """
+        n_docs = len(self._doc_keys)
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._postings]
+        if not n_docs or not terms or k <= 0:
+            return []
+
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term in terms:
+            doc_ids, impacts = self._term_impacts(term)
+            scores[doc_ids] += impacts
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(float(scores[i]), self._doc_payloads[i]) for i in ranked]
+
+    def _term_impacts(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-document BM25 contribution of `term`. Cached until the next add(),
+        since idf and the average document length only change on writes.
+        """
+        cached = self._impact_cache.get(term)
+        if cached is not None:
+            return cached
+
+        n_docs = len(self._doc_keys)
+        avgdl = self._total_len / n_docs or 1.0
+        doc_ids_arr, tfs_arr = self._postings[term]
+        doc_ids = np.array(doc_ids_arr, dtype=np.intp)
+        tfs = np.frombuffer(tfs_arr, dtype=np.uint16).astype(np.float32)
+        doc_len = np.frombuffer(self._doc_len, dtype=np.uint32)[doc_ids]
+
+        df = len(doc_ids)
+        idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avgdl)
+        impacts = (idf * tfs * (self.k1 + 1.0) / (tfs + norm)).astype(np.float32)
+
+        if len(self._impact_cache) >= self.IMPACT_CACHE_TERMS:
+            self._impact_cache.clear()
+        self._impact_cache[term] = (doc_ids, impacts)
+        return doc_ids, impacts
+
+    def save(self, path: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Persists the index as one compressed .npz: all postings concatenated
+        into two flat arrays plus per-term offsets.
+        """
+        terms = list(self._postings)
+        lengths = np.fromiter((len(self._postings[t][0]) for t in terms), dtype=np.uint64, count=len(terms))
+        offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        doc_ids = np.empty(int(offsets[-1]), dtype=np.uint32)
+        tfs = np.empty(int(offsets[-1]), dtype=np.uint16)
+        for i, term in enumerate(terms):
+            start, end = int(offsets[i]), int(offsets[i + 1])
+            doc_ids[start:end] = np.frombuffer(self._postings[term][0], dtype=np.uint32)
+            tfs[start:end] = np.frombuffer(self._postings[term][1], dtype=np.uint16)
+
+        header = {
+            "k1": self.k1,
+            "b": self.b,
+            "terms": terms,
+            "doc_keys": self._doc_keys,
+            "doc_payloads": self._doc_payloads,
+            "meta": meta or {},
+        }
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                header=np.frombuffer(json.dumps(header, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                offsets=offsets,
+                doc_ids=doc_ids,
+                tfs=tfs,
+                doc_len=np.frombuffer(self._doc_len, dtype=np.uint32),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["BM25Index", Dict[str, Any]]:
+        """
+        Loads an index written by save().
+
+        Returns:
+            (index, meta dict passed to save)
+        """
+        with np.load(path) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            offsets = data["offsets"]
+            doc_ids = data["doc_ids"]
+            tfs = data["tfs"]
+            doc_len = data["doc_len"]
+
+        index = cls(k1=header["k1"], b=header["b"])
+        for i, term in enumerate(header["terms"]):
+            start, end = int(offsets[i]), int(offsets[i + 1])
+            index._postings[term] = (array("I", doc_ids[start:end].tobytes()), array("H", tfs[start:end].tobytes()))
+
+        index._doc_len = array("I", doc_len.astype(np.uint32).tobytes())
+        index._total_len = int(doc_len.sum())
+        index._doc_keys = header["doc_keys"]
+        index._doc_payloads = header["doc_payloads"]
+        index._key_to_doc = {key: i for i, key in enumerate(index._doc_keys)}
+        return index, header["meta"]
@@ -0,0 +1,201 @@
+# backend/app/retrieval/semantic_search.py
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.collections import (
+    ANNOUNCEMENTS_COLLECTION,
+    PIPELINE_ANNOUNCEMENTS_COLLECTION,
+    PIPELINE_MENU_COLLECTION,
+)
+from app.db.tailer import CollectionTailer
+from app.retrieval.vector_store import HashingEmbedder, VectorStore, chunk_text
+
+logger = logging.getLogger(__name__)
+
+# (key, text to embed, record) triples produced from one source document
+Chunks = List[Tuple[str, str, Dict[str, Any]]]
+
+MENU_ITEM_FIELDS = ["soup", "main_dish", "side_dish", "other"]
+
+
+def announcement_chunks(collection: str, doc: Dict[str, Any]) -> Chunks:
+    title = doc.get("title") or ""
+    content = doc.get("content") or doc.get("summary") or ""
+    link = doc.get("link") or doc.get("url")
+    chunks = chunk_text(content) or [""]
+    return [
+        (
+            f"{collection}:{doc['_id']}#{i}",
+            f"{title}\n{chunk}",
+            {"source": "announcement", "title": title, "text": chunk, "link": link},
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def menu_chunks(collection: str, doc: Dict[str, Any]) -> Chunks:
+    # The pipeline corrects a day's menu in place: every revision
+    # (updated_at) gets its own key and supersedes the previous row
+    items = doc.get("items") or [doc[field] for field in MENU_ITEM_FIELDS if doc.get(field)]
+    if not items:
+        return []
+    date = doc.get("date", "")
+    text = ", ".join(items)
+    doc_key = f"{collection}:{doc['_id']}"
+    revision = doc.get("updated_at")
+    key = f"{doc_key}@{revision.isoformat()}" if revision else doc_key
+    return [(key, f"yemek menü {date} {text}", {"source": "menu", "title": date, "text": text, "doc": doc_key})]
+
+
+def format_semantic_hits(hits: List[Dict[str, Any]]) -> str:
+    """
+    Formats vector store hits as a related-information block for the prompt.
+    """
+    lines = ["Related Information:"]
+    for i, hit in enumerate(hits, 1):
+        line = f"{i}. [{hit['source']}] {hit['title']}".rstrip()
+        if hit.get("text"):
+            line += f"\n   {hit['text']}"
+        if hit.get("link"):
+            line += f"\n   {hit['link']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class SemanticSearch:
+    """
+    Keeps a VectorStore in sync with every ingested collection and serves
+    similarity search as a chat context source.
+
+    Each source collection is tailed by _id (menus, which are updated in
+    place, by updated_at); new documents are chunked, embedded in a worker
+    thread and appended. Watermarks are saved next to
+    the store after each flush, so a restart resumes where it stopped.
+
+    With `follow` (workers of a multi-worker deployment) the store written
+    by the refresher process is opened read-only and refreshed every poll
+    interval; MongoDB is not polled.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        poll_interval_seconds: float,
+        sources: Dict[str, Callable[[str, Dict[str, Any]], Chunks]],
+        dim: int = 256,
+        follow: bool = False,
+        fields: Optional[Dict[str, str]] = None,
+    ):
+        self.directory = directory
+        self.poll_interval_seconds = poll_interval_seconds
+        self.sources = sources
+        self.dim = dim
+        self.follow = follow
+
+        self.store: Optional[VectorStore] = None
+        self._tailer = CollectionTailer(list(sources), fields=fields)
+        self._state_path = os.path.join(directory, "watermarks.json")
+        self._poll_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # Opening the store and embedding the backlog happen in the
+        # background; search() returns nothing until the store is open
+        self._poll_task = asyncio.create_task(self._follow_loop() if self.follow else self._poll_loop())
+
+    async def _open(self) -> None:
+        store = await asyncio.to_thread(VectorStore, self.directory, HashingEmbedder(self.dim))
+        if len(store) and os.path.exists(self._state_path):
+            with open(self._state_path, encoding="utf-8") as f:
+                self._tailer.watermarks = json.load(f)
+        self.store = store
+        logger.info(f"Opened vector store with {len(self.store)} chunks.")
+
+    async def stop(self) -> None:
+        if self._poll_task and not self._poll_task.done():
+            self._poll_task.cancel()
+        self._poll_task = None
+
+    async def sync(self, batch_size: int = 512) -> int:
+        """
+        Embeds and appends documents inserted since the last sync.
+
+        Returns:
+            Number of newly stored chunks.
+        """
+        added = 0
+        batch: Chunks = []
+        async for collection, doc in self._tailer.poll():
+            batch.extend(self.sources[collection](collection, doc))
+            if len(batch) >= batch_size:
+                added += await metrics.to_thread("vector_store_add", self.store.add_many, batch)
+                batch = []
+        if batch:
+            added += await metrics.to_thread("vector_store_add", self.store.add_many, batch)
+
+        if added:
+            logger.info(f"Stored {added} new chunks ({len(self.store)} total).")
+            await asyncio.to_thread(self._persist)
+        return added
+
+    def _persist(self) -> None:
+        self.store.flush()
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._tailer.watermarks, f)
+        os.replace(tmp_path, self._state_path)
+
+    def search(self, query: str, k: int, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        if self.store is None:
+            return []
+        return [record for _, record in self.store.search(query, k, min_score=min_score)]
+
+    async def _poll_loop(self) -> None:
+        await self._open()
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Vector store sync failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _follow_loop(self) -> None:
+        while True:
+            try:
+                if self.store is None:
+                    if os.path.exists(os.path.join(self.directory, "store.json")):
+                        self.store = await asyncio.to_thread(
+                            VectorStore, self.directory, HashingEmbedder(self.dim), read_only=True
+                        )
+                        logger.info(f"Opened vector store with {len(self.store)} chunks (read-only).")
+                else:
+                    await asyncio.to_thread(self.store.refresh)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Vector store refresh failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    def stats(self) -> dict:
+        return self.store.stats() if self.store else {"rows": 0}
+
+
+semantic_search = SemanticSearch(
+    directory=settings.VECTOR_STORE_DIR,
+    poll_interval_seconds=settings.VECTOR_STORE_POLL_SECONDS,
+    sources={
+        PIPELINE_ANNOUNCEMENTS_COLLECTION: announcement_chunks,
+        ANNOUNCEMENTS_COLLECTION: announcement_chunks,
+        PIPELINE_MENU_COLLECTION: menu_chunks,
+    },
+    dim=settings.VECTOR_STORE_DIM,
+    follow=settings.SHARED_SNAPSHOT_READ,
+    fields={PIPELINE_MENU_COLLECTION: "updated_at"},
+)
@@ -0,0 +1,51 @@
+# backend/app/retrieval/tokenizer.py
+
+from typing import List
+
+from app.utils.text import normalize_text
+
+# Very common Turkish function words (already diacritic-folded)
+STOPWORDS = frozenset({
+    "ve", "ile", "veya", "ya", "da", "de", "ki", "mi", "mu", "bu", "su", "o",
+    "bir", "icin", "gibi", "ne", "neler", "nasil", "hangi", "kadar", "daha",
+    "en", "cok", "var", "yok", "ama", "ise", "olan", "olarak", "hakkinda",
+})
+
+# Inflectional suffixes after folding, longest first. Stripping is
+# deliberately shallow; the same rules run on documents and queries, so
+# "staj", "stajlar" and "stajlari" all meet at the same stem.
+_SUFFIXES = sorted({
+    "larindan", "lerinden", "larinin", "lerinin", "larina", "lerine",
+    "larini", "lerini", "larin", "lerin", "lari", "leri", "lar", "ler",
+    "ndan", "nden", "dan", "den", "tan", "ten", "nin", "nun", "nda", "nde",
+    "sina", "sine", "sini", "suna", "sunu", "si", "su",
+    "da", "de", "ta", "te", "ya", "ye", "yi", "yu", "in", "un",
+}, key=len, reverse=True)
+
+_MIN_STEM = 3
+
+
+def stem(token: str) -> str:
+    """
+    Strips up to two Turkish suffixes, e.g. "sinavlarindan" -> "sinav",
+    "hocaya" -> "hoca".
+    """
+    for _ in range(2):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+                token = token[:-len(suffix)]
+                break
+        else:
+            break
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normalizes, splits, drops stopwords/1-char tokens and stems.
+    """
+    return [
+        stem(token)
+        for token in normalize_text(text).split()
+        if len(token) > 1 and token not in STOPWORDS
+    ]
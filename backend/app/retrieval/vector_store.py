@@ -0,0 +1,540 @@
+# backend/app/retrieval/vector_store.py
+
+import json
+import logging
+import math
+import os
+import threading
+import zlib
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from app.retrieval.tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class Embedder(Protocol):
+    """Maps a batch of texts to an (n, dim) float32 matrix of L2-normalized rows."""
+    dim: int
+    name: str
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    # crc32 is stable across processes, unlike hash(), so stored vectors stay valid
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+class HashingEmbedder:
+    """
+    Offline embedder: signed feature hashing of stemmed words plus character
+    trigrams. Trigrams make typos and unseen inflections ("yoklama" /
+    "yoklamalar" / "yoklma") land close to each other; no model download or
+    vocabulary fitting is needed, so vectors can be appended forever.
+    """
+
+    name = "hashing-v1"
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in zip(out, texts):
+            for token in tokenize(text):
+                index, sign = _bucket(token, self.dim)
+                row[index] += sign
+                padded = f"#{token}#"
+                for i in range(len(padded) - 2):
+                    index, sign = _bucket(padded[i:i + 3], self.dim)
+                    row[index] += sign * self.trigram_weight
+        return _normalize(out)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _modified(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def chunk_text(text: str, max_words: int = 80, overlap: int = 20) -> List[str]:
+    """
+    Splits long text into overlapping word windows so one embedding never has
+    to summarize a whole page.
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return [" ".join(words)] if words else []
+    step = max_words - overlap
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words) - overlap, step)]
+
+
+class VectorStore:
+    """
+    Append-only dense vector store with cosine top-k search.
+
+    Vectors live in a float32 memory-mapped file that grows by doubling its
+    capacity, so appends never rewrite existing rows and reopening the store
+    costs one mmap call. Row metadata is kept in a JSONL sidecar, one line per
+    row. Small stores are scanned exactly; once the store reaches
+    `ivf_min_rows`, an inverted-file index (spherical k-means centroids over a
+    sample) restricts each query to the `nprobe` closest clusters, which keeps
+    single-core latency in the low milliseconds at hundreds of thousands of rows.
+
+    A `read_only` store maps the files of a store written by another process
+    (multi-worker deployments) and picks up appended rows with refresh().
+
+    Rows are never rewritten; a source document that changed is stored again
+    under a new key with the same record "doc" field, and the newer row
+    supersedes the older one (which searches skip). A stored key equal to the
+    "doc" value is superseded too, for rows written before a source had
+    revisions.
+    """
+
+    MIN_CAPACITY = 1024
+    TRAIN_SAMPLE = 20000
+    KMEANS_ITERATIONS = 8
+    # Retrain the coarse index once the store has grown this many times over
+    RETRAIN_GROWTH = 4
+
+    def __init__(
+        self,
+        directory: str,
+        embedder: Optional[Embedder] = None,
+        ivf_min_rows: int = 50000,
+        read_only: bool = False,
+    ):
+        self.directory = directory
+        self.embedder: Embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.ivf_min_rows = ivf_min_rows
+        self.read_only = read_only
+
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._meta_path = os.path.join(directory, "meta.jsonl")
+        self._info_path = os.path.join(directory, "store.json")
+        self._ivf_path = os.path.join(directory, "ivf.npz")
+
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._count = 0
+        self._records: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+        self._source_codes = array("B")
+        self._sources: Dict[str, int] = {}
+        # 1 while a row is the latest revision of its document
+        self._live = array("B")
+        self._latest: Dict[str, int] = {}
+        self._superseded = 0
+        self._meta_offset = 0
+        self._ivf_modified: Optional[int] = None
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[array] = []
+        self._assigned = 0
+        self._trained_rows = 0
+        self._searches = 0
+        self._scanned_rows = 0
+
+        self._open()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    # --- Persistence ---
+
+    def _open(self) -> None:
+        info = {"dim": self.dim, "embedder": self.embedder.name}
+        if self.read_only:
+            if os.path.exists(self._info_path):
+                with open(self._info_path, encoding="utf-8") as f:
+                    if json.load(f) != info:
+                        raise ValueError(f"Vector store at {self.directory} was built with another embedder")
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            if os.path.exists(self._info_path):
+                with open(self._info_path, encoding="utf-8") as f:
+                    if json.load(f) != info:
+                        logger.warning(f"Vector store at {self.directory} was built with another embedder, resetting.")
+                        self._reset_files()
+            with open(self._info_path, "w", encoding="utf-8") as f:
+                json.dump(info, f)
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn last line after a crash; later rows are ignored
+                    if self.read_only and not line.endswith("\n"):
+                        break  # the writer is appending this line right now
+                    self._meta_offset += len(line.encode("utf-8"))
+                    self._register(record)
+
+        if os.path.exists(self._vectors_path):
+            self._capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        if self._capacity < len(self._records) and self.read_only:
+            raise ValueError(f"Vector store at {self.directory} has fewer vectors than metadata rows")
+        if self._capacity < len(self._records):
+            logger.warning(f"Vector store at {self.directory} is inconsistent, resetting.")
+            self._reset_files()
+            self._records, self._keys, self._source_codes, self._sources = [], {}, array("B"), {}
+            self._live, self._latest, self._superseded = array("B"), {}, 0
+            self._capacity = 0
+
+        self._count = len(self._records)
+        if self._capacity:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r" if self.read_only else "r+",
+                shape=(self._capacity, self.dim),
+            )
+        # Rewrite the sidecar if a torn line was dropped
+        if not self.read_only:
+            self._rewrite_meta_if_needed()
+        self._load_ivf()
+
+    def refresh(self) -> int:
+        """
+        Read-only stores: picks up the rows (and any retrained coarse index)
+        the writing process stored since the last call. Only complete
+        metadata lines are read; their vectors were written before them.
+
+        Returns:
+            Number of new rows.
+        """
+        try:
+            with open(self._meta_path, "rb") as f:
+                f.seek(self._meta_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        data = data[:data.rfind(b"\n") + 1]
+        records = [json.loads(line) for line in data.splitlines()]
+        ivf_modified = _modified(self._ivf_path)
+        if not records and ivf_modified == self._ivf_modified:
+            return 0
+
+        capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        with self._lock:
+            if capacity > self._capacity:
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(capacity, self.dim))
+                self._capacity = capacity
+            for record in records:
+                self._register(record)
+            self._meta_offset += len(data)
+            self._count = len(self._records)
+            if ivf_modified != self._ivf_modified:
+                self._load_ivf()
+            self._assign_pending()
+        return len(records)
+
+    def _reset_files(self) -> None:
+        for path in (self._vectors_path, self._meta_path, self._ivf_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _rewrite_meta_if_needed(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "rb") as f:
+            lines = sum(1 for _ in f)
+        if lines != self._count:
+            tmp_path = f"{self._meta_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self._records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self._meta_path)
+
+    def _load_ivf(self) -> None:
+        self._ivf_modified = _modified(self._ivf_path)
+        if self._ivf_modified is None:
+            return
+        try:
+            with np.load(self._ivf_path) as data:
+                centroids = data["centroids"]
+                assignments = data["assignments"][:self._count]
+                trained_rows = int(data["trained_rows"])
+        except Exception as e:
+            logger.warning(f"Could not load vector store IVF index, it will be retrained: {e}")
+            return
+        self._install_ivf(centroids, assignments, trained_rows)
+        self._assign_pending()
+
+    def flush(self) -> None:
+        """
+        Flushes vectors to disk and persists the coarse index. Vectors are
+        written before the JSONL sidecar on append, so a crash between the two
+        only loses rows that were never acknowledged.
+        """
+        if self.read_only:
+            return
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+            if self._centroids is None:
+                return
+            assignments = np.empty(self._assigned, dtype=np.uint16)
+            for cluster, rows in enumerate(self._lists):
+                assignments[np.frombuffer(rows, dtype=np.uint32)] = cluster
+            centroids, trained_rows = self._centroids, self._trained_rows
+
+        tmp_path = f"{self._ivf_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, centroids=centroids, assignments=assignments, trained_rows=np.int64(trained_rows))
+        os.replace(tmp_path, self._ivf_path)
+
+    # --- Writes ---
+
+    def _register(self, record: Dict[str, Any]) -> None:
+        source = record.get("source", "")
+        code = self._sources.setdefault(source, len(self._sources))
+        row = len(self._records)
+        doc = record.get("doc")
+        if doc:
+            previous = self._latest.get(doc, self._keys.get(doc))
+            if previous is not None and self._live[previous]:
+                self._live[previous] = 0
+                self._superseded += 1
+            self._latest[doc] = row
+        self._keys[record["key"]] = row
+        self._records.append(record)
+        self._source_codes.append(code)
+        self._live.append(1)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self._capacity:
+            return
+        capacity = max(self.MIN_CAPACITY, self._capacity * 2, rows)
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        # Searches still holding the old mapping keep a valid (smaller) view
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def add_many(self, items: Sequence[Tuple[str, str, Dict[str, Any]]]) -> int:
+        """
+        Embeds and appends new rows. Safe to call from a worker thread while
+        searches run.
+
+        Args:
+            items: (key, text to embed, record) triples. The record is returned
+                with search hits; its "source" field can be used as a filter.
+
+        Returns:
+            Number of rows appended (already stored keys are skipped).
+
+        Raises:
+            ValueError: If the store is read-only.
+        """
+        if self.read_only:
+            raise ValueError(f"Vector store at {self.directory} is read-only")
+        seen = set()
+        fresh = []
+        for key, text, record in items:
+            if key not in self._keys and key not in seen and text.strip():
+                seen.add(key)
+                fresh.append((key, text, record))
+        if not fresh:
+            return 0
+
+        vectors = self.embedder([text for _, text, _ in fresh])
+        with self._lock:
+            start = self._count
+            end = start + len(fresh)
+            self._ensure_capacity(end)
+            self._matrix[start:end] = vectors
+
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                for key, _, record in fresh:
+                    record = {**record, "key": key}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    self._register(record)
+
+            # Publish the rows only after vectors and metadata are in place
+            self._count = end
+            self._assign_pending()
+
+        if self._needs_training():
+            self._train()
+        return len(fresh)
+
+    # --- Coarse (IVF) index ---
+
+    def _needs_training(self) -> bool:
+        if self._count < self.ivf_min_rows:
+            return False
+        return self._centroids is None or self._count >= self._trained_rows * self.RETRAIN_GROWTH
+
+    def _install_ivf(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int) -> None:
+        order = np.argsort(assignments, kind="stable").astype(np.uint32)
+        bounds = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        self._lists = [array("I", order[bounds[i]:bounds[i + 1]].tobytes()) for i in range(len(centroids))]
+        self._centroids = centroids
+        self._assigned = len(assignments)
+        self._trained_rows = trained_rows
+
+    def _assign_pending(self) -> None:
+        """Puts rows appended since the last assignment into their nearest cluster."""
+        if self._centroids is None or self._assigned >= self._count:
+            return
+        start, end = self._assigned, self._count
+        clusters = np.argmax(np.asarray(self._matrix[start:end]) @ self._centroids.T, axis=1)
+        for row, cluster in enumerate(clusters, start):
+            self._lists[cluster].append(row)
+        self._assigned = end
+
+    def _train(self) -> None:
+        """
+        Spherical k-means on a sample, then assignment of every row. Runs
+        outside the lock; rows appended meanwhile are assigned on install.
+        """
+        n = self._count
+        matrix = self._matrix
+        rng = np.random.default_rng(0)
+        n_clusters = int(min(1024, max(64, math.sqrt(n)), n))
+
+        sample_rows = np.sort(rng.choice(n, min(n, self.TRAIN_SAMPLE), replace=False))
+        sample = np.asarray(matrix[sample_rows])
+        centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            filled, starts = np.unique(labels[order], return_index=True)
+            centroids[filled] = _normalize(np.add.reduceat(sample[order], starts, axis=0))
+
+        assignments = np.empty(n, dtype=np.uint16)
+        for start in range(0, n, 65536):
+            end = min(n, start + 65536)
+            assignments[start:end] = np.argmax(np.asarray(matrix[start:end]) @ centroids.T, axis=1)
+
+        with self._lock:
+            self._install_ivf(centroids, assignments, n)
+            self._assign_pending()
+        logger.info(f"Trained vector store IVF index: {n_clusters} clusters over {n} rows.")
+
+    # --- Search ---
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        sources: Optional[Sequence[str]] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Returns up to k (cosine similarity, record) pairs, best first.
+        """
+        return self.search_many([query], k, sources, min_score, nprobe)[0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        k: int = 5,
+        sources: Optional[Sequence[str]] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+    ) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        """
+        Batched search: all queries are embedded together and scored with one
+        matrix product per candidate set.
+
+        Args:
+            queries: Query texts.
+            k: Hits per query.
+            sources: Only return rows whose record "source" is in this list.
+            min_score: Drop hits below this cosine similarity.
+            nprobe: Clusters visited per query when the IVF index is active
+                (default: 1/16 of the clusters, at least 8).
+        """
+        if not queries:
+            return []
+        if not self._count or k <= 0:
+            return [[] for _ in queries]
+
+        q = self.embedder(list(queries))
+        with self._lock:
+            n, matrix, centroids = self._count, self._matrix, self._centroids
+            codes = np.frombuffer(self._source_codes, dtype=np.uint8)[:n].copy()
+            live = np.frombuffer(self._live, dtype=np.uint8)[:n].astype(bool) if self._superseded else None
+            wanted = None
+            if sources is not None:
+                wanted = np.array([self._sources[s] for s in sources if s in self._sources], dtype=np.uint8)
+            if centroids is None:
+                candidates = [None] * len(queries)
+            else:
+                probes = nprobe or max(8, len(centroids) // 16)
+                nearest = np.argsort(-(q @ centroids.T), axis=1)[:, :probes]
+                candidates = [
+                    np.sort(np.concatenate([np.frombuffer(self._lists[c], dtype=np.uint32) for c in row]))
+                    for row in nearest
+                ]
+
+        if wanted is not None and not len(wanted):
+            return [[] for _ in queries]
+
+        if candidates[0] is None:
+            # Exact scan: one (n, dim) x (dim, m) product for the whole batch
+            scores = np.asarray(matrix[:n]) @ q.T
+            results = [self._top_k(scores[:, i], None, codes, wanted, live, k, min_score) for i in range(len(queries))]
+            self._scanned_rows += n * len(queries)
+        else:
+            results = []
+            for query_vector, rows in zip(q, candidates):
+                # Rows are sorted, so the gather walks the mapping front to back
+                scores = np.take(matrix.view(np.ndarray), rows, axis=0) @ query_vector
+                results.append(self._top_k(scores, rows, codes, wanted, live, k, min_score))
+                self._scanned_rows += len(rows)
+
+        self._searches += len(queries)
+        return results
+
+    def _top_k(self, scores, rows, codes, wanted, live, k, min_score) -> List[Tuple[float, Dict[str, Any]]]:
+        row_ids = rows if rows is not None else np.arange(len(scores))
+        if live is not None:
+            keep = live[row_ids]
+            scores, row_ids = scores[keep], row_ids[keep]
+        if wanted is not None:
+            keep = np.isin(codes[row_ids], wanted)
+            scores, row_ids = scores[keep], row_ids[keep]
+        if len(scores) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            scores, row_ids = scores[top], row_ids[top]
+        order = np.argsort(-scores, kind="stable")
+        return [
+            (float(scores[i]), self._records[int(row_ids[i])])
+            for i in order
+            if scores[i] >= min_score
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "rows": self._count,
+            "superseded_rows": self._superseded,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "embedder": self.embedder.name,
+            "ivf_clusters": 0 if self._centroids is None else len(self._centroids),
+            "searches": self._searches,
+            "avg_rows_scanned": round(self._scanned_rows / self._searches, 1) if self._searches else 0.0,
+        }
@@ -0,0 +1,33 @@
+# backend/app/utils/html.py
+
+# Elements that start a new line in the rendered message
+_BLOCK_TAGS = ["p", "div", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote"]
+
+
+def msg_html_to_text(content_html: str) -> str:
+    """
+    Converts Teams/Graph message HTML to plain text.
+
+    Same approach as the archived Graph client, but line breaks are only kept
+    for <br> and block elements, so inline markup (<b>, <a>, mentions) does
+    not split sentences.
+
+    Args:
+        content_html: Message body as returned by Microsoft Graph.
+
+    Returns:
+        Plain text ('' for empty input; the raw input if parsing fails).
+    """
+    # Only the Teams ingestion worker needs bs4; keep it out of startup
+    from bs4 import BeautifulSoup
+
+    try:
+        soup = BeautifulSoup(content_html or '', 'html.parser')
+        for br in soup.find_all("br"):
+            br.replace_with("\n")
+        for block in soup.find_all(_BLOCK_TAGS):
+            block.append("\n")
+        lines = (" ".join(line.split()) for line in soup.get_text().splitlines())
+        return "\n".join(line for line in lines if line)
+    except Exception:
+        return content_html or ''
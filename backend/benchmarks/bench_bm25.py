@@ -0,0 +1,90 @@
+"""
+BM25 Announcement Index Benchmark
+Builds a synthetic announcement corpus and measures incremental indexing,
+top-k query latency and save/load time of app.retrieval.bm25.BM25Index.
+
+Usage (from backend/):
+    python benchmarks/bench_bm25.py [--docs 50000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app.retrieval.bm25 import BM25Index
+
+TOPICS = [
+    "staj başvurusu", "bütünleme sınavı", "final programı", "vize sınavları",
+    "ders kaydı", "danışman onayı", "burs başvuruları", "seminer duyurusu",
+    "laboratuvar iptal", "mezuniyet töreni", "erasmus başvuruları", "proje teslimi",
+]
+FILLER = (
+    "öğrencilerimizin dikkatine bölüm başkanlığı tarafından yapılan açıklamaya göre "
+    "ilgili belgeler sistem üzerinden yüklenmelidir tarih saat salon bilgisayar "
+    "mühendisliği fakülte dekanlık akademik takvim güz bahar dönemi"
+).split()
+
+
+def make_doc(rng, i):
+    topic = rng.choice(TOPICS)
+    words = rng.sample(FILLER, 12) + [f"kod{rng.randint(0, 5000)}"]
+    return f"{topic} {i}", f"{topic} hakkında: {' '.join(words)}"
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    index = BM25Index()
+
+    start = time.perf_counter()
+    for i in range(args.docs):
+        title, content = make_doc(rng, i)
+        index.add(f"doc:{i}", f"{title}\n{content}", {"title": title})
+    build = time.perf_counter() - start
+
+    queries = [rng.choice(["staj ne zaman", "bütünleme tarihleri", "erasmus", "final programı açıklandı mı",
+                           "lab iptal mi", f"kod{rng.randint(0, 5000)}"]) for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        t0 = time.perf_counter()
+        index.search(query, args.k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bm25.npz")
+        t0 = time.perf_counter()
+        index.save(path)
+        save_time = time.perf_counter() - t0
+        size = os.path.getsize(path)
+        t0 = time.perf_counter()
+        loaded, _ = BM25Index.load(path)
+        load_time = time.perf_counter() - t0
+        assert loaded.search(queries[0], args.k) == index.search(queries[0], args.k)
+
+    print(f"documents: {len(index)}, terms: {index.vocabulary_size}")
+    print(f"incremental add: {build / args.docs * 1e6:.1f} us/doc ({build:.2f} s total)")
+    print(f"search top-{args.k}: p50 {percentile(latencies, 0.5):.3f} ms, "
+          f"p95 {percentile(latencies, 0.95):.3f} ms, p99 {percentile(latencies, 0.99):.3f} ms")
+    print(f"save: {save_time * 1000:.0f} ms, load: {load_time * 1000:.0f} ms, file: {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Intent Classifier Micro-Benchmark
+Compares the per-message cost of the precompiled IntentIndex against the
+previous thefuzz implementation (two process.extractOne scans per message).
+
+Usage (from backend/):
+    python benchmarks/bench_intent.py [--keywords 300] [--messages 2000]
+
+Requires `thefuzz` only for the legacy baseline.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from thefuzz import process
+
+from app.llm_engine.classifier import (
+    ANNOUNCEMENT_KEYWORDS,
+    DINING_KEYWORDS,
+    INTENT_KEYWORDS,
+)
+from app.llm_engine.intent_index import IntentIndex
+
+SAMPLE_MESSAGES = [
+    "Yemekte bugün ne var?",
+    "yarın menüde ne var",
+    "acıktım ya",
+    "ACIKTIM",
+    "karnım çok aç",
+    "staj başvurusu ne zaman",
+    "bütünleme sınavı tarihi",
+    "hoca dersi iptal etti mi",
+    "ders programı açıklandı mı",
+    "son duyurular neler",
+    "merhaba nasılsın",
+    "bilgisayar mühendisliği hakkında bilgi ver",
+    "algoda geçen hafta yoklama alındı mı?",
+    "Opsys'te en son nereye kadar işlemiştik?",
+    "",
+]
+
+
+def legacy_decide_intent(message, dining_keywords, announcement_keywords):
+    """The thefuzz-based classifier this benchmark replaces."""
+    if not message:
+        return "general"
+    _, dining_score = process.extractOne(message, dining_keywords)
+    _, announcement_score = process.extractOne(message, announcement_keywords)
+    threshold = 80
+    if dining_score > threshold and dining_score >= announcement_score:
+        return "dining"
+    if announcement_score > threshold and announcement_score > dining_score:
+        return "announcement"
+    return "general"
+
+
+def synthetic_keywords(base, total, rng):
+    """Pads a keyword list with pseudo-words so scaling can be measured."""
+    letters = "abcçdefgğhıijklmnoöprsştuüvyz"
+    words = list(base)
+    while len(words) < total:
+        words.append("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return words
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=0,
+                        help="Pad each intent to this many keywords (0 = real keyword lists only)")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    messages = [rng.choice(SAMPLE_MESSAGES) for _ in range(args.messages)]
+
+    if args.keywords:
+        dining = synthetic_keywords(DINING_KEYWORDS, args.keywords, rng)
+        announcement = synthetic_keywords(ANNOUNCEMENT_KEYWORDS, args.keywords, rng)
+        index = IntentIndex({"dining": dining, "announcement": announcement})
+    else:
+        dining, announcement = DINING_KEYWORDS, ANNOUNCEMENT_KEYWORDS
+        index = IntentIndex(INTENT_KEYWORDS)
+
+    legacy_time, legacy = timed(
+        lambda: [legacy_decide_intent(m, dining, announcement) for m in messages], 1
+    )
+    single_time, single = timed(lambda: [index.classify(m) for m in messages], 1)
+    batch_time, batch = timed(lambda: index.classify_many(messages), 1)
+
+    n = len(messages)
+    print(f"messages: {n}, keywords per intent: {len(dining)}/{len(announcement)}")
+    print(f"{'implementation':<28}{'total ms':>12}{'us/message':>14}")
+    for name, elapsed in [
+        ("thefuzz extractOne x2", legacy_time),
+        ("IntentIndex.classify", single_time),
+        ("IntentIndex.classify_many", batch_time),
+    ]:
+        print(f"{name:<28}{elapsed * 1000:>12.2f}{elapsed / n * 1e6:>14.2f}")
+
+    agree = sum(a == b for a, b in zip(legacy, single)) / n
+    print(f"agreement with legacy: {agree:.1%}")
+    assert single == batch, "classify and classify_many disagree"
+    for message in SAMPLE_MESSAGES:
+        old = legacy_decide_intent(message, dining, announcement)
+        new = index.classify(message)
+        if old != new:
+            print(f"  differs: {message!r}: legacy={old} new={new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Cold Start Benchmark
+Measures what a scale-from-zero container pays before it can answer:
+- import time of `main` in a fresh interpreter,
+- the cost deferred to first use of the Gemini client (google-genai import
+  plus client construction; paid by warm-up or the first chat),
+- time from process start to the first successful /health and to the first
+  successful chat, with the fake Gemini and in-memory MongoDB of the load
+  test (benchmarks/fakes.py), so only the backend's own startup is measured.
+
+Each measurement is repeated --runs times in new processes and the median
+is reported. Results are saved as JSON (benchmarks/results/ by default) so
+cold start can be tracked across commits.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 5] [--output results/startup.json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import httpx
+
+from load_test import git_commit
+
+ENV = {
+    **os.environ,
+    "MONGO_CONNECTION_STRING": os.environ.get("MONGO_CONNECTION_STRING", "mongodb://in-memory"),
+    "MONGO_DB_NAME": os.environ.get("MONGO_DB_NAME", "startup"),
+    "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "fake"),
+}
+
+IMPORT_MAIN = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+IMPORT_GENAI = (
+    "import time; t = time.perf_counter(); from google import genai; "
+    "genai.Client(api_key='fake'); print(time.perf_counter() - t)"
+)
+
+
+def timed_python(code: str) -> float:
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=parent_dir, env=ENV, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_start(timeout: float = 60.0) -> dict:
+    """
+    Starts the load-test server (fake Gemini with no latency) and polls it.
+
+    Returns:
+        Seconds from spawn to first /health 200 and to first chat 200, plus
+        the /warmup step timings.
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, os.path.join(current_dir, "load_test.py"), "--serve", "--port", str(port),
+        "--llm-latency-ms", "0", "--llm-jitter-ms", "0", "--llm-failure-rate", "0", "--mongo-latency-ms", "0",
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=parent_dir, env=ENV)
+    result = {}
+    try:
+        with httpx.Client(base_url=base_url, timeout=5) as client:
+            deadline = started + timeout
+            while "health_s" not in result:
+                if time.perf_counter() > deadline or process.poll() is not None:
+                    raise RuntimeError("Server did not become healthy")
+                try:
+                    if client.get("/health").status_code == 200:
+                        result["health_s"] = time.perf_counter() - started
+                except httpx.HTTPError:
+                    time.sleep(0.005)
+
+            response = client.post("/api/v1/chat/", json={"message": "bugün yemekte ne var"})
+            response.raise_for_status()
+            result["first_chat_s"] = time.perf_counter() - started
+            result["warmup_ms"] = client.get("/warmup").json()["timings_ms"]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="result JSON path (default: benchmarks/results/startup_<time>.json)")
+    args = parser.parse_args()
+
+    import_main = [timed_python(IMPORT_MAIN) for _ in range(args.runs)]
+    import_genai = [timed_python(IMPORT_GENAI) for _ in range(args.runs)]
+    servers = [server_start() for _ in range(args.runs)]
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "runs": args.runs,
+        "import_main_ms": round(statistics.median(import_main) * 1000, 1),
+        "deferred_llm_client_ms": round(statistics.median(import_genai) * 1000, 1),
+        "time_to_health_ms": round(statistics.median(s["health_s"] for s in servers) * 1000, 1),
+        "time_to_first_chat_ms": round(statistics.median(s["first_chat_s"] for s in servers) * 1000, 1),
+        "warmup_ms": servers[-1]["warmup_ms"],
+    }
+    print(f"import main:            {report['import_main_ms']} ms")
+    print(f"deferred Gemini client: {report['deferred_llm_client_ms']} ms (paid by warm-up or the first chat)")
+    print(f"spawn -> /health 200:   {report['time_to_health_ms']} ms")
+    print(f"spawn -> first chat:    {report['time_to_first_chat_ms']} ms")
+    print(f"warm-up steps (ms):     {report['warmup_ms']}")
+
+    output = args.output or os.path.join(
+        current_dir, "results", f"startup_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+
+if __name__ == "__main__":
+    main()
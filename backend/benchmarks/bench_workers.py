@@ -0,0 +1,271 @@
+"""
+Multi-Worker Benchmark
+Compares chat throughput of one worker (single-process mode) with N
+workers sharing the refresher's context snapshot (`python main.py
+--workers N`), using the fake Gemini and in-memory MongoDB of the load
+test (benchmarks/fakes.py). Each process seeds an identical in-memory
+database, so only the backend's own CPU work is measured.
+
+Closed loop: --concurrency connections send chat requests back to back for
+--duration seconds, after a warm-up that fills each worker's response cache,
+so throughput is bounded by the server's CPU, not by the fake LLM. Reports
+requests/s, p50/p99 and the MongoDB operations per second summed over all
+server processes (workers and refresher), and saves the results as JSON
+(benchmarks/results/ by default).
+
+The speed-up is bounded by the cores left to the server: the load
+generator runs on the same machine.
+
+Usage (from backend/):
+    python benchmarks/bench_workers.py [--workers 4] [--duration 20] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import httpx
+
+from load_test import MESSAGES, HttpClient, git_commit, percentile
+
+# Server-side knobs, passed to the spawned workers through the environment
+FAKE_ENV = {
+    "MONGO_CONNECTION_STRING": "mongodb://in-memory",
+    "MONGO_DB_NAME": "workers",
+    "GEMINI_API_KEY": "fake",
+    "ADMISSION_ENABLED": "false",
+    "WARMUP_ON_STARTUP": "false",
+}
+
+
+# --- Server processes ---
+
+
+def _install_fakes() -> None:
+    from fakes import FakeGenAIClient, InMemoryMotorClient, seed_database
+    from app.core.config import settings
+    from app.db import mongo
+    from app.llm_engine import gemini_client
+
+    seed_database(InMemoryMotorClient()[settings.MONGO_DB_NAME], int(os.environ["BENCH_ANNOUNCEMENTS"]))
+    mongo.AsyncIOMotorClient = InMemoryMotorClient
+    gemini_client.client = FakeGenAIClient(latency_ms=float(os.environ["BENCH_LLM_LATENCY_MS"]), jitter_ms=0.0)
+
+
+def create_app():
+    """
+    uvicorn app factory for each worker: fakes first, then the real app plus
+    a route reporting this process's MongoDB operation count.
+    """
+    _install_fakes()
+    from fakes import InMemoryMotorClient
+    from main import app
+
+    @app.get("/_bench/mongo")
+    async def mongo_operations():
+        return {"pid": os.getpid(), "operations": InMemoryMotorClient.operations}
+
+    return app
+
+
+def run_refresher(ops_path: str) -> None:
+    """Refresher process with fakes; writes its operation count to `ops_path`."""
+    os.environ["SHARED_SNAPSHOT_READ"] = "false"
+    _install_fakes()
+    from fakes import InMemoryMotorClient
+    import refresher
+
+    async def main():
+        task = asyncio.create_task(refresher.run())
+        try:
+            while not task.done():
+                with open(ops_path, "w") as f:
+                    json.dump({"pid": os.getpid(), "operations": InMemoryMotorClient.operations}, f)
+                await asyncio.sleep(0.5)
+        finally:
+            task.cancel()
+
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def serve(args) -> None:
+    import uvicorn
+
+    data_dir = tempfile.mkdtemp(prefix="chatbot-workers-")
+    os.environ.update(FAKE_ENV)
+    os.environ["BENCH_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["BENCH_ANNOUNCEMENTS"] = str(args.announcements)
+    os.environ["VECTOR_STORE_DIR"] = os.path.join(data_dir, "vectors")
+    os.environ["ANNOUNCEMENT_INDEX_PATH"] = os.path.join(data_dir, "announcements_bm25.npz")
+    os.environ["SHARED_SNAPSHOT_PATH"] = os.path.join(data_dir, "context_snapshot.bin")
+
+    config = dict(host="127.0.0.1", port=args.port, log_level="critical", access_log=False, factory=True)
+    if args.serve_workers <= 1:
+        uvicorn.run("bench_workers:create_app", **config)
+        return
+
+    # Same layout as `main.py --workers N`
+    refresher = multiprocessing.get_context("spawn").Process(target=run_refresher, args=(args.ops_path,))
+    refresher.start()
+    os.environ["SHARED_SNAPSHOT_READ"] = "true"
+    try:
+        uvicorn.run("bench_workers:create_app", workers=args.serve_workers, app_dir=current_dir, **config)
+    finally:
+        refresher.terminate()
+        refresher.join()
+
+
+def start_server(args, workers: int, ops_path: str):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [
+        sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+        "--serve-workers", str(workers), "--ops-path", ops_path,
+        "--llm-latency-ms", str(args.llm_latency_ms), "--announcements", str(args.announcements),
+    ]
+    process = subprocess.Popen(command, cwd=current_dir)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, port
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 120 s")
+
+
+# --- Load generator ---
+
+
+def mongo_operations(port: int, workers: int, ops_path: str) -> int:
+    """
+    Sums the operation counters of all server processes. New connections
+    land on random workers, so sample until every worker has answered.
+    """
+    seen: Dict[int, int] = {}
+    for _ in range(workers * 50):
+        data = httpx.get(f"http://127.0.0.1:{port}/_bench/mongo", headers={"Connection": "close"}).json()
+        seen[data["pid"]] = data["operations"]
+        if len(seen) == workers:
+            break
+    total = sum(seen.values())
+    if os.path.exists(ops_path):
+        with open(ops_path) as f:
+            total += json.load(f)["operations"]
+    return total
+
+
+async def hammer(port: int, concurrency: int, duration: float, seed: int) -> List[float]:
+    messages = [m for pool in MESSAGES.values() for m in pool]
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def loop(index: int) -> None:
+        rng = random.Random(seed + index)
+        client = HttpClient("127.0.0.1", port)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                status, _ = await client.post("/api/v1/chat/", {"message": rng.choice(messages)})
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            client.close()
+
+    await asyncio.gather(*(loop(i) for i in range(concurrency)))
+    return latencies
+
+
+def measure(args, workers: int) -> dict:
+    ops_path = os.path.join(tempfile.mkdtemp(prefix="chatbot-workers-ops-"), "refresher.json")
+    process, port = start_server(args, workers, ops_path)
+    try:
+        # Fill every worker's response cache and let the refresher publish
+        asyncio.run(hammer(port, args.concurrency, args.warmup, args.seed))
+        operations_before = mongo_operations(port, workers, ops_path)
+        started = time.perf_counter()
+        latencies = asyncio.run(hammer(port, args.concurrency, args.duration, args.seed))
+        elapsed = time.perf_counter() - started
+        operations = mongo_operations(port, workers, ops_path) - operations_before
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mongo_ops_per_s": round(operations / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="N of the 1 vs N comparison")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--announcements", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="result JSON path (default: benchmarks/results/workers_<time>.json)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serve-workers", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--ops-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    runs = [measure(args, 1), measure(args, args.workers)]
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mongo ops/s':>12}")
+    for run in runs:
+        print(f"{run['workers']:>7} {run['rps']:>9} {run['p50_ms']:>8} {run['p99_ms']:>8} {run['mongo_ops_per_s']:>12}")
+    print(f"speed-up: {runs[1]['rps'] / runs[0]['rps']:.2f}x on {os.cpu_count()} cores")
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "cpu_count": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if not k.startswith("serve") and k not in ("port", "ops_path")},
+        "runs": runs,
+    }
+    output = args.output or os.path.join(
+        current_dir, "results", f"workers_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Offline stand-ins used by the load test (benchmarks/load_test.py).
+
+- InMemoryMotorClient: the subset of the Motor API the backend uses
+  (find/find_one with sort/limit/projection, insert_many, update_one,
+  create_index, ping), backed by dicts, with an optional per-operation
+  latency to mimic a local MongoDB. Change streams raise OperationFailure
+  like a standalone server, so the push hub polls.
+- FakeGenAIClient: replaces google.genai.Client with deterministic
+  replies, a configurable latency distribution and failure rate.
+- seed_database(): menus, chat context and announcements for the traffic mix.
+
+Nothing here is imported by the application itself.
+"""
+
+import asyncio
+import copy
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+# --- MongoDB ---
+
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if op == "$exists":
+        return (value is not None) == bool(operand)
+    if op == "$in":
+        return value in operand
+    if op == "$ne":
+        return value != operand
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise NotImplementedError(f"Unsupported query operator {op}")
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+            continue
+        value = _get(doc, key)
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.copy(doc)
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        result = {k: doc[k] for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+
+def _sort_key(value: Any):
+    # Missing fields sort first, like MongoDB's null ordering
+    return (value is not None, value if value is not None else 0)
+
+
+class InsertManyResult(SimpleNamespace):
+    pass
+
+
+class InMemoryCursor:
+    def __init__(self, collection: "InMemoryCollection", query, projection):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List = []
+        self._limit = 0
+
+    def sort(self, key_or_list, direction: int = 1) -> "InMemoryCursor":
+        self._sort = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def limit(self, limit: int) -> "InMemoryCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, size: int) -> "InMemoryCursor":
+        return self
+
+    async def _results(self) -> List[Dict[str, Any]]:
+        await self._collection.client.delay()
+        docs = [doc for doc in self._collection.docs.values() if matches(doc, self._query)]
+        for key, direction in reversed(self._sort):
+            docs.sort(key=lambda doc: _sort_key(_get(doc, key)), reverse=direction < 0)
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        docs = await self._results()
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self._results():
+            yield doc
+
+
+class InMemoryCollection:
+    def __init__(self, client: "InMemoryMotorClient", name: str):
+        self.client = client
+        self.name = name
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> InMemoryCursor:
+        return InMemoryCursor(self, query, projection)
+
+    async def find_one(self, query=None, projection=None, sort=None) -> Optional[Dict[str, Any]]:
+        cursor = self.find(query, projection)
+        if sort:
+            cursor.sort(sort)
+        docs = await cursor.limit(1).to_list(1)
+        return docs[0] if docs else None
+
+    async def insert_one(self, document: Dict[str, Any]):
+        result = await self.insert_many([document])
+        return SimpleNamespace(inserted_id=result.inserted_ids[0])
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True) -> InsertManyResult:
+        await self.client.delay()
+        ids = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            self.docs[document["_id"]] = copy.copy(document)
+            ids.append(document["_id"])
+        return InsertManyResult(inserted_ids=ids)
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        await self.client.delay()
+        doc = next((d for d in self.docs.values() if matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0, modified_count=0)
+            doc = {k: v for k, v in query.items() if not k.startswith("$")}
+            doc.setdefault("_id", ObjectId())
+            self.docs[doc["_id"]] = doc
+        doc.update(update.get("$set", {}))
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        return SimpleNamespace(matched_count=1, modified_count=1)
+
+    async def create_index(self, keys, **options) -> str:
+        return options.get("name") or "_".join(f"{k}_{d}" for k, d in keys)
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+
+class InMemoryDatabase:
+    def __init__(self, client: "InMemoryMotorClient"):
+        self.client = client
+        self._collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(self.client, name)
+        return self._collections[name]
+
+    async def command(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+        return {"ok": 1.0}
+
+
+class InMemoryMotorClient:
+    """
+    Drop-in for AsyncIOMotorClient; all clients share one in-memory server,
+    so data seeded before the app connects is visible to it.
+    """
+
+    databases: Dict[str, InMemoryDatabase] = {}
+    latency_seconds = 0.0
+    # Reads and writes served, i.e. the load a real server would see
+    operations = 0
+
+    def __init__(self, *args, **kwargs):
+        self.admin = InMemoryDatabase(self)
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self.databases:
+            self.databases[name] = InMemoryDatabase(self)
+        return self.databases[name]
+
+    async def delay(self) -> None:
+        InMemoryMotorClient.operations += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    def close(self) -> None:
+        pass
+
+
+# --- Gemini ---
+
+
+class FakeGenAIClient:
+    """
+    Replaces google.genai.Client. Latency is drawn from a seeded normal
+    distribution (clamped at 0); `failure_rate` of the calls raise.
+    """
+
+    def __init__(self, latency_ms: float = 400.0, jitter_ms: float = 150.0, failure_rate: float = 0.0,
+                 seed: int = 7, stream_chunks: int = 8):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.stream_chunks = stream_chunks
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.aio = SimpleNamespace(models=SimpleNamespace(
+            generate_content=self._generate_content,
+            generate_content_stream=self._generate_content_stream,
+        ))
+
+    def _draw(self) -> float:
+        self.calls += 1
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError("fake Gemini failure")
+        return max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    @staticmethod
+    def _reply(contents: str) -> str:
+        query = contents.rsplit("User query:\n", 1)[-1].strip()
+        return f"Sorunuz: '{query[:80]}'. Bu, yük testi için üretilmiş sabit bir yanıttır."
+
+    async def _generate_content(self, model: str, contents: str):
+        delay = self._draw()
+        await asyncio.sleep(delay)
+        return SimpleNamespace(text=self._reply(contents))
+
+    async def _generate_content_stream(self, model: str, contents: str):
+        delay = self._draw()
+        words = self._reply(contents).split(" ")
+        size = max(1, len(words) // self.stream_chunks)
+
+        async def chunks():
+            # Time to first token is a third of the call, the rest is spread over chunks
+            await asyncio.sleep(delay / 3)
+            parts = [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+            for part in parts:
+                await asyncio.sleep(delay * 2 / 3 / len(parts))
+                yield SimpleNamespace(text=part)
+        return chunks()
+
+
+# --- Seed data ---
+
+ANNOUNCEMENT_TOPICS = [
+    "Staj başvuruları", "Bütünleme sınav programı", "Final sınav takvimi", "Algoritma dersi telafi",
+    "İşletim sistemleri proje teslimi", "Erasmus başvuruları", "Ders kayıt haftası",
+    "Laboratuvar dersi iptal", "Mezuniyet töreni", "Burs başvuru sonuçları",
+]
+MENU_ITEMS = ["Mercimek Çorbası", "Ezogelin Çorbası", "Tavuk Sote", "Kuru Fasulye", "Pilav", "Makarna",
+              "Cacık", "Sütlaç", "Mevsim Salata", "Karnıyarık"]
+
+
+def seed_database(database, announcements: int = 2000, seed: int = 7) -> None:
+    """
+    Fills an InMemoryDatabase with this week's menus, the chat context
+    documents the pipeline would write and `announcements` announcements.
+    """
+    # Imported here so the module stays importable before PATH SETUP
+    from app.db.collections import (
+        ANNOUNCEMENTS_DIGEST_ID,
+        CHAT_CONTEXT_COLLECTION,
+        CONTEXT_VERSION_ID,
+        DINING_COLLECTION,
+        PIPELINE_ANNOUNCEMENTS_COLLECTION,
+        dining_context_id,
+    )
+
+    rng = random.Random(seed)
+    today = date.today()
+    for offset in range(-1, 7):
+        day = (today + timedelta(days=offset)).strftime("%Y-%m-%d")
+        items = rng.sample(MENU_ITEMS, 4)
+        database[DINING_COLLECTION].docs[ObjectId()] = {"date": day, "items": items}
+        doc_id = dining_context_id(day)
+        database[CHAT_CONTEXT_COLLECTION].docs[doc_id] = {
+            "_id": doc_id, "text": f"Menu for {day}:\n" + "\n".join(f"- {item}" for item in items),
+        }
+
+    now = datetime.utcnow()
+    collection = database[PIPELINE_ANNOUNCEMENTS_COLLECTION]
+    for i in range(announcements):
+        topic = rng.choice(ANNOUNCEMENT_TOPICS)
+        created_at = now - timedelta(minutes=10 * (announcements - i))
+        doc_id = ObjectId()
+        collection.docs[doc_id] = {
+            "_id": doc_id,
+            "source_type": "website",
+            "title": f"{topic} hakkında duyuru #{i}",
+            "content": f"{topic} ile ilgili ayrıntılar bölüm sayfasında yayınlanmıştır. Duyuru no {i}.",
+            "link": f"https://cse.akdeniz.edu.tr/duyuru/{i}",
+            "created_at": created_at,
+            "scraped_at": created_at,
+        }
+
+    latest = sorted(collection.docs.values(), key=lambda d: d["created_at"])[-3:]
+    database[CHAT_CONTEXT_COLLECTION].docs[ANNOUNCEMENTS_DIGEST_ID] = {
+        "_id": ANNOUNCEMENTS_DIGEST_ID,
+        "text": "Recent Announcements:\n" + "\n".join(f"{i + 1}. {d['title']}" for i, d in enumerate(reversed(latest))),
+    }
+    database[CHAT_CONTEXT_COLLECTION].docs[CONTEXT_VERSION_ID] = {"_id": CONTEXT_VERSION_ID, "version": 1}
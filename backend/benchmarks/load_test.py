@@ -0,0 +1,452 @@
+"""
+Chat Backend Load Test
+Starts main.py under uvicorn in a child process with a deterministic fake
+Gemini and an in-memory MongoDB stand-in (benchmarks/fakes.py), then drives
+open-loop mixed traffic against it over localhost: Poisson arrivals at
+--rate requests/s, multiplied by --burst-factor for --burst-seconds every
+--burst-every seconds (e.g. the minutes before lunch or after a class).
+
+Latency is measured from each request's scheduled start, so a server that
+falls behind shows up in the tail instead of slowing the load generator
+down. Reports requests/s and p50/p95/p99 per intent and saves everything
+as JSON (benchmarks/results/ by default); pass --compare with an earlier
+result to print the differences. Needs no network and no Gemini key.
+
+Usage (from backend/):
+    python benchmarks/load_test.py [--duration 30] [--rate 100] [--llm-latency-ms 400]
+        [--mix dining=0.4,announcement=0.35,general=0.25] [--compare results/old.json]
+
+Server settings (LLM_MAX_CONCURRENCY, RESPONSE_CACHE_TTL_SECONDS, ...) are
+read from the environment as usual. The load generator is a single Python
+process sharing the machine with the server; compare runs from the same host.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# --- PATH SETUP ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import httpx
+
+MESSAGES: Dict[str, List[str]] = {
+    "dining": [
+        "Bugün yemekte ne var?", "yemekhane menüsü", "bugünkü çorba ne", "yarın menüde ne var",
+        "acıktım, yemek ne", "öğle yemeği menü",
+    ],
+    "announcement": [
+        "staj başvurusu ne zaman", "bütünleme sınavı tarihi", "hoca dersi iptal etti mi",
+        "final programı açıklandı mı", "erasmus duyurusu var mı", "ders kaydı ne zaman",
+    ],
+    "general": [
+        "merhaba", "bilgisayar mühendisliği hakkında bilgi ver", "kütüphane kaçta kapanıyor",
+        "yapay zeka nedir", "nasılsın", "kampüste wifi şifresi",
+    ],
+}
+FOLLOW_UPS = ["peki yarın?", "ya cuma?", "başka?"]
+# ChatResponse.source of no-LLM answers (app.llm_engine.fast_path) -> the
+# intent they were routed by; FAQ answers may come from any intent
+FAST_PATH_INTENTS: Dict[str, Optional[str]] = {
+    "dining_template": "dining",
+    "announcement_template": "announcement",
+    "faq": None,
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        intent, _, weight = part.partition("=")
+        if intent.strip() not in MESSAGES:
+            raise argparse.ArgumentTypeError(f"Unknown intent '{intent}' (expected {', '.join(MESSAGES)})")
+        mix[intent.strip()] = float(weight)
+    total = sum(mix.values())
+    return {intent: weight / total for intent, weight in mix.items()}
+
+
+def build_schedule(args) -> List[Tuple[float, str, dict, bool]]:
+    """
+    Deterministic arrivals for the whole run.
+
+    Returns:
+        (offset seconds, intent, request body, streaming) per request.
+    """
+    rng = random.Random(args.seed)
+    intents, weights = zip(*args.mix.items())
+    schedule = []
+    t = 0.0
+    while True:
+        in_burst = args.burst_every > 0 and (t % args.burst_every) < args.burst_seconds
+        t += rng.expovariate(args.rate * (args.burst_factor if in_burst else 1))
+        if t >= args.duration:
+            return schedule
+
+        intent = rng.choices(intents, weights)[0]
+        message = rng.choice(MESSAGES[intent])
+        if rng.random() < args.unique_ratio:
+            # Rephrased questions miss the response cache
+            message = f"{message} {rng.choice(['lütfen', 'acaba', 'hocam', 'ya'])} #{len(schedule)}"
+        body = {"message": message}
+        if rng.random() < args.user_ratio:
+            body["user_id"] = f"user-{rng.randrange(args.users)}"
+            if rng.random() < 0.2:
+                body["message"] = rng.choice(FOLLOW_UPS)
+        schedule.append((t, intent, body, rng.random() < args.stream_ratio))
+
+
+# --- Server process ---
+
+
+def serve(args) -> None:
+    data_dir = tempfile.mkdtemp(prefix="chatbot-loadtest-")
+    os.environ.setdefault("MONGO_CONNECTION_STRING", "mongodb://in-memory")
+    os.environ.setdefault("MONGO_DB_NAME", "loadtest")
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    os.environ["VECTOR_STORE_DIR"] = os.path.join(data_dir, "vectors")
+    os.environ["ANNOUNCEMENT_INDEX_PATH"] = os.path.join(data_dir, "announcements_bm25.npz")
+
+    import logging
+
+    import uvicorn
+
+    # Injected Gemini failures would otherwise log one error each
+    logging.basicConfig(level=args.server_log_level.upper())
+
+    from fakes import FakeGenAIClient, InMemoryMotorClient, seed_database
+    from app.core.config import settings
+    from app.db import mongo
+    from app.llm_engine import gemini_client
+
+    InMemoryMotorClient.latency_seconds = args.mongo_latency_ms / 1000
+    seed_database(InMemoryMotorClient()[settings.MONGO_DB_NAME], args.announcements, args.seed)
+    mongo.AsyncIOMotorClient = InMemoryMotorClient
+    gemini_client.client = FakeGenAIClient(
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        failure_rate=args.llm_failure_rate,
+        seed=args.seed,
+    )
+
+    from main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level=args.server_log_level, access_log=False)
+
+
+def start_server(args) -> Tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    command = [
+        sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+        "--seed", str(args.seed), "--announcements", str(args.announcements),
+        "--mongo-latency-ms", str(args.mongo_latency_ms), "--llm-latency-ms", str(args.llm_latency_ms),
+        "--llm-jitter-ms", str(args.llm_jitter_ms), "--llm-failure-rate", str(args.llm_failure_rate),
+        "--server-log-level", args.server_log_level,
+    ]
+    process = subprocess.Popen(command, cwd=parent_dir)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 60 s")
+
+
+# --- Load generator ---
+
+
+class HttpClient:
+    """
+    Minimal keep-alive HTTP/1.1 client for the load generator.
+
+    httpx's connection pool does O(open connections) work per request,
+    which at a few hundred concurrent requests costs more CPU than the
+    server under test; this keeps idle connections in a list and costs
+    O(1) per request.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def post(self, path: str, payload: dict, on_chunk: Optional[Callable[[bytes], None]] = None) -> Tuple[int, bytes]:
+        """
+        Sends a JSON POST and reads the whole response, passing each chunk
+        of a chunked (streaming) body to `on_chunk` as it arrives.
+
+        Returns:
+            (status, body)
+        """
+        body = json.dumps(payload).encode()
+        request = (
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        reader, writer = None, None
+        while self._idle:
+            reader, writer = self._idle.pop()
+            try:
+                writer.write(request)
+                status_line = await reader.readline()
+            except ConnectionError:
+                status_line = b""
+            if status_line:
+                break
+            # The server closed this idle connection (keep-alive timeout)
+            writer.close()
+            reader, writer = None, None
+        if writer is None:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(request)
+            status_line = await reader.readline()
+        try:
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip().lower()
+
+            if headers.get("transfer-encoding") == "chunked":
+                parts = []
+                while True:
+                    size = int((await reader.readline()).split(b";")[0], 16)
+                    chunk = await reader.readexactly(size + 2)
+                    if not size:
+                        break
+                    parts.append(chunk[:-2])
+                    if on_chunk:
+                        on_chunk(chunk[:-2])
+                data = b"".join(parts)
+            else:
+                data = await reader.readexactly(int(headers.get("content-length", 0)))
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection") == "close":
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status, data
+
+    def close(self) -> None:
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+async def send(client: HttpClient, body: dict, streaming: bool, scheduled: float) -> dict:
+    result = {"status": 0, "source": None, "ttft": None}
+
+    def on_chunk(chunk: bytes) -> None:
+        if result["ttft"] is None and b"event: token" in chunk:
+            result["ttft"] = time.perf_counter() - scheduled
+
+    try:
+        if streaming:
+            result["status"], data = await client.post("/api/v1/chat/stream", body, on_chunk)
+            event = None
+            for line in data.decode().splitlines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    if event == "error":
+                        result["status"] = 599
+                elif line.startswith("data: ") and event == "meta":
+                    result["source"] = json.loads(line[6:]).get("source")
+        else:
+            result["status"], data = await client.post("/api/v1/chat/", body)
+            if result["status"] == 200:
+                result["source"] = json.loads(data).get("source")
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+        result["error"] = type(e).__name__
+    result["latency"] = time.perf_counter() - scheduled
+    return result
+
+
+async def drive(base_url: str, schedule, max_in_flight: int) -> Tuple[List[Tuple[str, bool, dict]], float, int]:
+    host, port = base_url.rsplit("//", 1)[1].split(":")
+    client = HttpClient(host, int(port))
+    # (intent, is follow-up, result)
+    results: List[Tuple[str, bool, dict]] = []
+    dropped = 0
+    in_flight = set()
+
+    async def run(intent, body, streaming, scheduled):
+        result = await send(client, body, streaming, scheduled)
+        results.append((intent, body["message"] in FOLLOW_UPS, result))
+
+    started = time.perf_counter()
+    for offset, intent, body, streaming in schedule:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+            continue
+        task = asyncio.create_task(run(intent, body, streaming, started + offset))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.wait(in_flight)
+    elapsed = time.perf_counter() - started
+    client.close()
+    return results, elapsed, dropped
+
+
+def summarize(results: List[dict], elapsed: float) -> dict:
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] * 1000 for r in ok]
+    ttfts = [r["ttft"] * 1000 for r in ok if r.get("ttft") is not None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r["status"] != 200:
+            key = r.get("error") or str(r["status"])
+            errors[key] = errors.get(key, 0) + 1
+    summary = {
+        "requests": len(results),
+        "ok": len(ok),
+        "errors": errors,
+        "rps": round(len(ok) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "max_ms": round(max(latencies), 1) if latencies else 0.0,
+    }
+    if ttfts:
+        summary["ttft_p50_ms"] = round(percentile(ttfts, 0.50), 1)
+        summary["ttft_p95_ms"] = round(percentile(ttfts, 0.95), 1)
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=parent_dir, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, previous: Optional[dict]) -> None:
+    print(f"{'intent':<14}{'requests':>9}{'ok':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  errors")
+    rows = [*report["per_intent"].items(), ("overall", report["overall"])]
+    for name, row in rows:
+        line = (f"{name:<14}{row['requests']:>9}{row['ok']:>8}{row['rps']:>9}{row['p50_ms']:>9}"
+                f"{row['p95_ms']:>9}{row['p99_ms']:>9}  {row['errors'] or '-'}")
+        old = previous and (previous["overall"] if name == "overall" else previous["per_intent"].get(name))
+        if old:
+            line += f"  (vs {previous.get('git_commit') or 'previous'}: req/s {row['rps'] - old['rps']:+.1f}, p95 {row['p95_ms'] - old['p95_ms']:+.1f} ms)"
+        print(line)
+    if "ttft_p50_ms" in report["overall"]:
+        print(f"streaming time to first token: p50 {report['overall']['ttft_p50_ms']} ms, p95 {report['overall']['ttft_p95_ms']} ms")
+    print(f"misclassified: {report['misclassified']}, dropped by load generator: {report['client_dropped']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--rate", type=float, default=100.0, help="mean arrivals per second outside bursts")
+    parser.add_argument("--burst-factor", type=float, default=5.0)
+    parser.add_argument("--burst-seconds", type=float, default=2.0)
+    parser.add_argument("--burst-every", type=float, default=10.0, help="0 disables bursts")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("dining=0.4,announcement=0.35,general=0.25"))
+    parser.add_argument("--unique-ratio", type=float, default=0.2, help="share of rephrased (cache-missing) messages")
+    parser.add_argument("--user-ratio", type=float, default=0.3, help="share of requests with a user_id")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--stream-ratio", type=float, default=0.1, help="share sent to /chat/stream")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=150.0)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.01)
+    parser.add_argument("--mongo-latency-ms", type=float, default=0.5)
+    parser.add_argument("--announcements", type=int, default=2000, help="seeded announcement documents")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--server-log-level", default="critical")
+    parser.add_argument("--output", help="result JSON path (default: benchmarks/results/load_test_<time>.json)")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    schedule = build_schedule(args)
+    print(f"Starting server with fake Gemini ({args.llm_latency_ms:.0f}±{args.llm_jitter_ms:.0f} ms, "
+          f"{args.llm_failure_rate:.0%} failures) and in-memory MongoDB...")
+    process, base_url = start_server(args)
+    try:
+        print(f"Sending {len(schedule)} requests over {args.duration:.0f} s...")
+        results, elapsed, dropped = asyncio.run(drive(base_url, schedule, args.max_in_flight))
+        server_stats = httpx.get(f"{base_url}/api/v1/chat/stats", timeout=10).json()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    by_intent: Dict[str, List[dict]] = {}
+    misclassified = 0
+    for intent, follow_up, result in results:
+        by_intent.setdefault(intent, []).append(result)
+        # Follow-ups take the intent of the user's previous turn
+        source = FAST_PATH_INTENTS.get(result["source"], result["source"])
+        misclassified += not follow_up and source is not None and source != intent
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("serve", "port", "output", "compare", "server_log_level")},
+        "elapsed_s": round(elapsed, 2),
+        "overall": summarize([r for _, _, r in results], elapsed),
+        "per_intent": {intent: summarize(rows, elapsed) for intent, rows in sorted(by_intent.items())},
+        "misclassified": misclassified,
+        "client_dropped": dropped,
+        "server": {key: server_stats.get(key) for key in ("response_cache", "llm_gateway", "coalescing", "prompts")},
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    output = args.output or os.path.join(
+        current_dir, "results", f"load_test_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Saved {output}")
+
+
+if __name__ == "__main__":
+    main()
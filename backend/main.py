@@ -1,13 +1,24 @@
 # backend/main.py
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.core.config import settings
-from app.db.mongo import connect_to_mongo, close_mongo_connection
-from app.api.routes import chat
+from app.core.metrics import registry
+from app.core.warmup import warm_up
+from app.db.mongo import db, connect_to_mongo, close_mongo_connection
+from app.db.indexes import ensure_indexes
+from app.db.snapshot import context_snapshot
+from app.retrieval.announcement_search import announcement_search
+from app.retrieval.semantic_search import semantic_search
+from app.llm_engine.conversation_memory import conversation_memory
+from app.llm_engine.query_log import query_log
+from app.realtime.hub import announcement_hub
+from app.ingest.teams import teams_ingestor
+from app.api.routes import chat, feed, webhooks
 
 
 @asynccontextmanager
@@ -16,10 +27,30 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for FastAPI.
     Handles startup and shutdown events.
     """
-    # Startup
+    # Startup: only what the first request needs is awaited; index creation,
+    # search index loading and warm-up continue in the background
     await connect_to_mongo()
+    indexes_task = asyncio.create_task(ensure_indexes(db.db))
+    await context_snapshot.start()
+    await announcement_search.start()
+    await semantic_search.start()
+    await conversation_memory.start()
+    await query_log.start()
+    await announcement_hub.start()
+    await teams_ingestor.start()
+    if settings.WARMUP_ON_STARTUP:
+        warm_up()
     yield
     # Shutdown
+    indexes_task.cancel()
+    await teams_ingestor.stop()
+    await announcement_hub.stop()
+    # Flush buffered writes before the connection closes
+    await query_log.stop()
+    await conversation_memory.stop()
+    await semantic_search.stop()
+    await announcement_search.stop()
+    await context_snapshot.stop()
     await close_mongo_connection()
 
 
@@ -32,6 +63,8 @@ app = FastAPI(
 
 # Include routers
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(feed.router, prefix="/api/v1", tags=["feed"])
+app.include_router(webhooks.router, prefix="/api/v1", tags=["webhooks"])
 
 
 @app.get("/")
@@ -50,6 +83,24 @@ async def root():
     )
 
 
+@app.get("/warmup")
+async def warmup():
+    """
+    Warm-up hook for startup probes / scale-from-zero: runs (or joins) the
+    warm-up and returns per-step timings in milliseconds.
+    """
+    return {"status": "warm", "timings_ms": await warm_up()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint: per-stage chat latency, LLM gateway wait,
+    executor wait and prompt/reply size histograms.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -62,10 +113,46 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import argparse
+    import os
+    import subprocess
+    import sys
+
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+
+    parser = argparse.ArgumentParser(description="Runs the API server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="worker processes; more than 1 also starts refresher.py and disables auto-reload",
     )
+    args = parser.parse_args()
+    if args.workers > 1 and not settings.CONVERSATION_PERSIST:
+        # Each worker would only know the turns it served itself
+        parser.error("--workers > 1 requires CONVERSATION_PERSIST=true to share conversation history")
+
+    if args.workers <= 1:
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            reload=True
+        )
+    else:
+        # One refresher polls MongoDB and publishes the shared context; the
+        # workers (spawned with this environment) only read it
+        refresher = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "refresher.py")],
+            env={**os.environ, "SHARED_SNAPSHOT_READ": "false"},
+        )
+        os.environ["SHARED_SNAPSHOT_READ"] = "true"
+        os.environ["CONVERSATION_READ_THROUGH"] = "true"
+        # The global LLM budget is enforced per process: split it
+        os.environ["ADMISSION_GLOBAL_RPM"] = str(settings.ADMISSION_GLOBAL_RPM / args.workers)
+        os.environ["ADMISSION_GLOBAL_TPM"] = str(settings.ADMISSION_GLOBAL_TPM / args.workers)
+        try:
+            uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+        finally:
+            refresher.terminate()
+            refresher.wait()
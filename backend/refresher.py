@@ -0,0 +1,72 @@
+# backend/refresher.py
+
+"""
+Snapshot refresher for multi-worker deployments (`python main.py --workers N`
+starts it). The only process that polls MongoDB for shared read state:
+
+- loads the chat context (this week's menus, announcements digest) like the
+  single-process ContextSnapshot and publishes it to SHARED_SNAPSHOT_PATH,
+  a memory-mapped file every worker maps read-only;
+- keeps the BM25 announcement index and the vector store in sync and on
+  disk, where workers follow them.
+
+Run it from backend/ with SHARED_SNAPSHOT_READ unset.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.db.shared_snapshot import SnapshotWriter
+from app.db.snapshot import context_snapshot
+from app.retrieval.announcement_search import announcement_search
+from app.retrieval.semantic_search import semantic_search
+
+logger = logging.getLogger("refresher")
+
+# How often a new context load is published; also the heartbeat period
+PUBLISH_INTERVAL_SECONDS = 1.0
+
+
+async def run() -> None:
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    writer = SnapshotWriter(settings.SHARED_SNAPSHOT_PATH, settings.SHARED_SNAPSHOT_SIZE)
+    await connect_to_mongo()
+    await context_snapshot.start()
+    await announcement_search.start()
+    await semantic_search.start()
+    logger.info(f"Publishing chat context to {settings.SHARED_SNAPSHOT_PATH}")
+
+    published = 0
+    try:
+        while True:
+            # Nothing is published (and workers fall back to MongoDB) until
+            # the first successful load
+            if context_snapshot.refreshes != published:
+                try:
+                    writer.publish(context_snapshot.export())
+                    published = context_snapshot.refreshes
+                except ValueError as e:
+                    logger.error(f"Could not publish chat context: {e}")
+            if published:
+                writer.heartbeat()
+            await asyncio.sleep(PUBLISH_INTERVAL_SECONDS)
+    finally:
+        await semantic_search.stop()
+        await announcement_search.stop()
+        await context_snapshot.stop()
+        await close_mongo_connection()
+        writer.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if settings.SHARED_SNAPSHOT_READ:
+        raise SystemExit("The refresher writes the shared snapshot; unset SHARED_SNAPSHOT_READ.")
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
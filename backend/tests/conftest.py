@@ -0,0 +1,8 @@
+# backend/tests/conftest.py
+
+import os
+
+# Settings are read when app modules are imported; unit tests never connect
+os.environ.setdefault("MONGO_CONNECTION_STRING", "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=200")
+os.environ.setdefault("MONGO_DB_NAME", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
@@ -0,0 +1,78 @@
+# backend/tests/test_conversation_memory.py
+
+from app.llm_engine import conversation_memory as conversation_module
+from app.llm_engine.conversation_memory import ConversationMemory
+
+
+def make_memory(**overrides) -> ConversationMemory:
+    options = {"max_users": 10, "max_bytes_per_user": 600, "max_total_bytes": 10 ** 6, "idle_seconds": 1800}
+    options.update(overrides)
+    return ConversationMemory(**options)
+
+
+def test_history_renders_recent_turns_oldest_first():
+    memory = make_memory()
+    memory.append("u", "bugün yemekte ne var", "Mercimek", "dining")
+    memory.append("u", "peki yarın?", "Pilav", "dining")
+
+    assert memory.history("u", 1000) == (
+        "Kullanıcı: bugün yemekte ne var\nAsistan: Mercimek\nKullanıcı: peki yarın?\nAsistan: Pilav"
+    )
+    assert memory.history("u", 8) == "Asistan: Pilav"
+    assert memory.last_intent("u") == "dining"
+    assert memory.history(None, 1000) == ""
+
+
+def test_long_reply_evicts_whole_exchanges():
+    memory = make_memory()
+    memory.append("u", "bugün yemekte ne var", "kısa", "dining")
+    memory.append("u", "yarın?", "x" * 5000, "dining")
+
+    history = memory.history("u", 10 ** 4)
+    assert history.startswith("Kullanıcı: yarın?\nAsistan: xxx")
+    assert memory.stats()["bytes"] <= 600
+
+
+def test_least_recently_active_users_are_evicted():
+    memory = make_memory(max_users=2)
+    for user in ("a", "b"):
+        memory.append(user, "merhaba", "selam")
+    memory.append("a", "nasılsın", "iyiyim")
+    memory.append("c", "merhaba", "selam")
+
+    assert memory.history("b", 100) == ""
+    assert memory.history("a", 100) and memory.history("c", 100)
+    assert memory.evictions == 1
+
+
+def test_total_byte_cap_evicts_users():
+    memory = make_memory(max_total_bytes=700)
+    memory.append("a", "merhaba", "y" * 200)
+    memory.append("b", "merhaba", "z" * 200)
+
+    assert memory.history("a", 1000) == ""
+    assert memory.stats()["bytes"] <= 700
+
+
+def test_idle_conversations_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(conversation_module.time, "monotonic", lambda: now[0])
+    memory = make_memory(idle_seconds=60)
+    memory.append("u", "merhaba", "selam")
+
+    now[0] += 61
+    assert memory.history("u", 100) == ""
+    assert memory.expirations == 1
+
+
+def test_follow_up_detection():
+    memory = make_memory()
+    assert not memory.is_follow_up("u", "peki yarın?", classified=False)
+
+    memory.append("u", "bugün yemekte ne var", "Mercimek", "dining")
+    assert memory.is_follow_up("u", "peki yarın?", classified=False)
+    assert memory.is_follow_up("u", "cumaya?", classified=False)
+    assert memory.is_follow_up("u", "ya akşam", classified=True)
+    assert not memory.is_follow_up("u", "merhaba", classified=False)
+    assert not memory.is_follow_up("u", "teşekkürler", classified=False)
+    assert not memory.is_follow_up("u", "staj başvurusu ne zaman", classified=True)
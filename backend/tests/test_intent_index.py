@@ -0,0 +1,49 @@
+# backend/tests/test_intent_index.py
+
+import pytest
+
+from app.llm_engine.classifier import classify_many, decide_intent
+from app.llm_engine.intent_index import IntentIndex
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("Bugün yemekte ne var?", "dining"),
+    ("ACIKTIM", "dining"),
+    ("menüde çorba var mı", "dining"),
+    ("final sınavları ne zaman", "announcement"),
+    ("hoca dersi iptal etti mi", "announcement"),
+    ("merhaba", "general"),
+    ("", "general"),
+])
+def test_exact_keywords(message, intent):
+    assert decide_intent(message) == intent
+
+
+def test_keywords_only_match_at_word_start():
+    index = IntentIndex({"announcement": ["ders"]}, threshold=80)
+    assert index._exact_intents("ders programi") is not None
+    assert index._exact_intents("dersler") is not None
+    assert index._exact_intents("kadersiz") is None
+
+
+def test_typos_fall_back_to_fuzzy_matching():
+    index = IntentIndex({"dining": ["yemekhane"], "announcement": ["duyuru"]}, threshold=80)
+    assert index._exact_intents("yemkhane") is None
+    assert index.classify("yemkhane") == "dining"
+    assert index.classify("duyruu") == "announcement"
+    assert index.classify("hava durumu nasil") == "general"
+
+
+def test_declaration_order_breaks_ties():
+    index = IntentIndex({"dining": ["yemek"], "announcement": ["duyuru"]})
+    assert index.classify("yemek duyurusu") == "dining"
+
+
+def test_batch_matches_single_classification():
+    messages = ["bugün yemek ne", "staj duyurusu", "yemkhane acik mi", "merhaba"]
+    assert classify_many(messages) == [decide_intent(message) for message in messages]
+
+
+def test_intent_without_keywords_is_rejected():
+    with pytest.raises(ValueError):
+        IntentIndex({"dining": []})
@@ -0,0 +1,63 @@
+# backend/tests/test_prompt_builder.py
+
+from app.llm_engine.prompt_builder import PromptBuilder, split_pieces, truncate_to_tokens
+from app.utils.text import estimate_tokens
+
+ANNOUNCEMENTS = "Recent Announcements:\n" + "\n".join(
+    f"{i}. [cse] Duyuru {i} hakkında uzun bir açıklama metni burada yer alır\n   https://cse.example/{i}"
+    for i in range(1, 40)
+) + "\n40. [cse] Staj başvuruları başladı\n   https://cse.example/staj"
+
+
+def test_split_pieces_keeps_items_with_their_continuation_lines():
+    context = "Recent Announcements:\n1. Staj\n   https://a\n2. Sınav\n\nMenu for today:\n- Çorba"
+    assert split_pieces(context) == [
+        "Recent Announcements:",
+        "1. Staj\n   https://a",
+        "2. Sınav",
+        "Menu for today:",
+        "- Çorba",
+    ]
+
+
+def test_truncate_to_tokens_cuts_at_a_word():
+    text = "kelime " * 100
+    cut = truncate_to_tokens(text, 10)
+    assert cut.endswith("…") and estimate_tokens(cut) <= 11
+    assert truncate_to_tokens("kısa", 10) == "kısa"
+
+
+def test_prompt_stays_within_the_intent_budget():
+    builder = PromptBuilder({"announcement": 300}, default_budget=500, max_query_tokens=50)
+    prompt = builder.build("Sen bir asistansın.", "staj başvurusu ne zaman", ANNOUNCEMENTS, intent="announcement")
+
+    assert prompt.budget == 300
+    assert prompt.tokens <= prompt.budget
+    assert prompt.pieces_dropped > 0 and prompt.truncated
+    # The piece matching the query wins over earlier, unrelated ones
+    assert "Staj başvuruları başladı" in prompt.text
+    assert "Recent Announcements:" in prompt.text
+
+
+def test_duplicate_pieces_are_removed_and_items_renumbered():
+    context = "1. [cse] Staj\n2. [cse] Sınav\n3. [cse] Staj"
+    prompt = PromptBuilder({}, default_budget=1000, max_query_tokens=50).build("sys", "soru", context)
+
+    assert prompt.duplicates == 1
+    assert "1. [cse] Staj\n2. [cse] Sınav" in prompt.text
+    assert "3. [cse]" not in prompt.text
+
+
+def test_history_gets_at_most_its_share_and_keeps_recent_lines():
+    history = "\n".join(f"Kullanıcı: soru {i}\nAsistan: cevap {i}" for i in range(50))
+    builder = PromptBuilder({}, default_budget=400, max_query_tokens=50, history_share=0.3)
+    prompt = builder.build("sys", "soru", None, history)
+
+    assert 0 < prompt.sections["history"] <= 0.3 * 400
+    assert "cevap 49" in prompt.text and "cevap 0\n" not in prompt.text
+
+
+def test_long_query_is_capped():
+    prompt = PromptBuilder({}, default_budget=1000, max_query_tokens=20).build("sys", "soru " * 200)
+    assert prompt.sections["query"] <= 20 + estimate_tokens("User query:\n") + 1
+    assert prompt.truncated
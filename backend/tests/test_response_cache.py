@@ -0,0 +1,80 @@
+# backend/tests/test_response_cache.py
+
+import pytest
+
+from app.llm_engine import response_cache as response_cache_module
+from app.llm_engine.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_after_set_and_normalized_message():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set(cache.make_key("dining", "Bugün yemekte ne var?", "menu"), "Mercimek")
+
+    assert cache.get(cache.make_key("dining", "bugun yemekte ne var", "menu")) == "Mercimek"
+    assert cache.get(cache.make_key("dining", "yarın yemekte ne var", "menu")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+
+def test_expired_entry_misses_but_is_served_stale(clock):
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    key = cache.make_key("general", "merhaba", None)
+    cache.set(key, "Selam")
+
+    clock[0] += 61
+    assert cache.get(key) is None
+    assert cache.get_stale(key) == "Selam"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    a, b, c = (cache.make_key("general", message, None) for message in ("a", "b", "c"))
+    cache.set(a, "A")
+    cache.set(b, "B")
+    cache.get(a)
+    cache.set(c, "C")
+
+    assert cache.get(b) is None
+    assert cache.get(a) == "A" and cache.get(c) == "C"
+    assert cache.evictions == 1
+
+
+def test_changed_context_invalidates_only_that_question():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    old = cache.make_key("dining", "bugün ne var", "menu v1")
+    other = cache.make_key("dining", "yarın ne var", "menu of tomorrow")
+    cache.set(old, "Mercimek")
+    cache.set(other, "Pilav")
+
+    new = cache.make_key("dining", "bugün ne var", "menu v2")
+    assert cache.get(new) is None
+    assert cache.get_stale(old) is None
+    assert cache.get(other) == "Pilav"
+    assert cache.invalidations == 1
+
+
+def test_questions_with_different_contexts_stay_cached():
+    # Announcement and general contexts are retrieved per message
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    first = cache.make_key("general", "kütüphane kaçta kapanıyor", "hits for the library")
+    second = cache.make_key("general", "yapay zeka nedir", "hits for ai")
+    cache.set(first, "22:00")
+    cache.set(second, "Bir alan")
+
+    assert cache.get(cache.make_key("general", "kütüphane kaçta kapanıyor", "hits for the library")) == "22:00"
+    assert cache.get(cache.make_key("general", "yapay zeka nedir", "hits for ai")) == "Bir alan"
+    assert cache.invalidations == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(max_entries=0, ttl_seconds=60)
+    key = cache.make_key("general", "merhaba", None)
+    cache.set(key, "Selam")
+    assert cache.get(key) is None and len(cache) == 0
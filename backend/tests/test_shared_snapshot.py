@@ -0,0 +1,53 @@
+# backend/tests/test_shared_snapshot.py
+
+import pytest
+
+from app.db import shared_snapshot
+from app.db.shared_snapshot import SnapshotReader, SnapshotWriter
+
+
+def test_round_trip_and_updates(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    reader = SnapshotReader(path)
+    assert reader.read() is None and reader.sequence() is None
+
+    writer = SnapshotWriter(path, 4096)
+    sequence = writer.publish({"version": 1, "dining": {"2026-10-17": "Menü: Mercimek"}})
+    assert reader.read() == (sequence, {"version": 1, "dining": {"2026-10-17": "Menü: Mercimek"}})
+
+    newer = writer.publish({"version": 2})
+    assert newer == sequence + 2
+    assert reader.sequence() == newer
+    assert reader.read() == (newer, {"version": 2})
+    assert reader.heartbeat_age() < 5
+    reader.close()
+    writer.close()
+
+
+def test_restarted_writer_continues_the_sequence(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    writer = SnapshotWriter(path, 4096)
+    first = writer.publish({"version": 1})
+    writer.close()
+
+    writer = SnapshotWriter(path, 4096)
+    assert writer.publish({"version": 2}) > first
+    writer.close()
+
+
+def test_oversized_payload_is_rejected(tmp_path):
+    writer = SnapshotWriter(str(tmp_path / "snapshot.bin"), 128)
+    with pytest.raises(ValueError):
+        writer.publish({"text": "x" * 1000})
+    writer.close()
+
+
+def test_reader_does_not_return_a_write_in_progress(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    writer = SnapshotWriter(path, 4096)
+    sequence = writer.publish({"version": 1})
+    # Simulate a writer stopped halfway through publish(): odd sequence
+    shared_snapshot._SEQUENCE.pack_into(writer._map, shared_snapshot._SEQUENCE_OFFSET, sequence + 1)
+
+    assert SnapshotReader(path).read() is None
+    writer.close()
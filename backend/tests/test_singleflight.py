@@ -0,0 +1,71 @@
+# backend/tests/test_singleflight.py
+
+import asyncio
+
+import pytest
+
+from app.llm_engine.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "reply"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["reply"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(flight.do("a", lambda: asyncio.sleep(0, "a")), flight.do("b", lambda: asyncio.sleep(0, "b")))
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flight.leaders == 2
+
+
+def test_failure_reaches_waiters_and_next_call_retries():
+    flight = SingleFlight()
+    attempts = 0
+
+    async def failing():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("gemini down")
+
+    async def main():
+        results = await asyncio.gather(flight.do("key", failing), flight.do("key", failing), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not flight.running("key")
+        with pytest.raises(RuntimeError):
+            await flight.do("key", failing)
+
+    asyncio.run(main())
+    assert attempts == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("key", lambda: asyncio.sleep(0.02, "reply")))
+        await asyncio.sleep(0)
+        assert flight.running("key")
+        follower = asyncio.ensure_future(flight.do("key", lambda: asyncio.sleep(0, "other")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == "reply"
@@ -4,34 +4,39 @@ Scrapes actual announcements from CSE department website.
 """
 
 import logging
-import requests
+import time
+from typing import List
+
 from bs4 import BeautifulSoup
-import urllib3
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from crawlers.http_fetcher import FetchResult, HttpFetcher
 
 logger = logging.getLogger(__name__)
 
 class CseSiteCrawler:
-    def __init__(self):
+    def __init__(self, fetcher: HttpFetcher):
         self.base_url = "https://cse.akdeniz.edu.tr"
         self.list_url = "https://cse.akdeniz.edu.tr/tr/duyurular"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.fetcher = fetcher
+        self._pending: List[FetchResult] = []
 
-    def fetch_links(self):
+    async def fetch_links(self):
         """
         Scrapes the list page.
-        Returns: List[Dict] -> [{'title': '...', 'link': '...'}]
+        Returns: List[Dict] -> [{'title': '...', 'link': '...'}], or None if
+        the page did not change since the last commit().
         """
         logger.info(f"📡 Connecting to {self.list_url}...")
+        # Only a fully parsed list page may be committed
+        self._pending = []
         
         try:
-            response = requests.get(self.list_url, headers=self.headers, verify=False, timeout=15)
-            response.raise_for_status()
-            
+            response = await self.fetcher.fetch(self.list_url)
+            if not response.changed:
+                logger.info("💤 Announcement list unchanged since the last sync, skipping parse.")
+                return None
+
+            started = time.perf_counter()
             soup = BeautifulSoup(response.content, "html.parser")
             
             results = []
@@ -68,9 +73,20 @@ class CseSiteCrawler:
                     "link": full_link
                 })
                 
-            logger.info(f"✅ Successfully found {len(results)} announcements.")
+            logger.info(f"✅ Successfully found {len(results)} announcements "
+                        f"(parsed in {(time.perf_counter() - started) * 1000:.0f} ms).")
+            self._pending = [response]
             return results
 
         except Exception as e:
             logger.error(f"❌ Error fetching links: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def commit(self) -> None:
+        """
+        Call once the fetched links are saved: the next run skips the page
+        until it changes.
+        """
+        for result in self._pending:
+            self.fetcher.commit(result)
+        self._pending.clear()
\ No newline at end of file
@@ -1,65 +1,95 @@
 import logging
-import requests
+import time
+from typing import List, Optional
+
 from bs4 import BeautifulSoup
-import urllib3
 
-# Disable SSL warnings for university site
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from crawlers.http_fetcher import FetchResult, HttpFetcher
 
 logger = logging.getLogger(__name__)
 
 class DiningCrawler:
-    def __init__(self):
+    def __init__(self, fetcher: HttpFetcher):
         # FIXED: Removed markdown brackets []()
         self.menu_page_url = "https://sks.akdeniz.edu.tr/tr/haftalik_yemek_listesi-6391"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.fetcher = fetcher
+        # Image URL found on the last parse of the menu page
+        self._image_url: Optional[str] = None
+        self._pending: List[FetchResult] = []
 
-    def fetch_menu_image(self) -> bytes:
+    async def fetch_menu_image(self) -> Optional[bytes]:
         """
         Scrapes the SKS page, finds the menu image inside .article-text, and downloads it.
+        Returns None if there is no image, or if neither the page nor the
+        image changed since the last commit().
         """
         logger.info(f"🍽️  Connecting to {self.menu_page_url}...")
+        self._pending = []
         
         try:
-            response = requests.get(self.menu_page_url, headers=self.headers, verify=False, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # --- SELECTOR LOGIC ---
-            # We look for the div with class 'article-text'
-            article_text = soup.find("div", class_="article-text")
-            
-            if not article_text:
-                logger.warning("⚠️  Could not find 'article-text' div.")
-                return None
+            # Without a remembered image URL (first run after a restart) the
+            # page must be parsed, so it is fetched unconditionally
+            response = await self.fetcher.fetch(self.menu_page_url, conditional=self._image_url is not None)
+            self._pending.append(response)
+            if response.changed or self._image_url is None:
+                started = time.perf_counter()
+                img_src = self._find_image_url(response.content)
+                logger.info(f"🔎 Menu page parsed in {(time.perf_counter() - started) * 1000:.0f} ms.")
+                if not img_src:
+                    return None
+                self._image_url = img_src
+                logger.info(f"📸 Found Menu Image URL: {img_src}")
+            else:
+                logger.info("💤 Menu page unchanged since the last sync, skipping parse.")
 
-            # Find the image tag inside it
-            img_tag = article_text.find("img")
-            
-            if not img_tag:
-                logger.warning("⚠️  No image found inside article-text.")
+            # Download the image bytes (304 if it is the one already processed)
+            image = await self.fetcher.fetch(self._image_url)
+            self._pending.append(image)
+            if not image.changed:
+                logger.info("💤 Menu image unchanged since the last sync.")
+                self.commit()
                 return None
+            return image.content
 
-            img_src = img_tag.get('src')
-            
-            # Handle relative URLs
-            if not img_src.startswith("http"):
-                # FIXED: Clean base URL string
-                base = "https://sks.akdeniz.edu.tr"
-                if not img_src.startswith("/"):
-                    img_src = f"{base}/{img_src}"
-                else:
-                    img_src = f"{base}{img_src}"
+        except Exception as e:
+            logger.error(f"❌ Dining Scraper Error: {e}")
+            return None
 
-            logger.info(f"📸 Found Menu Image URL: {img_src}")
+    def commit(self) -> None:
+        """
+        Call once the menu is saved: the next run skips the page and the
+        image until they change.
+        """
+        for result in self._pending:
+            self.fetcher.commit(result)
+        self._pending.clear()
+
+    def _find_image_url(self, content: bytes) -> Optional[str]:
+        soup = BeautifulSoup(content, "html.parser")
             
-            # Download the image bytes
-            img_response = requests.get(img_src, headers=self.headers, verify=False, timeout=15)
-            return img_response.content
+        # --- SELECTOR LOGIC ---
+        # We look for the div with class 'article-text'
+        article_text = soup.find("div", class_="article-text")
+        
+        if not article_text:
+            logger.warning("⚠️  Could not find 'article-text' div.")
+            return None
 
-        except Exception as e:
-            logger.error(f"❌ Dining Scraper Error: {e}")
-            return None
\ No newline at end of file
+        # Find the image tag inside it
+        img_tag = article_text.find("img")
+        
+        if not img_tag:
+            logger.warning("⚠️  No image found inside article-text.")
+            return None
+
+        img_src = img_tag.get('src')
+        
+        # Handle relative URLs
+        if not img_src.startswith("http"):
+            # FIXED: Clean base URL string
+            base = "https://sks.akdeniz.edu.tr"
+            if not img_src.startswith("/"):
+                img_src = f"{base}/{img_src}"
+            else:
+                img_src = f"{base}{img_src}"
+        return img_src
\ No newline at end of file
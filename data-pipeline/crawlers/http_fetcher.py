@@ -0,0 +1,180 @@
+"""
+Shared HTTP Fetch Layer
+Async, pooled and polite HTTP client for the crawlers. Remembers each URL's
+ETag / Last-Modified / content hash, so a page that did not change since the
+last processed run costs a 304 (or, for servers that ignore conditional
+requests, a hash comparison) instead of a download, parse and LLM call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    # None on 304 Not Modified
+    content: Optional[bytes]
+    # False on 304, or on 200 with the same body hash as last time
+    changed: bool
+    validators: Dict[str, str] = field(default_factory=dict)
+
+
+class ValidatorStore:
+    """
+    URL -> {etag, last_modified, sha256}, persisted as a small JSON file
+    (written atomically, so a crash never leaves it half written).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._validators: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._validators = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable HTTP validators file {path}: {e}")
+
+    def get(self, url: str) -> Dict[str, str]:
+        return self._validators.get(url, {})
+
+    def set(self, url: str, validators: Dict[str, str]) -> None:
+        if self._validators.get(url) == validators:
+            return
+        self._validators[url] = validators
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._validators, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class HttpFetcher:
+    """
+    - One httpx.AsyncClient for all crawlers: keep-alive connections are
+      pooled per host and reused within and across jobs.
+    - Per-host politeness: at most `max_per_host` requests in flight and
+      `min_interval_seconds` between request starts to the same host; a
+      429/503 with Retry-After pauses that host.
+    - Conditional requests: If-None-Match / If-Modified-Since from the
+      validators of the last *processed* response. Validators are only
+      stored by commit(), after the caller has handled the content, so a
+      failed parse or LLM call is retried on the next run instead of being
+      hidden behind a 304.
+    """
+
+    def __init__(
+        self,
+        validators_path: str,
+        max_per_host: int = 2,
+        min_interval_seconds: float = 1.0,
+        timeout_seconds: float = 15.0,
+        verify: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.validators = ValidatorStore(validators_path)
+        self.max_per_host = max_per_host
+        self.min_interval_seconds = min_interval_seconds
+        self.client = httpx.AsyncClient(
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout_seconds,
+            verify=verify,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_next_start: Dict[str, float] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+
+        self.requests = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.bytes_downloaded = 0
+
+    async def _wait_turn(self, host: str) -> None:
+        # Serializes start times per host; the request itself runs unlocked
+        async with self._host_locks.setdefault(host, asyncio.Lock()):
+            delay = self._host_next_start.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._host_next_start[host] = time.monotonic() + self.min_interval_seconds
+
+    def _back_off(self, host: str, response: httpx.Response) -> None:
+        retry_after = response.headers.get("Retry-After", "")
+        if response.status_code in (429, 503) and retry_after.isdigit():
+            self._host_next_start[host] = time.monotonic() + int(retry_after)
+            logger.warning(f"⏳ {host} asked us to wait {retry_after}s.")
+
+    async def fetch(self, url: str, conditional: bool = True) -> FetchResult:
+        """
+        GETs `url`, conditionally unless `conditional` is False.
+
+        Raises:
+            httpx.HTTPError: On network errors and 4xx/5xx responses.
+        """
+        host = urlsplit(url).netloc
+        previous = self.validators.get(url)
+        headers = {}
+        if conditional and previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if conditional and previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+        async with self._host_slots.setdefault(host, asyncio.Semaphore(self.max_per_host)):
+            await self._wait_turn(host)
+            response = await self.client.get(url, headers=headers)
+        self.requests += 1
+        self.bytes_downloaded += len(response.content)
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            return FetchResult(url, 304, None, False, previous)
+        self._back_off(host, response)
+        response.raise_for_status()
+
+        validators = {"sha256": hashlib.sha256(response.content).hexdigest()}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        changed = validators["sha256"] != previous.get("sha256")
+        if not changed:
+            self.unchanged += 1
+        return FetchResult(url, response.status_code, response.content, changed, validators)
+
+    def commit(self, result: FetchResult) -> None:
+        """Marks a response as processed: later fetches send its validators."""
+        if result.validators:
+            self.validators.set(result.url, result.validators)
+
+    def take_stats(self) -> dict:
+        """Counters since the previous call (one sync run)."""
+        stats = {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "bytes_downloaded": self.bytes_downloaded,
+        }
+        self.requests = self.not_modified = self.unchanged = self.bytes_downloaded = 0
+        return stats
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -2,6 +2,7 @@
 Main Scheduler Entry Point
 """
 
+import asyncio
 import logging
 import schedule
 import time
@@ -17,6 +18,7 @@ sys.path.append(parent_dir)
 # --- IMPORTS ---
 from crawlers.cse_site import CseSiteCrawler
 from crawlers.dining import DiningCrawler
+from crawlers.http_fetcher import HttpFetcher
 from services.llm_service import PipelineLLM
 from storage.mongo_writer import MongoWriter
 
@@ -39,8 +41,15 @@ class DataPipeline:
     def __init__(self):
         try:
             self.db_writer = MongoWriter()
-            self.crawler = CseSiteCrawler()
-            self.dining_crawler = DiningCrawler()
+            # One event loop and one pooled HTTP client for every run
+            self.loop = asyncio.new_event_loop()
+            self.fetcher = HttpFetcher(
+                validators_path=os.getenv('HTTP_VALIDATORS_PATH', os.path.join(parent_dir, 'http_validators.json')),
+                max_per_host=int(os.getenv('HTTP_MAX_PER_HOST', 2)),
+                min_interval_seconds=float(os.getenv('HTTP_MIN_INTERVAL_SECONDS', 1.0)),
+            )
+            self.crawler = CseSiteCrawler(self.fetcher)
+            self.dining_crawler = DiningCrawler(self.fetcher)
             self.llm = PipelineLLM()
             
             self.sync_interval = int(os.getenv('SYNC_INTERVAL', 1800)) 
@@ -54,10 +63,10 @@ class DataPipeline:
         try:
             logger.info("🍽️  Starting DINING MENU sync job...")
             
-            image_bytes = self.dining_crawler.fetch_menu_image()
+            image_bytes = self.loop.run_until_complete(self.dining_crawler.fetch_menu_image())
             
             if not image_bytes:
-                logger.warning("⚠️  No menu image found.")
+                logger.info("💤 No new menu image.")
                 return
 
             logger.info("🧠 Sending image to Gemini...")
@@ -68,6 +77,7 @@ class DataPipeline:
                 return
             logger.info(f"🔍 Gemini Response Data: {menu_json_list}")
             self.db_writer.save_menu(menu_json_list)
+            self.dining_crawler.commit()
             
         except Exception as e:
             logger.error(f"❌ Error in menu sync job: {e}", exc_info=True)
@@ -82,31 +92,44 @@ class DataPipeline:
             logger.info("📰 Starting ANNOUNCEMENTS sync job...")
             
             # 1. Fetch Titles and Links (Using new logic)
-            links = self.crawler.fetch_links()
+            links = self.loop.run_until_complete(self.crawler.fetch_links())
+            if links is None:
+                return
+            if not links:
+                # Fetch or parse failed: keep the old validators so the next run retries
+                logger.warning("⚠️ No announcements fetched, nothing to sync.")
+                return
             logger.info(f"🔍 Found {len(links)} announcements on the site.")
             
             new_count = 0
             
-            for item in links:
-                # 2. Check DB (Avoid duplicate work)
-                if self.db_writer.is_exists(item['link']):
-                    continue
+            try:
+                for item in links:
+                    # 2. Check DB (Avoid duplicate work)
+                    if self.db_writer.is_exists(item['link']):
+                        continue
                 
-                logger.info(f"✨ New Announcement: {item['title']}")
+                    logger.info(f"✨ New Announcement: {item['title']}")
                 
-                # 3. Prepare Data
-                # Since we don't have a summary, we use the Title as the summary
-                # or leave 'original_content' empty.
-                data = {
-                    "source_type": "website",
-                    "title": item['title'],
-                    "link": item['link'],
-                }
+                    # 3. Prepare Data
+                    # Since we don't have a summary, we use the Title as the summary
+                    # or leave 'original_content' empty.
+                    data = {
+                        "source_type": "website",
+                        "title": item['title'],
+                        "link": item['link'],
+                    }
                 
-                # 4. Save directly
-                self.db_writer.save_announcements(data)
-                new_count += 1
+                    # 4. Save directly
+                    self.db_writer.save_announcements(data)
+                    new_count += 1
+            finally:
+                # One digest rebuild (and context version bump) per sync, also
+                # when a later save failed
+                if new_count > 0:
+                    self.db_writer.refresh_announcements_digest()
             
+            self.crawler.commit()
             if new_count > 0:
                 logger.info(f"✅ Saved {new_count} new announcements.")
             else:
@@ -120,6 +143,11 @@ class DataPipeline:
     def job_sync_all(self):
         self.job_sync_menu()
         self.job_sync_announcements()
+        stats = self.fetcher.take_stats()
+        logger.info(
+            f"🌐 HTTP: {stats['requests']} requests, {stats['not_modified']} not modified, "
+            f"{stats['unchanged']} unchanged, {stats['bytes_downloaded'] / 1024:.1f} KB downloaded."
+        )
     
     def run(self):
         logger.info("🚀 Data Pipeline Starting...")
@@ -132,6 +160,9 @@ class DataPipeline:
                 time.sleep(1)
         except KeyboardInterrupt:
             logger.info("\n🛑 Scheduler stopped by user")
+        finally:
+            self.loop.run_until_complete(self.fetcher.aclose())
+            self.loop.close()
 
 if __name__ == "__main__":
     pipeline = DataPipeline()
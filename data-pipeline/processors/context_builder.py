@@ -0,0 +1,76 @@
+"""
+Chat Context Builder
+Formats stored menus and announcements into the chat-ready context strings
+the backend sends to Gemini, so the formatting happens once at write time.
+"""
+
+from typing import Any, Dict, List
+
+DEFAULT_LOCATION = "Akdeniz Üniversitesi Yemekhanesi"
+
+# Keys of a Gemini-extracted daily menu, in serving order
+MENU_ITEM_FIELDS = ["soup", "main_dish", "side_dish", "other"]
+
+
+def dining_context_id(date: str) -> str:
+    """Primary key of the materialized menu context for a YYYY-MM-DD date."""
+    return f"dining:{date}"
+
+
+ANNOUNCEMENTS_DIGEST_ID = "announcements:latest"
+
+# Counter bumped on every context write; backends poll it to know when to reload
+CONTEXT_VERSION_ID = "version"
+
+
+def build_menu_context(menu: Dict[str, Any]) -> str:
+    """
+    Build the context string for one day's menu.
+
+    Args:
+        menu: Daily menu document ('items' list or soup/main_dish/... keys)
+
+    Returns:
+        Context string in the format the chat endpoint expects
+    """
+    date = menu.get("date")
+    items = menu.get("items") or [
+        menu[field] for field in MENU_ITEM_FIELDS if menu.get(field)
+    ]
+    location = menu.get("location", DEFAULT_LOCATION)
+
+    if not items:
+        return "VERİTABANI BİLGİSİ: Menü kaydı var ama içi boş."
+
+    return f"VERİTABANI BİLGİSİ ({date} Menüsü - {location}): {', '.join(items)}"
+
+
+def build_announcements_digest(announcements: List[Dict[str, Any]]) -> str:
+    """
+    Build the 'Recent Announcements' context from the newest announcements.
+
+    Args:
+        announcements: Announcement documents, newest first
+
+    Returns:
+        Numbered digest string
+    """
+    if not announcements:
+        return "No recent announcements."
+
+    lines = ["Recent Announcements:"]
+    for i, ann in enumerate(announcements, 1):
+        title = ann.get("title", "N/A")
+        source = ann.get("source") or ann.get("source_type", "N/A")
+        line = f"{i}. [{source}] {title}"
+
+        content = ann.get("content")
+        if content:
+            line += f"\n   {content[:100]}..."
+        link = ann.get("link")
+        if link:
+            line += f"\n   {link}"
+
+        lines.append(line)
+
+    return "\n".join(lines)
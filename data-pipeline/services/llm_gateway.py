@@ -0,0 +1,84 @@
+"""
+LLM Gateway
+Thread-safe admission point for Gemini calls made by the pipeline.
+Same semantics as the backend's async gateway: bounded concurrency,
+bounded wait queue with load shedding and wait-time metrics.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GatewayOverloaded(Exception):
+    """Raised when all slots are busy and the wait queue is full."""
+
+
+class LLMGateway:
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 16):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.calls = 0
+        self.failures = 0
+        self.shed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def run(self, call: Callable[[], T]) -> T:
+        """
+        Runs `call()` once a slot is free.
+
+        Raises:
+            GatewayOverloaded: If no slot is free and the queue is full.
+        """
+        with self._lock:
+            if self.in_flight >= self.max_concurrency and self.queue_depth >= self.max_queue:
+                self.shed += 1
+                raise GatewayOverloaded("Pipeline LLM gateway overloaded")
+            self.queue_depth += 1
+
+        started = time.monotonic()
+        self._slots.acquire()
+        waited = time.monotonic() - started
+
+        with self._lock:
+            self.queue_depth -= 1
+            self.in_flight += 1
+            self.calls += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        try:
+            return call()
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "calls": self.calls,
+                "failures": self.failures,
+                "shed": self.shed,
+                "avg_wait_ms": round(self.total_wait_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
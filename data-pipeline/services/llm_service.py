@@ -7,6 +7,8 @@ from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from services.llm_gateway import LLMGateway
+
 # Load env explicitly for the script
 load_dotenv()
 
@@ -18,8 +20,17 @@ class PipelineLLM:
         if not api_key:
             raise ValueError("GEMINI_API_KEY is missing in .env")
             
-        self.client = genai.Client(api_key=api_key)
+        # Per-call timeout is enforced by the HTTP client (milliseconds)
+        timeout_ms = int(float(os.getenv("LLM_TIMEOUT_SECONDS", 60)) * 1000)
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(timeout=timeout_ms)
+        )
         self.model_name = "gemini-2.5-flash"
+        self.gateway = LLMGateway(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", 16)),
+        )
 
     def generate_summary(self, text: str) -> str:
         """
@@ -34,9 +45,11 @@ class PipelineLLM:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
+            response = self.gateway.run(
+                lambda: self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt
+                )
             )
             return response.text.strip()
         except Exception as e:
@@ -74,9 +87,11 @@ class PipelineLLM:
             """
 
             # Send Text + Image to Gemini
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[prompt, image]
+            response = self.gateway.run(
+                lambda: self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=[prompt, image]
+                )
             )
             
             # Clean up response just in case
@@ -0,0 +1,93 @@
+"""
+MongoDB Index Definitions
+Declarative indexes for the collections the pipeline writes, applied when
+MongoWriter starts. Run directly to verify the hot queries use them:
+
+    python storage/indexes.py --check    # explain() hot queries, exit 1 on COLLSCAN
+"""
+
+import logging
+import os
+import sys
+from typing import Any, Iterator
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# collection -> list of (keys, options)
+INDEXES = {
+    "cse_akdeniz_announcements": [
+        ([("link", ASCENDING)], {"name": "link_1", "unique": True}),
+        ([("created_at", DESCENDING)], {"name": "created_at_-1"}),
+    ],
+    "yemekhane_listesi": [
+        ([("date", ASCENDING)], {"name": "date_1", "unique": True}),
+    ],
+    "chat_context": [
+        # Only per-day dining documents set expires_at
+        ([("expires_at", ASCENDING)], {"name": "expires_at_1", "expireAfterSeconds": 0}),
+    ],
+}
+
+# (description, collection, filter, sort, limit) of every query in MongoWriter
+HOT_QUERIES = [
+    ("is_exists: announcement by link", "cse_akdeniz_announcements",
+     {"link": "https://example.invalid"}, None, 1),
+    ("digest: latest announcements", "cse_akdeniz_announcements",
+     {}, [("created_at", DESCENDING)], 3),
+    ("save_menu: upsert by date", "yemekhane_listesi",
+     {"date": "2000-01-01"}, None, 1),
+]
+
+
+def ensure_indexes(db):
+    """Creates all declared indexes (idempotent); failures are logged."""
+    for collection, specs in INDEXES.items():
+        for keys, options in specs:
+            try:
+                db[collection].create_index(keys, **options)
+            except PyMongoError as e:
+                logger.error(f"❌ Could not create index {collection}.{options['name']}: {e}")
+
+
+def _iter_stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if plan.get("stage"):
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _iter_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _iter_stages(item)
+
+
+def check_hot_queries(db) -> bool:
+    """Prints the winning plan of every hot query. Returns False on any COLLSCAN."""
+    ok = True
+    for name, collection, query, sort, limit in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = list(_iter_stages(plan))
+        scan = "COLLSCAN" in stages
+        ok &= not scan
+        print(f"{'FAIL' if scan else 'ok  '} {name}: {' <- '.join(stages) or 'n/a'}")
+    return ok
+
+
+if __name__ == "__main__":
+    # --- PATH SETUP ---
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from storage.mongo_writer import MongoWriter
+
+    if "--check" not in sys.argv:
+        print("usage: python storage/indexes.py --check")
+        sys.exit(2)
+
+    writer = MongoWriter()  # applies the indexes
+    sys.exit(0 if check_hot_queries(writer.db) else 1)
@@ -1,8 +1,17 @@
 import os
-from pymongo import MongoClient
-from datetime import datetime
+from pymongo import MongoClient, DESCENDING
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from processors.context_builder import (
+    ANNOUNCEMENTS_DIGEST_ID,
+    CONTEXT_VERSION_ID,
+    build_announcements_digest,
+    build_menu_context,
+    dining_context_id,
+)
+from storage.indexes import ensure_indexes
+
 load_dotenv()
 
 class MongoWriter:
@@ -14,11 +23,22 @@ class MongoWriter:
         
         self.announcements_collection = self.db["cse_akdeniz_announcements"]
         self.menu_collection = self.db["yemekhane_listesi"]
+        # Precomputed, chat-ready context strings read by the backend by _id
+        self.context_collection = self.db["chat_context"]
+        self.digest_size = int(os.getenv("ANNOUNCEMENT_DIGEST_SIZE", 3))
+        # Days a per-date menu context is kept after its date (TTL index)
+        self.menu_context_ttl_days = int(os.getenv("MENU_CONTEXT_TTL_DAYS", 30))
+
+        ensure_indexes(self.db)
 
     def is_exists(self, link):
         return self.announcements_collection.find_one({"link": link}) is not None
 
     def save_announcements(self, data):
+        """
+        Inserts one announcement. Call refresh_announcements_digest() once
+        after a batch of inserts so backends reload their context once.
+        """
         document = {
             **data,
             "created_at": datetime.utcnow(),
@@ -33,9 +53,54 @@ class MongoWriter:
         
         for item in menu_list:
             # Update if date exists, Insert if new
+            # updated_at lets the backend's vector store re-embed corrected menus
             self.menu_collection.update_one(
                 {"date": item["date"]}, 
-                {"$set": item}, 
+                {"$set": {**item, "updated_at": datetime.utcnow()}}, 
                 upsert=True
             )
-        print(f"✅ Saved {len(menu_list)} menu items.")
\ No newline at end of file
+            self._save_context(
+                dining_context_id(item["date"]),
+                build_menu_context(item),
+                kind="dining",
+                date=item["date"],
+                expires_at=self._menu_context_expiry(item["date"]),
+            )
+        self._bump_context_version()
+        print(f"✅ Saved {len(menu_list)} menu items.")
+
+    def refresh_announcements_digest(self):
+        """Rebuilds the rolling top-N announcements context document."""
+        latest = list(
+            self.announcements_collection
+            .find({}, {"title": 1, "content": 1, "source": 1, "source_type": 1, "link": 1})
+            .sort("created_at", DESCENDING)
+            .limit(self.digest_size)
+        )
+        self._save_context(
+            ANNOUNCEMENTS_DIGEST_ID,
+            build_announcements_digest(latest),
+            kind="announcements",
+        )
+        self._bump_context_version()
+
+    def _menu_context_expiry(self, date):
+        try:
+            return datetime.strptime(date, "%Y-%m-%d") + timedelta(days=self.menu_context_ttl_days)
+        except (TypeError, ValueError):
+            return None
+
+    def _save_context(self, context_id, text, **fields):
+        self.context_collection.update_one(
+            {"_id": context_id},
+            {"$set": {**fields, "text": text, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def _bump_context_version(self):
+        """Signals backends that chat context changed (see CONTEXT_VERSION_ID)."""
+        self.context_collection.update_one(
+            {"_id": CONTEXT_VERSION_ID},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )